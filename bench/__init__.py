@@ -0,0 +1 @@
+# benchmarks: correr desde la raíz del repo con "python -m bench.<nombre>"
@@ -0,0 +1,266 @@
+"""
+Benchmark: decoders angostos (narrow.compile_reader) contra el unpack completo de antes.
+
+Por tipo de paquete mide, sobre una carrera sintética (22 autos, 60 Hz):
+  - read: sólo la lectura (Struct.unpack_from completo vs el lector compilado)
+  - decode: la función entera (baseline = como estaba antes, acá abajo, vs decoders_lite)
+en ns por paquete, y verifica que ambas devuelvan lo mismo.
+
+Con numpy instalado, además los 22 autos: 22 x unpack_from contra telemetry.vectorized.
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_decoders --seconds 10
+  python -m bench.bench_decoders --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import time
+from typing import Callable, Optional
+
+from ingenierof125.telemetry import decoders_lite as dl
+from ingenierof125.telemetry import vectorized as vz
+from ingenierof125.telemetry.decoders_lite import (
+    CAR_DAMAGE,
+    CAR_STATUS,
+    CAR_TELEMETRY,
+    LAPDATA,
+    PKT_HDR_SIZE,
+    PlayerDamageLite,
+    PlayerLapLite,
+    PlayerStatusLite,
+    PlayerTelemetryLite,
+    SessionLite,
+)
+from ingenierof125.telemetry.synthetic import SyntheticRace
+
+
+# --- baselines: unpack de todos los campos (decoders_lite antes del compilador) ---
+
+def _session_full(payload: bytes) -> Optional[SessionLite]:
+    if len(payload) < 753:
+        return None
+    off = PKT_HDR_SIZE
+    weather = payload[off]
+    track_temp = struct.unpack_from("<b", payload, off + 1)[0]
+    air_temp = struct.unpack_from("<b", payload, off + 2)[0]
+    total_laps = payload[off + 3]
+    track_len = struct.unpack_from("<H", payload, off + 4)[0]
+    session_type = payload[off + 6]
+    track_id = struct.unpack_from("<b", payload, off + 7)[0]
+    off += 8 + 1 + 4 + 6 + 21 * 5
+    safety_car_status = payload[off]
+    num_weather_samples = payload[off + 2]
+    off += 3
+    best_10m: Optional[int] = None
+    for i in range(64):
+        st = payload[off]
+        time_offset_min = payload[off + 1]
+        rain_pct = payload[off + 7]
+        if i < int(num_weather_samples) and st == session_type and time_offset_min <= 10:
+            rp = int(rain_pct)
+            if best_10m is None or rp > best_10m:
+                best_10m = rp
+        off += 8
+    return SessionLite(
+        weather=int(weather),
+        track_temp_c=int(track_temp),
+        air_temp_c=int(air_temp),
+        total_laps=int(total_laps),
+        track_length_m=int(track_len),
+        session_type=int(session_type),
+        track_id=int(track_id),
+        safety_car_status=int(safety_car_status),
+        rain_next_10m_pct=best_10m,
+    )
+
+
+def _lap_full(payload: bytes, i: int) -> Optional[PlayerLapLite]:
+    if len(payload) < 1285 or not (0 <= i < 22):
+        return None
+    v = LAPDATA.unpack_from(payload, PKT_HDR_SIZE + i * LAPDATA.size)
+    return PlayerLapLite(
+        lap_num=int(v[14]),
+        position=int(v[13]),
+        sector=int(v[17]),
+        last_lap_ms=int(v[0]),
+        current_lap_ms=int(v[1]),
+        delta_front_ms=int(v[7]) * 60_000 + int(v[6]),
+        delta_leader_ms=int(v[9]) * 60_000 + int(v[8]),
+        penalties_s=int(v[19]),
+    )
+
+
+def _status_full(payload: bytes, i: int) -> Optional[PlayerStatusLite]:
+    if len(payload) < 1239 or not (0 <= i < 22):
+        return None
+    v = CAR_STATUS.unpack_from(payload, PKT_HDR_SIZE + i * CAR_STATUS.size)
+    ft, fr = float(v[5]), float(v[7])
+    if not (dl._finite(ft) and dl._finite(fr)):
+        return None
+    return PlayerStatusLite(
+        fuel_in_tank=max(0.0, ft),
+        fuel_remaining_laps=fr,
+        actual_compound=int(v[13]),
+        visual_compound=int(v[14]),
+        tyre_age_laps=int(v[15]),
+        drs_allowed=int(v[11]),
+    )
+
+
+def _telemetry_full(payload: bytes, i: int) -> Optional[PlayerTelemetryLite]:
+    if len(payload) < 1352 or not (0 <= i < 22):
+        return None
+    v = CAR_TELEMETRY.unpack_from(payload, PKT_HDR_SIZE + i * CAR_TELEMETRY.size)
+    thr, strv, brk = float(v[1]), float(v[2]), float(v[3])
+    if not (dl._finite(thr) and dl._finite(brk) and dl._finite(strv)):
+        return None
+    return PlayerTelemetryLite(
+        speed_kph=int(v[0]),
+        throttle=dl._clamp(thr, 0.0, 1.0),
+        brake=dl._clamp(brk, 0.0, 1.0),
+        steer=dl._clamp(strv, -1.0, 1.0),
+        gear=int(v[5]),
+        drs=int(v[7]),
+        engine_rpm=int(v[6]),
+    )
+
+
+def _damage_full(payload: bytes, i: int) -> Optional[PlayerDamageLite]:
+    if len(payload) < 1041 or not (0 <= i < 22):
+        return None
+    v = CAR_DAMAGE.unpack_from(payload, PKT_HDR_SIZE + i * CAR_DAMAGE.size)
+    wear = tuple(float(dl._clamp(x, 0.0, 100.0)) for x in v[0:4])
+    return PlayerDamageLite(
+        wear=(wear[0], wear[1], wear[2], wear[3]),
+        front_left_wing=int(v[16]),
+        front_right_wing=int(v[17]),
+        gearbox_damage=int(v[24]),
+        engine_damage=int(v[25]),
+    )
+
+
+# name, packet_id, layout, lector compilado, baseline, decoder actual
+_CASES = (
+    ("session", 1, None, None, lambda p, i: _session_full(p), lambda p, i: dl.decode_session(p)),
+    ("lap", 2, dl.LAPDATA_LAYOUT, dl.LAP_PLAYER_READER, _lap_full, dl.decode_lap_player),
+    ("telemetry", 6, dl.CAR_TELEMETRY_LAYOUT, dl.TELEMETRY_PLAYER_READER, _telemetry_full, dl.decode_telemetry_player),
+    ("status", 7, dl.CAR_STATUS_LAYOUT, dl.STATUS_PLAYER_READER, _status_full, dl.decode_status_player),
+    ("damage", 10, dl.CAR_DAMAGE_LAYOUT, dl.DAMAGE_PLAYER_READER, _damage_full, dl.decode_damage_player),
+)
+
+
+def _ns_per_call(fn: Callable, args: list[tuple], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter_ns()
+        for a in args:
+            fn(*a)
+        best = min(best, time.perf_counter_ns() - t0)
+    return best / max(1, len(args))
+
+
+def run(seconds: float = 10.0, repeat: int = 5) -> list[dict]:
+    records = list(SyntheticRace(seed=1).packets(seconds))
+    out = []
+    for name, pid, layout, reader, full, narrow in _CASES:
+        payloads = [p for _, p in records if p[6] == pid]
+        # jugador en el medio de la grilla (offset != 0)
+        args = [(p, 11) for p in payloads]
+        for p, i in args[:50]:
+            if full(p, i) != narrow(p, i):
+                raise AssertionError(f"{name}: narrow decoder differs from baseline")
+
+        row = {
+            "packet": name,
+            "packets": len(payloads),
+            "decode_full_ns": _ns_per_call(full, args, repeat),
+            "decode_narrow_ns": _ns_per_call(narrow, args, repeat),
+        }
+        if layout is not None:
+            st = layout.st
+            bases = [(p, PKT_HDR_SIZE + 11 * st.size) for p in payloads]
+            row["fields_read"] = len(reader.names)
+            row["fields_total"] = len(layout.names)
+            row["read_full_ns"] = _ns_per_call(st.unpack_from, bases, repeat)
+            row["read_narrow_ns"] = _ns_per_call(reader.unpack_from, bases, repeat)
+            row["formats"] = list(reader.formats)
+        row["speedup"] = row["decode_full_ns"] / row["decode_narrow_ns"] if row["decode_narrow_ns"] else 0.0
+        out.append(row)
+    return out
+
+
+def run_all_cars(seconds: float = 10.0, repeat: int = 5) -> list[dict]:
+    """Los 22 autos por paquete: 22 x Struct.unpack_from contra np.frombuffer (si hay numpy)."""
+    if not vz.HAVE_NUMPY:
+        return []
+    records = list(SyntheticRace(seed=1).packets(seconds))
+    out = []
+    for name, pid, layout, fn, col in (
+        ("lap", 2, dl.LAPDATA_LAYOUT, vz.decode_lap_all, "car_pos"),
+        ("telemetry", 6, dl.CAR_TELEMETRY_LAYOUT, vz.decode_telemetry_all, "speed_kph"),
+        ("status", 7, dl.CAR_STATUS_LAYOUT, vz.decode_status_all, "fuel_remaining_laps"),
+        ("damage", 10, dl.CAR_DAMAGE_LAYOUT, vz.decode_damage_all, "front_left_wing"),
+    ):
+        payloads = [(p,) for _, p in records if p[6] == pid]
+        unpack = layout.st.unpack_from
+        size = layout.st.size
+        bases = range(PKT_HDR_SIZE, PKT_HDR_SIZE + 22 * size, size)
+
+        def loop(p, unpack=unpack, bases=bases) -> list:
+            return [unpack(p, b) for b in bases]
+
+        def column(p, fn=fn, col=col) -> list:
+            return fn(p)[col].tolist()
+
+        out.append(
+            {
+                "packet": name,
+                "packets": len(payloads),
+                "struct_loop_ns": _ns_per_call(loop, payloads, repeat),
+                "numpy_view_ns": _ns_per_call(fn, payloads, repeat),
+                "numpy_column_ns": _ns_per_call(column, payloads, repeat),
+            }
+        )
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Narrow field-subset decoders vs full-struct unpack")
+    ap.add_argument("--seconds", type=float, default=10.0, help="Seconds of synthetic race (60 Hz, 22 cars)")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per case (best is kept)")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    results = run(args.seconds, args.repeat)
+    all_cars = run_all_cars(args.seconds, args.repeat)
+    if args.json:
+        print(json.dumps({"player": results, "all_cars": all_cars}, indent=2))
+        return 0
+
+    for r in results:
+        line = (
+            f"{r['packet']:>9}: decode {r['decode_full_ns']:7.0f} -> {r['decode_narrow_ns']:7.0f} ns/pkt "
+            f"({r['speedup']:.2f}x)"
+        )
+        if "read_full_ns" in r:
+            line += (
+                f"  read {r['read_full_ns']:6.0f} -> {r['read_narrow_ns']:6.0f} ns "
+                f"({r['fields_read']}/{r['fields_total']} fields, {' + '.join(r['formats'])})"
+            )
+        print(line)
+
+    if not all_cars:
+        print("all 22 cars: numpy not installed, skipped")
+    for r in all_cars:
+        print(
+            f"{r['packet']:>9}: 22 cars  struct loop {r['struct_loop_ns']:7.0f} ns  "
+            f"np.frombuffer {r['numpy_view_ns']:6.0f} ns  (+1 column to list {r['numpy_column_ns']:6.0f} ns)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""
+Benchmark: topología vieja de dos colas (raw_queue -> _fanout -> dispatch_queue)
+contra PacketFanout directo (fuente -> dispatch_queue + recorder en un paso).
+
+  - burst: el productor empuja todo lo más rápido posible (throughput, pps)
+  - paced: el productor cede el loop entre paquetes, como datagramas sueltos (latencia por paquete)
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_fanout --packets 200000
+  python -m bench.bench_fanout --json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import struct
+import time
+from typing import Awaitable, Callable
+
+from ingenierof125.ingest.fanout import PacketFanout
+
+_TS = struct.Struct("<Q")
+_BODY = bytes(1352 - _TS.size)  # tamaño de un CarTelemetry
+
+
+class _RecorderSink:
+    """Consumidor tipo recorder: try_enqueue sobre su propia cola, drenada por un task."""
+
+    enabled = True
+
+    def __init__(self, maxsize: int) -> None:
+        self.q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def try_enqueue(self, data: bytes, rx_ns: int = 0) -> bool:
+        try:
+            self.q.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def drain(self) -> None:
+        while True:
+            await self.q.get()
+
+
+async def _dispatcher(q: "asyncio.Queue[bytes]", n: int, lat_ns: list[int]) -> None:
+    now = time.perf_counter_ns
+    unpack = _TS.unpack_from
+    for _ in range(n):
+        item = await q.get()
+        data = item[1] if type(item) is tuple else item  # PacketFanout encola (rx_ns, payload)
+        lat_ns.append(now() - unpack(data)[0])
+
+
+async def _produce(n: int, paced: bool, emit: Callable[[bytes], Awaitable[None]]) -> None:
+    now = time.perf_counter_ns
+    pack = _TS.pack
+    for _ in range(n):
+        await emit(pack(now()) + _BODY)
+        if paced:
+            await asyncio.sleep(0)
+
+
+async def _run(topology: str, n: int, paced: bool, maxsize: int) -> dict:
+    dispatch_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+    rec = _RecorderSink(maxsize)
+    lat_ns: list[int] = []
+    tasks = [asyncio.create_task(rec.drain())]
+
+    if topology == "two_queue":
+        raw_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+
+        async def _fanout() -> None:
+            while True:
+                data = await raw_q.get()
+                rec.try_enqueue(data)
+                await dispatch_q.put(data)
+
+        tasks.append(asyncio.create_task(_fanout()))
+        emit = raw_q.put
+    else:
+        emit = PacketFanout(dispatch_q, recorder=rec).publish_wait  # type: ignore[arg-type]
+
+    consumer = asyncio.create_task(_dispatcher(dispatch_q, n, lat_ns))
+    t0 = time.perf_counter()
+    await _produce(n, paced, emit)
+    await consumer
+    elapsed = time.perf_counter() - t0
+
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    lat_ns.sort()
+
+    def pct(p: float) -> float:
+        return lat_ns[min(len(lat_ns) - 1, int(p * len(lat_ns)))] / 1000.0
+
+    return {
+        "topology": topology,
+        "mode": "paced" if paced else "burst",
+        "packets": n,
+        "pps": n / elapsed if elapsed > 0 else 0.0,
+        "lat_p50_us": pct(0.50),
+        "lat_p99_us": pct(0.99),
+        "lat_max_us": lat_ns[-1] / 1000.0,
+        "rec_drop": rec.dropped,
+    }
+
+
+def run(packets: int = 100_000, maxsize: int = 2048) -> list[dict]:
+    out: list[dict] = []
+    for paced in (False, True):
+        for topology in ("two_queue", "direct"):
+            out.append(asyncio.run(_run(topology, packets, paced, maxsize)))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Fan-out: two-queue vs direct")
+    ap.add_argument("--packets", type=int, default=100_000)
+    ap.add_argument("--queue-maxsize", type=int, default=2048)
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    results = run(args.packets, args.queue_maxsize)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for r in results:
+        print(
+            f"{r['mode']:>5} {r['topology']:>9}: {r['pps']:>10.0f} pps  "
+            f"p50={r['lat_p50_us']:8.1f}us p99={r['lat_p99_us']:8.1f}us max={r['lat_max_us']:9.1f}us"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
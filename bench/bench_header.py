@@ -0,0 +1,158 @@
+"""
+Benchmark: costo del header por paquete, como lo hacía el dispatcher antes y ahora.
+
+  legacy      dataclass frozen por paquete (PacketHeader de antes, acá abajo) +
+              int()/float() en cada campo + apply_packet(...) con kwargs
+  parse       protocol.parse_header (NamedTuple armado directo de unpack_from)
+  dispatch    parse_header + apply_header(hdr, payload, rx_ns) (lo que hace hoy)
+  unpack      PKT_HDR.unpack_from a secas (piso)
+
+El estado es un sink vacío: se mide sólo el manejo del header. Reporta ns por paquete
+y ms por millón de paquetes sobre el tráfico mezclado de una carrera sintética.
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_header --seconds 10
+  python -m bench.bench_header --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from ingenierof125.telemetry.protocol import PKT_HDR, parse_header
+from ingenierof125.telemetry.synthetic import SyntheticRace
+
+
+# --- baseline: el header como era antes (frozen dataclass + coerciones en el dispatcher) ---
+
+@dataclass(frozen=True, slots=True)
+class _LegacyHeader:
+    packet_format: int
+    game_year: int
+    game_major_version: int
+    game_minor_version: int
+    packet_version: int
+    packet_id: int
+    session_uid: int
+    session_time: float
+    frame_identifier: int
+    overall_frame_identifier: int
+    player_car_index: int
+    secondary_player_car_index: int
+
+    _STRUCT = struct.Struct("<HBBBBBQfIIBB")
+
+    @staticmethod
+    def try_parse(data: bytes) -> "_LegacyHeader | None":
+        if len(data) < _LegacyHeader._STRUCT.size:
+            return None
+        try:
+            pf, gy, gmaj, gmin, pver, pid, suid, st, frame, oframe, pci, spci = _LegacyHeader._STRUCT.unpack_from(data, 0)
+            return _LegacyHeader(pf, gy, gmaj, gmin, pver, pid, suid, st, frame, oframe, pci, spci)
+        except Exception:
+            return None
+
+
+class _Sink:
+    """StateManager sin estado: apply_header/apply_packet no hacen nada."""
+
+    def apply_packet(self, packet_id, payload, session_time, player_index, rx_ns=0) -> None:
+        pass
+
+    def apply_header(self, hdr, payload, rx_ns=0) -> None:
+        self.apply_packet(hdr[5], payload, hdr[7], hdr[10], rx_ns)
+
+
+def _legacy(payloads: list[bytes], sink: _Sink) -> None:
+    parse = _LegacyHeader.try_parse
+    for data in payloads:
+        hdr = parse(data)
+        if hdr is None:
+            continue
+        if hdr.packet_format != 2025 or hdr.game_year != 25:  # chequeos del dispatcher
+            pass
+        int(hdr.packet_id)  # _touch_ids
+        sink.apply_packet(
+            packet_id=int(hdr.packet_id),
+            payload=data,
+            session_time=float(hdr.session_time),
+            player_index=int(hdr.player_car_index),
+            rx_ns=0,
+        )
+
+
+def _parse(payloads: list[bytes], sink: _Sink) -> None:
+    parse = parse_header
+    for data in payloads:
+        parse(data)
+
+
+def _dispatch(payloads: list[bytes], sink: _Sink) -> None:
+    parse = parse_header
+    apply = sink.apply_header
+    for data in payloads:
+        hdr = parse(data)
+        if hdr is None:
+            continue
+        if hdr.packet_format != 2025 or hdr.game_year != 25:  # chequeos del dispatcher
+            pass
+        apply(hdr, data, 0)
+
+
+def _unpack(payloads: list[bytes], sink: _Sink) -> None:
+    unpack = PKT_HDR.unpack_from
+    for data in payloads:
+        unpack(data, 0)
+
+
+_CASES: tuple[tuple[str, Callable[[list[bytes], _Sink], None]], ...] = (
+    ("legacy", _legacy),
+    ("parse", _parse),
+    ("dispatch", _dispatch),
+    ("unpack", _unpack),
+)
+
+
+def run(seconds: float = 10.0, repeat: int = 5) -> list[dict]:
+    payloads = [p for _, p in SyntheticRace(seed=1).packets(seconds)]
+    sink = _Sink()
+    out = []
+    for name, fn in _CASES:
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter_ns()
+            fn(payloads, sink)
+            best = min(best, time.perf_counter_ns() - t0)
+        ns = best / max(1, len(payloads))
+        out.append({"case": name, "packets": len(payloads), "ns_per_packet": ns, "ms_per_million": ns})  # ns/pkt == ms por 1M
+    base = out[0]["ns_per_packet"]
+    for r in out:
+        r["vs_legacy"] = base / r["ns_per_packet"] if r["ns_per_packet"] else 0.0
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Per-packet header handling cost: legacy dataclass vs NamedTuple fast path")
+    ap.add_argument("--seconds", type=float, default=10.0, help="Seconds of synthetic race (60 Hz, 22 cars)")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per case (best is kept)")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    results = run(args.seconds, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for r in results:
+        print(
+            f"{r['case']:>9}: {r['ns_per_packet']:6.0f} ns/pkt  {r['ms_per_million']:7.0f} ms per 1M packets  "
+            f"({r['vs_legacy']:.2f}x vs legacy)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
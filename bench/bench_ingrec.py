@@ -0,0 +1,190 @@
+"""
+Benchmark: .ingrec v1 (crudo) contra v2 (bloques comprimidos) sobre una carrera sintética.
+
+Genera N segundos de tráfico F1 25 con 22 autos (Motion/LapData/CarTelemetry/CarStatus
+a la tasa de envío, Session a 2 Hz, CarDamage a 10 Hz) con valores que evolucionan
+cuadro a cuadro, y mide por variante:
+  - tamaño de archivo y ratio contra el crudo
+  - encode MB/s (MB crudos por segundo escribiendo a memoria)
+  - decode MB/s (IngrecReader recorriendo todos los records desde disco)
+
+Para v1 se agrega la línea base del lector viejo (tres f.read por record) contra
+el IngrecReader sobre mmap.
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_ingrec --seconds 60
+  python -m bench.bench_ingrec --json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import math
+import os
+import struct
+import tempfile
+import time
+
+from ingenierof125.ingest.ingrec import FILE_HEADER, IngrecReader, make_writer
+
+_HDR = struct.Struct("<HBBBBBQfIIBB")
+_CARS = 22
+
+# packet_id -> (tamaño total, bytes extra al final, tasa en Hz; 0 = tasa de envío)
+_TYPES = {
+    0: (1349, 0, 0),
+    2: (1285, 2, 0),
+    6: (1352, 3, 0),
+    7: (1239, 0, 0),
+    1: (753, 0, 2),
+    10: (1041, 0, 10),
+}
+_CAR_FLOATS = struct.Struct("<6f")
+
+
+def synthetic_race(seconds: float, hz: int = 60) -> list[tuple[int, bytes]]:
+    """Records (ts_ns, payload) de una carrera sintética: 22 autos, valores suaves."""
+    out: list[tuple[int, bytes]] = []
+    t0 = 1_700_000_000_000_000_000
+    frames = int(seconds * hz)
+    for frame in range(frames):
+        st = frame / hz
+        ts = t0 + int(st * 1e9)
+        for pid, (size, extra, rate) in _TYPES.items():
+            if rate and frame % max(1, hz // rate):
+                continue
+            body = bytearray(size)
+            body[: _HDR.size] = _HDR.pack(2025, 25, 1, 0, 1, pid, 0xC0FFEE, st, frame, frame, 0, 255)
+            car_sz = (size - _HDR.size - extra) // _CARS
+            if car_sz >= _CAR_FLOATS.size:
+                for car in range(_CARS):
+                    ph = st * 0.05 + car * 0.3
+                    _CAR_FLOATS.pack_into(
+                        body,
+                        _HDR.size + car * car_sz,
+                        1000.0 * math.cos(ph),
+                        1000.0 * math.sin(ph),
+                        80.0 + 5.0 * math.sin(st + car),
+                        st * (1.0 + car / 100.0),
+                        90.0 + car,
+                        1.0 - st / 5000.0,
+                    )
+            out.append((ts, bytes(body)))
+    return out
+
+
+_VARIANTS = (
+    ("v1", "none", None),
+    ("v2", "none", None),
+    ("v2", "zlib", 1),
+    ("v2", "zlib", 6),
+    ("v2", "lzma", 0),
+)
+
+
+def _read_legacy(path: str) -> int:
+    # el loop viejo de PacketReplayer: header, length y payload con tres read()
+    n = 0
+    with open(path, "rb") as f:
+        f.read(FILE_HEADER.size)
+        while True:
+            hdr = f.read(8)
+            if not hdr:
+                break
+            (_ts,) = struct.unpack("<Q", hdr)
+            ln_bytes = f.read(4)
+            if len(ln_bytes) < 4:
+                break
+            (ln,) = struct.unpack("<I", ln_bytes)
+            payload = f.read(ln)
+            if len(payload) < ln:
+                break
+            n += 1
+    return n
+
+
+def _measure(
+    records: list[tuple[int, bytes]],
+    fmt: str,
+    codec: str,
+    level,
+    block_bytes: int,
+    legacy: bool = False,
+) -> dict:
+    raw_bytes = sum(len(p) for _, p in records)
+
+    buf = io.BytesIO()
+    t0 = time.perf_counter()
+    w = make_writer(buf, fmt, codec=codec, level=level, block_bytes=block_bytes)
+    for i in range(0, len(records), 64):  # lotes como los del recorder
+        w.write_batch(records[i:i + 64])
+    w.close()
+    enc_s = time.perf_counter() - t0
+    data = buf.getvalue()
+
+    fd, path = tempfile.mkstemp(suffix=".ingrec")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        t0 = time.perf_counter()
+        n = 0
+        if legacy:
+            n = _read_legacy(path)
+        else:
+            with IngrecReader(path) as r:
+                for _ts, _payload in r:
+                    n += 1
+        dec_s = time.perf_counter() - t0
+    finally:
+        os.unlink(path)
+
+    if n != len(records):
+        raise RuntimeError(f"{fmt}/{codec}: read {n} records, wrote {len(records)}")
+
+    mb = raw_bytes / 1e6
+    return {
+        "format": fmt,
+        "codec": codec if fmt == "v2" else "-",
+        "level": level,
+        "reader": "f.read" if legacy else "mmap",
+        "records": n,
+        "raw_mb": mb,
+        "file_mb": len(data) / 1e6,
+        "ratio": raw_bytes / len(data) if data else 0.0,
+        "enc_mb_s": mb / enc_s if enc_s > 0 else 0.0,
+        "dec_mb_s": mb / dec_s if dec_s > 0 else 0.0,
+    }
+
+
+def run(seconds: float = 30.0, block_bytes: int = 1 << 20) -> list[dict]:
+    records = synthetic_race(seconds)
+    out = [_measure(records, "v1", "none", None, block_bytes, legacy=True)]
+    out += [_measure(records, fmt, codec, level, block_bytes) for fmt, codec, level in _VARIANTS]
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=".ingrec v1 vs v2 (size, encode/decode throughput)")
+    ap.add_argument("--seconds", type=float, default=30.0, help="Seconds of synthetic race (60 Hz, 22 cars)")
+    ap.add_argument("--block-bytes", type=int, default=1 << 20)
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    results = run(args.seconds, args.block_bytes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for r in results:
+        name = f"{r['format']} {r['codec']}" + (f"-{r['level']}" if r["level"] is not None else "")
+        name += f" [{r['reader']}]"
+        print(
+            f"{name:>20}: {r['file_mb']:8.2f} MB (raw {r['raw_mb']:.2f} MB, x{r['ratio']:5.1f})  "
+            f"enc={r['enc_mb_s']:8.1f} MB/s  dec={r['dec_mb_s']:8.1f} MB/s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+"""
+Benchmark: vistas de telemetry.packets (los paquetes que no decodifica decoders_lite).
+
+Por tipo de paquete, sobre payloads del tamaño exacto con bytes al azar:
+
+  view      spec.view(payload): validar tamaño + memoryview (lo que paga cada paquete)
+  field     view + un campo (un auto o un campo suelto)
+  eager     decodificar todo el paquete (unpack de cada bloque / iter_unpack de los arrays)
+
+Y el camino caliente: StateManager.apply_packet sobre el tráfico de una carrera sintética
+(Session/LapData/Telemetry/Status/Damage) con y sin el plugin de vistas registrado.
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_packets
+  python -m bench.bench_packets --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import struct
+import time
+from typing import Callable
+
+from ingenierof125.state.handlers import HANDLERS
+from ingenierof125.state.manager import StateManager
+from ingenierof125.telemetry import packets
+from ingenierof125.telemetry.packets import PACKET_SPECS, PacketSpec
+from ingenierof125.telemetry.protocol import PKT_HDR
+from ingenierof125.telemetry.synthetic import SyntheticRace
+
+# campo que lee el caso "field" por paquete: (array o None, campo)
+_FIELD: dict[str, tuple[str | None, str]] = {
+    "motion": ("cars", "world_position_x"),
+    "event": (None, "code"),
+    "participants": ("cars", "race_number"),
+    "car_setups": ("cars", "front_wing"),
+    "final_classification": ("cars", "position"),
+    "lobby_info": ("cars", "ready_status"),
+    "session_history": ("laps", "lap_time_ms"),
+    "tyre_sets": ("sets", "wear"),
+    "motion_ex": (None, "wheel_speed_fl"),
+    "time_trial": ("sets", "lap_time_ms"),
+    "lap_positions": ("laps", "car_0"),
+}
+
+
+def make_payload(spec: PacketSpec, rng: random.Random) -> bytes:
+    buf = bytearray(rng.randbytes(spec.size))
+    PKT_HDR.pack_into(buf, 0, 2025, 25, 1, 0, 1, spec.packet_id, 1, 1.0, 1, 1, 0, 255)
+    if spec.name == "event":
+        struct.pack_into("<4s", buf, PKT_HDR.size, b"FTLP")
+    return bytes(buf)
+
+
+def _eager(spec: PacketSpec) -> Callable[[bytes], list]:
+    """Todo el paquete decodificado, como lo haría un decoder sin vistas."""
+    parts = []
+    for b in spec.blocks:
+        st = b.layout.st
+        if b.count is None:
+            parts.append((False, b.offset, b.offset + st.size, st))
+        else:
+            parts.append((True, b.offset, b.offset + b.size, st))
+
+    def decode(payload: bytes) -> list:
+        out = []
+        for is_array, start, end, st in parts:
+            if is_array:
+                out.append(list(st.iter_unpack(payload[start:end])))
+            else:
+                out.append(st.unpack_from(payload, start))
+        return out
+
+    return decode
+
+
+def _best(fn: Callable[[], None], n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter_ns()
+        fn()
+        best = min(best, time.perf_counter_ns() - t0)
+    return best / n
+
+
+def run_views(n: int = 20000, repeat: int = 5) -> list[dict]:
+    rng = random.Random(1)
+    out = []
+    for spec in PACKET_SPECS.values():
+        payload = make_payload(spec, rng)
+        make = spec.view
+        arr, name = _FIELD[spec.name]
+        eager = _eager(spec)
+        rows = range(n)
+
+        def view() -> None:
+            for _ in rows:
+                make(payload)
+
+        if arr is None:
+            def one_field() -> None:
+                for _ in rows:
+                    getattr(make(payload), name)
+        else:
+            def one_field() -> None:
+                for _ in rows:
+                    getattr(getattr(make(payload), arr)[0], name)
+
+        def full() -> None:
+            for _ in rows:
+                eager(payload)
+
+        out.append(
+            {
+                "packet": spec.name,
+                "packet_id": spec.packet_id,
+                "size": spec.size,
+                "view_ns": _best(view, n, repeat),
+                "field_ns": _best(one_field, n, repeat),
+                "eager_ns": _best(full, n, repeat),
+            }
+        )
+    return out
+
+
+def run_hot_path(seconds: float = 10.0, repeat: int = 5) -> dict:
+    records = [(p[6], p, struct.unpack_from("<f", p, 15)[0], p[27]) for _, p in SyntheticRace(seed=1).packets(seconds)]
+    reg = HANDLERS.copy()
+    packets.register(reg)
+
+    res = {"packets": len(records)}
+    for label, registry in (("builtin_ns", HANDLERS), ("with_views_ns", reg)):
+        def apply(registry=registry) -> None:
+            sm = StateManager(registry=registry)
+            ap = sm.apply_packet
+            for pid, p, st, idx in records:
+                ap(pid, p, st, idx)
+
+        res[label] = _best(apply, len(records), repeat)
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Lazy packet views: construction/field/eager cost, and state hot path")
+    ap.add_argument("-n", type=int, default=20000, help="Packets per case")
+    ap.add_argument("--seconds", type=float, default=10.0, help="Seconds of synthetic race for the hot-path case")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per case (best is kept)")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = ap.parse_args()
+
+    views = run_views(args.n, args.repeat)
+    hot = run_hot_path(args.seconds, args.repeat)
+    if args.json:
+        print(json.dumps({"views": views, "hot_path": hot}, indent=2))
+        return 0
+    for r in views:
+        print(
+            f"{r['packet']:>20} ({r['size']:4d} B): view {r['view_ns']:5.0f} ns  +1 field {r['field_ns']:5.0f} ns  "
+            f"eager {r['eager_ns']:6.0f} ns ({r['eager_ns'] / r['field_ns']:.1f}x)"
+        )
+    print(
+        f"state.apply_packet ({hot['packets']} pkts): builtin {hot['builtin_ns']:.0f} ns/pkt  "
+        f"with views plugin {hot['with_views_ns']:.0f} ns/pkt"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
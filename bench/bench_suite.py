@@ -0,0 +1,395 @@
+"""
+Suite de benchmarks del pipeline, de punta a punta, sobre una carrera sintética
+(ingenierof125.telemetry.synthetic: 22 autos, 60 Hz, con SC y combustible bajo).
+
+  header.try_parse        protocol.parse_header sobre el tráfico mezclado (nombre histórico)
+  decode.<tipo>           cada decoder de decoders_lite (jugador)
+  state.apply_packet      StateManager.apply_packet sobre el tráfico mezclado
+  detector.detect         EventDetector.detect con estado completo (genera eventos)
+  priority.select         PriorityManager.select con los eventos del detector
+  recorder.write          PacketRecorder (loop + hilo escritor) a disco, v2/zlib
+  pipeline                fanout -> cola -> dispatcher -> estado (+ engine a 10 Hz)
+  pipeline.record         ídem con el recorder grabando
+
+Cada caso se corre --repeat veces y se queda el mejor. La salida JSON (--json / --out)
+trae metadatos de la corrida para comparar entre corridas.
+
+Budgets (opcional, para correr local): JSON {nombre: {"max_ns_per_op": x} o
+{"min_ops_s": y}}; si alguno no se cumple se listan y el exit code es 1.
+
+Uso (desde la raíz del repo):
+  python -m bench.bench_suite
+  python -m bench.bench_suite --json --out bench-$(date +%F).json
+  python -m bench.bench_suite --budgets bench/budgets.json
+  python -m bench.bench_suite --only decode --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.engine.detector import EventDetector
+from ingenierof125.engine.engine import EngineerEngine
+from ingenierof125.engine.priority import PriorityManager
+from ingenierof125.ingest.fanout import PacketFanout
+from ingenierof125.ingest.recorder import PacketRecorder
+from ingenierof125.rules.model import RuleConfig
+from ingenierof125.state.manager import StateManager
+from ingenierof125.telemetry import decoders_lite as dl
+from ingenierof125.telemetry.dispatcher import PacketDispatcher
+from ingenierof125.telemetry.protocol import parse_header
+from ingenierof125.telemetry.synthetic import Scenario, SyntheticRace
+
+Records = list[tuple[int, bytes]]
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    ops: int
+    wall_s: float
+    bytes: int = 0
+
+    @property
+    def ns_per_op(self) -> float:
+        return self.wall_s * 1e9 / self.ops if self.ops else 0.0
+
+    @property
+    def ops_s(self) -> float:
+        return self.ops / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def mb_s(self) -> float:
+        return self.bytes / 1e6 / self.wall_s if self.wall_s > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        d = {
+            "name": self.name,
+            "ops": self.ops,
+            "wall_s": self.wall_s,
+            "ns_per_op": self.ns_per_op,
+            "ops_s": self.ops_s,
+        }
+        if self.bytes:
+            d["mb_s"] = self.mb_s
+        return d
+
+
+def race_records(seconds: float, seed: int = 1) -> Records:
+    race = SyntheticRace(
+        seed=seed,
+        scenarios=[Scenario("safety_car", 0.0, 3600.0), Scenario("fuel_low", 0.0, 1.0)],
+    )
+    return list(race.packets(seconds))
+
+
+def _best(fn: Callable[[], int], repeat: int) -> tuple[int, float]:
+    # (ops, mejor tiempo): fn corre el caso completo y devuelve cuántas operaciones hizo
+    best = float("inf")
+    ops = 0
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        ops = fn()
+        best = min(best, time.perf_counter() - t0)
+    return ops, best
+
+
+# --- micro ---
+
+def bench_header(records: Records, repeat: int) -> list[BenchResult]:
+    payloads = [p for _, p in records]
+    parse = parse_header
+
+    def run() -> int:
+        for p in payloads:
+            parse(p)
+        return len(payloads)
+
+    return [BenchResult("header.try_parse", *_best(run, repeat))]
+
+
+_DECODERS = (
+    ("decode.session", 1, lambda p, i: dl.decode_session(p)),
+    ("decode.lap", 2, dl.decode_lap_player),
+    ("decode.telemetry", 6, dl.decode_telemetry_player),
+    ("decode.status", 7, dl.decode_status_player),
+    ("decode.damage", 10, dl.decode_damage_player),
+)
+
+
+def bench_decoders(records: Records, repeat: int) -> list[BenchResult]:
+    out = []
+    for name, pid, fn in _DECODERS:
+        payloads = [p for _, p in records if p[6] == pid]
+
+        def run(payloads=payloads, fn=fn) -> int:
+            for p in payloads:
+                fn(p, 0)
+            return len(payloads)
+
+        ops, wall = _best(run, repeat)
+        out.append(BenchResult(name, ops, wall, sum(len(p) for p in payloads)))
+    return out
+
+
+def _parsed(records: Records) -> list[tuple[int, bytes, float, int]]:
+    out = []
+    for _, p in records:
+        h = parse_header(p)
+        if h is not None:
+            out.append((h.packet_id, p, h.session_time, h.player_car_index))
+    return out
+
+
+def _warm_state(records: Records) -> StateManager:
+    sm = StateManager()
+    for pid, p, st, player in _parsed(records):
+        sm.apply_packet(pid, p, st, player)
+    return sm
+
+
+def bench_state(records: Records, repeat: int) -> list[BenchResult]:
+    items = _parsed(records)
+
+    def run() -> int:
+        apply = StateManager().apply_packet
+        for pid, p, st, player in items:
+            apply(pid, p, st, player)
+        return len(items)
+
+    return [BenchResult("state.apply_packet", *_best(run, repeat))]
+
+
+def bench_engine(records: Records, repeat: int, calls: int = 20_000) -> list[BenchResult]:
+    cfg = RuleConfig(comms_throttle_s=0.0)
+    state = _warm_state(records).state
+    events = EventDetector(cfg).detect(state)
+    if not events:
+        raise RuntimeError("synthetic state produced no events (detector bench would be empty)")
+
+    def run_detect() -> int:
+        detect = EventDetector(cfg).detect
+        for _ in range(calls):
+            detect(state)
+        return calls
+
+    def run_select() -> int:
+        select = PriorityManager(throttle_s=0.0).select
+        for i in range(calls):
+            select(events, i * 0.1)
+        return calls
+
+    return [
+        BenchResult("detector.detect", *_best(run_detect, repeat)),
+        BenchResult("priority.select", *_best(run_select, repeat)),
+    ]
+
+
+# --- recorder / pipeline (asyncio) ---
+
+class _NullComms:
+    # el pipeline mide hasta el engine; las alertas no van a ningún lado
+    def emit(self, ev) -> None:
+        pass
+
+
+async def _record(records: Records, out_dir: str) -> int:
+    rec = PacketRecorder(
+        out_dir,
+        enabled=True,
+        queue_maxsize=len(records) + 1,
+        writer_max_pending=len(records),
+        fmt="v2",
+        codec="zlib",
+    )
+    task = asyncio.create_task(rec.run())
+    await asyncio.sleep(0)
+    for i in range(0, len(records), 256):
+        for ts, p in records[i:i + 256]:
+            rec.try_enqueue(p, ts)
+        await asyncio.sleep(0)
+    rec.stop()
+    await task
+    if rec.stats.dropped:
+        raise RuntimeError(f"recorder dropped {rec.stats.dropped} records")
+    return rec.stats.written
+
+
+def bench_recorder(records: Records, repeat: int) -> list[BenchResult]:
+    raw = sum(len(p) for _, p in records)
+
+    def run() -> int:
+        with tempfile.TemporaryDirectory() as d:
+            return asyncio.run(_record(records, d))
+
+    ops, wall = _best(run, repeat)
+    return [BenchResult("recorder.write", ops, wall, raw)]
+
+
+async def _pipeline(records: Records, record_dir: Optional[str]) -> int:
+    stats = RuntimeStats()
+    sm = StateManager()
+    q: asyncio.Queue = asyncio.Queue(maxsize=2048)
+    dispatcher = PacketDispatcher(2025, 25, stats=stats, state_manager=sm)
+    recorder = PacketRecorder(record_dir or "", enabled=record_dir is not None, stats=stats, writer_max_pending=4096)
+    fanout = PacketFanout(q, recorder=recorder)
+    engine = EngineerEngine.create(RuleConfig(), _NullComms())  # type: ignore[arg-type]
+
+    async def engine_loop() -> None:
+        while True:
+            engine.tick(sm.state, float(sm.state.latest_session_time or 0.0))
+            await asyncio.sleep(0.1)
+
+    disp_task = asyncio.create_task(dispatcher.run(q))
+    engine_task = asyncio.create_task(engine_loop())
+    rec_task = asyncio.create_task(recorder.run()) if record_dir is not None else None
+
+    publish = fanout.publish_wait
+    for _ts, p in records:
+        await publish(p)
+    while stats.dispatched_in < len(records):
+        await asyncio.sleep(0)
+
+    # el engine duerme entre ticks: se cancela para no medir su sleep
+    engine_task.cancel()
+    dispatcher.stop()
+    if rec_task is not None:
+        recorder.stop()
+        await rec_task
+    await asyncio.gather(disp_task, engine_task, return_exceptions=True)
+    return stats.dispatched_in
+
+
+def bench_pipeline(records: Records, repeat: int) -> list[BenchResult]:
+    raw = sum(len(p) for _, p in records)
+
+    def plain() -> int:
+        return asyncio.run(_pipeline(records, None))
+
+    def recorded() -> int:
+        with tempfile.TemporaryDirectory() as d:
+            return asyncio.run(_pipeline(records, d))
+
+    return [
+        BenchResult("pipeline", *_best(plain, repeat), raw),
+        BenchResult("pipeline.record", *_best(recorded, repeat), raw),
+    ]
+
+
+_SUITE = (
+    (("header.try_parse",), bench_header),
+    (tuple(name for name, _, _ in _DECODERS), bench_decoders),
+    (("state.apply_packet",), bench_state),
+    (("detector.detect", "priority.select"), bench_engine),
+    (("recorder.write",), bench_recorder),
+    (("pipeline", "pipeline.record"), bench_pipeline),
+)
+
+
+def run(seconds: float = 10.0, repeat: int = 3, only: str = "") -> list[BenchResult]:
+    records = race_records(seconds)
+    out: list[BenchResult] = []
+    for names, fn in _SUITE:
+        if only and not any(only in n for n in names):
+            continue
+        out += fn(records, repeat)
+    return [r for r in out if only in r.name]
+
+
+# --- budgets ---
+
+def check_budgets(results: list[BenchResult], budgets: dict) -> list[str]:
+    """Lista de incumplimientos (vacía = todo ok). Budgets de casos que no corrieron se ignoran."""
+    by_name = {r.name: r for r in results}
+    failures = []
+    for name, limits in budgets.items():
+        r = by_name.get(name)
+        if r is None:
+            continue
+        max_ns = limits.get("max_ns_per_op")
+        if max_ns is not None and r.ns_per_op > float(max_ns):
+            failures.append(f"{name}: {r.ns_per_op:.0f} ns/op > budget {float(max_ns):.0f}")
+        min_ops = limits.get("min_ops_s")
+        if min_ops is not None and r.ops_s < float(min_ops):
+            failures.append(f"{name}: {r.ops_s:.0f} ops/s < budget {float(min_ops):.0f}")
+    return failures
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return out.stdout.strip() if out.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def report(results: list[BenchResult], failures: list[str], *, seconds: float, repeat: int) -> dict:
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "race_seconds": seconds,
+            "repeat": repeat,
+        },
+        "results": [r.as_dict() for r in results],
+        "budget_failures": failures,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Pipeline benchmark suite (JSON results, optional budgets)")
+    ap.add_argument("--seconds", type=float, default=10.0, help="Seconds of synthetic race (60 Hz, 22 cars)")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per case (best is kept)")
+    ap.add_argument("--only", type=str, default="", help="Run cases whose name contains this")
+    ap.add_argument("--budgets", type=str, default="", help="JSON budgets file; exit 1 on violation")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON")
+    ap.add_argument("--out", type=str, default="", help="Also write the JSON report here")
+    args = ap.parse_args()
+
+    budgets = {}
+    if args.budgets:
+        try:
+            budgets = json.loads(Path(args.budgets).read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: bad budgets file {args.budgets}: {e}")
+            return 2
+
+    results = run(args.seconds, args.repeat, args.only)
+    failures = check_budgets(results, budgets)
+    rep = report(results, failures, seconds=args.seconds, repeat=args.repeat)
+    if args.out:
+        Path(args.out).write_text(json.dumps(rep, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(rep, indent=2))
+    else:
+        for r in results:
+            extra = f"  {r.mb_s:8.1f} MB/s" if r.bytes else ""
+            print(f"{r.name:<20} {r.ops_s:>12.0f} ops/s  {r.ns_per_op:>10.0f} ns/op{extra}")
+        for f in failures:
+            print(f"BUDGET FAIL  {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,12 +9,17 @@ from ingenierof125.core.config import AppConfig
 from ingenierof125.core.logging_setup import setup_logging
 from ingenierof125.core.stats import RuntimeStats, StatsReporter
 from ingenierof125.engine.engine import EngineerEngine
+from ingenierof125.ingest.fanout import PacketFanout
 from ingenierof125.ingest.recorder import PacketRecorder
 from ingenierof125.ingest.replay import PacketReplayer
+from ingenierof125.offline.batch import run_batch
 from ingenierof125.rules.load import default_rules_path, load_rules
 from ingenierof125.rules.model import RuleConfig
-from ingenierof125.state.manager import StateManager
+from ingenierof125.state.handlers import load_plugins
+from ingenierof125.state.manager import LAZY_STATE_IDS, StateManager, parse_body_cache_ids
 from ingenierof125.telemetry.dispatcher import PacketDispatcher
+from ingenierof125.telemetry.packet_filter import PacketIdFilter
+from ingenierof125.telemetry.queues import make_dispatch_queue
 from ingenierof125.telemetry.udp_listener import UdpListener
 
 
@@ -37,6 +42,13 @@ def _get(obj: Any, name: str, default: Any) -> Any:
     return getattr(obj, name, default)
 
 
+def _load_rule_config(rules_path: str, comm_throttle: float) -> RuleConfig:
+    rules = load_rules(rules_path or default_rules_path())
+    if comm_throttle > 0 and hasattr(rules, "override"):
+        rules = rules.override(throttle_s=comm_throttle)
+    return rules.as_rule_config()
+
+
 async def run_app(args: Any) -> int:
     cfg = args if isinstance(args, AppConfig) else AppConfig.from_obj(args)
     setup_logging(cfg)
@@ -45,21 +57,42 @@ async def run_app(args: Any) -> int:
     # Config (robusto: por si algÃºn campo falta)
     listen = str(_get(cfg, "listen", "0.0.0.0:20777") or "0.0.0.0:20777")
     host, port = _parse_listen(listen)
+    udp_mode = str(_get(cfg, "udp_mode", "callback") or "callback")
+    udp_batch_max = int(_get(cfg, "udp_batch_max", 256) or 256)
+    udp_rcvbuf = int(_get(cfg, "udp_rcvbuf", 0) or 0)
 
     replay_path = str(_get(cfg, "replay", "") or "")
     replay_speed = float(_get(cfg, "replay_speed", 1.0) or 1.0)
     replay_no_sleep = bool(_get(cfg, "replay_no_sleep", False))
+    replay_start = str(_get(cfg, "replay_start", "") or "")
+    replay_end = str(_get(cfg, "replay_end", "") or "")
 
     packet_format = int(_get(cfg, "packet_format", 2025) or 2025)
     game_year = int(_get(cfg, "game_year", 25) or 25)
 
     strict_format = bool(_get(cfg, "strict_format", False))
     strict_game_year = bool(_get(cfg, "strict_game_year", False))
+    packet_allow = str(_get(cfg, "packet_allow", "") or "")
+    body_cache_ids = parse_body_cache_ids(str(_get(cfg, "body_cache_ids", "1,10") or ""))
+    lazy_ids = LAZY_STATE_IDS if bool(_get(cfg, "lazy_state", False)) else ()
+
+    # plugins de estado: antes de crear StateManager y el allow-list "state"
+    state_plugins = str(_get(cfg, "state_plugins", "") or "")
+    if state_plugins:
+        try:
+            load_plugins(state_plugins)
+        except ValueError as e:
+            log.error("%s", e)
+            return 2
 
     queue_maxsize = int(_get(cfg, "queue_maxsize", 2048) or 2048)
+    queue_policy = str(_get(cfg, "queue_policy", "fifo") or "fifo")
 
     record_enabled = bool(_get(cfg, "record", False))
     record_dir = str(_get(cfg, "record_dir", "recordings") or "recordings")
+    record_fsync_s = float(_get(cfg, "record_fsync_s", 0.0) or 0.0)
+    record_format = str(_get(cfg, "record_format", "v2") or "v2")
+    record_codec = str(_get(cfg, "record_codec", "zlib") or "zlib")
 
     stats_interval = float(_get(cfg, "stats_interval", 0.0) or 0.0)
     state_interval = float(_get(cfg, "state_interval", 0.0) or 0.0)
@@ -72,12 +105,31 @@ async def run_app(args: Any) -> int:
         engine_tick_hz = 10.0
     engine_dt = 1.0 / engine_tick_hz
 
+    # Batch offline: sin UDP/colas/recorder, todo sincrónico y a máxima velocidad
+    if bool(_get(cfg, "replay_batch", False)):
+        if not replay_path:
+            log.error("--replay-batch needs --replay FILE")
+            return 2
+        events_out = str(_get(cfg, "events_out", "") or "")
+        run_batch(
+            replay_path,
+            _load_rule_config(rules_path, comm_throttle),
+            tick_hz=engine_tick_hz,
+            events_out=events_out,
+            body_cache_ids=body_cache_ids,
+            lazy_ids=lazy_ids,
+        )
+        return 0
+
     # Runtime
     stats = RuntimeStats()
-    state_mgr = StateManager()
+    state_mgr = StateManager(body_cache_ids=body_cache_ids, lazy_ids=lazy_ids)
+    if lazy_ids:
+        log.info("Lazy state: packets %s decoded on read", list(lazy_ids))
 
-    raw_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_maxsize)
-    dispatch_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_maxsize)
+    # fifo: todo en orden. conflate: latest-wins por packet ID para el camino de estado.
+    # shed: con la cola llena se desalojan primero los tipos de menor valor.
+    dispatch_queue: asyncio.Queue[tuple[int, bytes]] = make_dispatch_queue(queue_policy, queue_maxsize, stats)
 
     stop_evt = asyncio.Event()
 
@@ -94,15 +146,12 @@ async def run_app(args: Any) -> int:
         out_dir=record_dir,
         enabled=record_enabled,
         max_queue=queue_maxsize,
+        fsync_s=record_fsync_s,
+        fmt=record_format,
+        codec=record_codec,
         stats=stats,
     )
 
-    # Reporter de stats (firma REAL)
-    reporter_task: Optional[asyncio.Task] = None
-    if stats_interval > 0:
-        reporter = StatsReporter(stats=stats, state_mgr=state_mgr, interval_s=stats_interval, queue=dispatch_queue)
-        reporter_task = asyncio.create_task(reporter.run(stop_evt), name="stats_reporter")
-
     # Snapshot de estado (opcional)
     snapshot_task: Optional[asyncio.Task] = None
     if state_interval > 0:
@@ -116,49 +165,67 @@ async def run_app(args: Any) -> int:
         snapshot_task = asyncio.create_task(_snap_loop(), name="state_snapshot")
 
     # Engine (usar create(), NO constructor directo)
+    engine: Optional[EngineerEngine] = None
     engine_task: Optional[asyncio.Task] = None
     if not no_engine:
         try:
-            path = rules_path or default_rules_path()
-            rules = load_rules(path)
-            if comm_throttle > 0 and hasattr(rules, "override"):
-                rules = rules.override(throttle_s=comm_throttle)
-
-            engine = EngineerEngine.create(rules.as_rule_config(), LoggerComms())
+            engine = EngineerEngine.create(
+                _load_rule_config(rules_path, comm_throttle),
+                LoggerComms(),
+                latency=stats.lat_engine,
+                alert_latency=stats.lat_alert,
+            )
 
             async def _engine_loop() -> None:
-                loop = asyncio.get_running_loop()
                 while not stop_evt.is_set():
-                    engine.tick(loop.time(), state_mgr.state, float(state_mgr.latest_session_time or 0.0))
+                    engine.tick(state_mgr.state, float(state_mgr.state.latest_session_time or 0.0))
                     await asyncio.sleep(engine_dt)
 
             engine_task = asyncio.create_task(_engine_loop(), name="engine")
         except Exception:
             log.exception("Engine init failed (continuing without engine)")
 
+    # Reporter de stats (firma REAL)
+    reporter_task: Optional[asyncio.Task] = None
+    if stats_interval > 0:
+        reporter = StatsReporter(
+            stats=stats, state_mgr=state_mgr, interval_s=stats_interval, queue=dispatch_queue, engine=engine
+        )
+        reporter_task = asyncio.create_task(reporter.run(stop_evt), name="stats_reporter")
+
     # Tasks
     dispatcher_task = asyncio.create_task(dispatcher.run(dispatch_queue), name="dispatcher")
     recorder_task = asyncio.create_task(recorder.run(stop_evt), name="recorder")
 
-    async def _fanout() -> None:
-        # raw -> dispatch (+record) y actualiza replay_sent cuando aplica
-        in_replay = bool(replay_path)
-        while not stop_evt.is_set():
-            data = await raw_queue.get()
-            if in_replay:
-                stats.replay_sent += 1
-            if record_enabled:
-                await recorder.enqueue(data)
-            await dispatch_queue.put(data)
-
-    fanout_task = asyncio.create_task(_fanout(), name="fanout")
+    # Fan-out directo (fuente -> dispatcher + recorder), sin cola intermedia.
+    # El allow-list filtra sólo el camino del dispatcher; con --record se graba todo.
+    packet_filter = PacketIdFilter.parse(packet_allow, dropped=stats.drop_filter)
+    if packet_filter is not None:
+        log.info("Packet allow-list: %s", sorted(packet_filter.allow))
+    fanout = PacketFanout(dispatch_queue, recorder=recorder, packet_filter=packet_filter)
 
     # Source
     if replay_path:
-        src = PacketReplayer(path=replay_path, speed=replay_speed, no_sleep=replay_no_sleep)
-        src_task = asyncio.create_task(src.run(raw_queue), name="replay")
+        src = PacketReplayer(
+            path=replay_path,
+            speed=replay_speed,
+            no_sleep=replay_no_sleep,
+            stats=stats,
+            start=replay_start,
+            end=replay_end,
+        )
+        src_task = asyncio.create_task(src.run(sink=fanout), name="replay")
     else:
-        src = UdpListener(host=host, port=port, out_queue=raw_queue, drop_when_full=True, stats=stats)
+        src = UdpListener(
+            host=host,
+            port=port,
+            out_queue=None,
+            sink=fanout,
+            stats=stats,
+            mode=udp_mode,
+            batch_max=udp_batch_max,
+            rcvbuf=udp_rcvbuf,
+        )
         src_task = asyncio.create_task(src.run(), name="udp")
 
     try:
@@ -166,7 +233,7 @@ async def run_app(args: Any) -> int:
 
         # si fue replay, drenamos para que dispatcher/recorder alcancen a procesar el final
         if replay_path:
-            while (not raw_queue.empty()) or (not dispatch_queue.empty()):
+            while not dispatch_queue.empty():
                 await asyncio.sleep(0.01)
             await asyncio.sleep(0.05)
 
@@ -187,11 +254,19 @@ async def run_app(args: Any) -> int:
             pass
 
         await asyncio.gather(
-            fanout_task,
             dispatcher_task,
             recorder_task,
             *(t for t in (reporter_task, snapshot_task, engine_task) if t is not None),
             return_exceptions=True,
         )
 
+        lat = stats.latency_summary()
+        log.info(
+            "Latency ms p50/p95/p99/max: %s",
+            " ".join(
+                f"{k}={v['p50_ms']:.2f}/{v['p95_ms']:.2f}/{v['p99_ms']:.2f}/{v['max_ms']:.2f}(n={int(v['n'])})"
+                for k, v in lat.items()
+            ),
+        )
+
     return 0
\ No newline at end of file
@@ -5,6 +5,26 @@ import asyncio
 import inspect
 
 from ingenierof125.app import run_app
+from ingenierof125.ingest.ingrec import CODECS, RECORD_FORMATS
+from ingenierof125.ingest.seek import SeekPoint
+from ingenierof125.state.manager import parse_body_cache_ids
+from ingenierof125.telemetry.queues import QUEUE_POLICIES
+
+
+def _seek_point(s: str) -> str:
+    try:
+        SeekPoint.parse(s)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return s
+
+
+def _body_cache_ids(s: str) -> str:
+    try:
+        parse_body_cache_ids(s)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return s
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -14,15 +34,26 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--log-dir", type=str, default="logs")
 
     ap.add_argument("--listen", type=str, default="0.0.0.0:20777")
+    ap.add_argument("--udp-mode", dest="udp_mode", type=str, choices=("callback", "batch"), default="callback")
+    ap.add_argument("--udp-batch-max", dest="udp_batch_max", type=int, default=256)
+    ap.add_argument("--udp-rcvbuf", dest="udp_rcvbuf", type=int, default=0)
 
     ap.add_argument("--replay", type=str, default="")
     ap.add_argument("--replay-speed", type=float, default=1.0)
     ap.add_argument("--replay-no-sleep", action="store_true")
+    ap.add_argument("--replay-start", dest="replay_start", type=_seek_point, default="")
+    ap.add_argument("--replay-end", dest="replay_end", type=_seek_point, default="")
+    ap.add_argument("--replay-batch", dest="replay_batch", action="store_true")
+    ap.add_argument("--events-out", dest="events_out", type=str, default="")
 
     ap.add_argument("--queue-maxsize", dest="queue_maxsize", type=int, default=2048)
+    ap.add_argument("--queue-policy", dest="queue_policy", type=str, choices=QUEUE_POLICIES, default="fifo")
 
     ap.add_argument("--record", dest="record", action="store_true")
     ap.add_argument("--record-dir", dest="record_dir", type=str, default="recordings")
+    ap.add_argument("--record-fsync-s", dest="record_fsync_s", type=float, default=0.0)
+    ap.add_argument("--record-format", dest="record_format", type=str, choices=RECORD_FORMATS, default="v2")
+    ap.add_argument("--record-codec", dest="record_codec", type=str, choices=tuple(CODECS), default="zlib")
 
     ap.add_argument("--stats-interval", dest="stats_interval", type=float, default=0.0)
     ap.add_argument("--state-interval", dest="state_interval", type=float, default=0.0)
@@ -30,6 +61,10 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--packet-format", dest="packet_format", type=int, default=2025)
     ap.add_argument("--game-year", dest="game_year", type=int, default=25)
     ap.add_argument("--packet-version", dest="packet_version", type=int, default=1)
+    ap.add_argument("--packet-allow", dest="packet_allow", type=str, default="")
+    ap.add_argument("--body-cache-ids", dest="body_cache_ids", type=_body_cache_ids, default="1,10")
+    ap.add_argument("--lazy-state", dest="lazy_state", action="store_true")
+    ap.add_argument("--state-plugins", dest="state_plugins", type=str, default="")
     ap.add_argument("--strict-format", dest="strict_format", action="store_true")
     ap.add_argument("--strict-game-year", dest="strict_game_year", action="store_true")
 
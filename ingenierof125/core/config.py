@@ -63,20 +63,35 @@ class AppConfig:
     game_major: int = 1
     game_minor: int = 0
     packet_version: int = 1
+    packet_allow: str = ""          # allow-list de packet IDs antes de encolar ("" = todos, "state", "1,2,6")
+    body_cache_ids: str = "1,10"    # estado: reusar lo decodificado si el cuerpo no cambió ("off", "state", "1,10")
+    lazy_state: bool = False        # estado: guardar LapData/Telemetry/Status crudos y decodificar al leer
+    state_plugins: str = ""         # módulos con register(registry) para handlers extra ("pkg.mod,otro.mod")
 
     # mode
     listen: str = "0.0.0.0:20777"
+    udp_mode: str = "callback"      # callback | batch
+    udp_batch_max: int = 256
+    udp_rcvbuf: int = 0             # 0 = default del SO
     replay: str = ""
     replay_speed: float = 1.0
     replay_no_sleep: bool = False
+    replay_start: str = ""          # ventana: session time ("1234.5") o vuelta ("lap:38")
+    replay_end: str = ""
+    replay_batch: bool = False      # offline: .ingrec -> estado -> engine en un loop, sin asyncio
+    events_out: str = ""            # batch: eventos emitidos a JSONL ("" = no escribir)
 
     # queues
     queue_maxsize: int = 2048
     dispatch_maxsize: int = 2048
+    queue_policy: str = "fifo"      # fifo | conflate | shed
 
     # recording
     record: bool = False
     record_dir: str = "recordings"
+    record_fsync_s: float = 0.0     # group commit: fsync como mucho cada N s (0 = sólo al cerrar)
+    record_format: str = "v2"       # v1 (crudo) | v2 (bloques comprimidos + índice)
+    record_codec: str = "zlib"      # v2: zlib | lzma | none
 
     # observability
     stats_interval: float = 0.0
@@ -86,6 +101,7 @@ class AppConfig:
     no_engine: bool = False
     rules_path: str = "rules/v1.json"
     comm_throttle: float = 0.0
+    engine_tick_hz: float = 10.0    # en vivo: reloj de pared; en batch: session time
 
     # supervisor
     no_supervisor: bool = False
@@ -130,17 +146,32 @@ class AppConfig:
             game_major=_as_int(get(obj, "game_major", base.game_major), base.game_major),
             game_minor=_as_int(get(obj, "game_minor", base.game_minor), base.game_minor),
             packet_version=_as_int(get(obj, "packet_version", base.packet_version), base.packet_version),
+            packet_allow=_as_str(get(obj, "packet_allow", base.packet_allow), base.packet_allow),
+            body_cache_ids=_as_str(get(obj, "body_cache_ids", base.body_cache_ids), base.body_cache_ids),
+            lazy_state=_as_bool(get(obj, "lazy_state", base.lazy_state), base.lazy_state),
+            state_plugins=_as_str(get(obj, "state_plugins", base.state_plugins), base.state_plugins),
 
             listen=_as_str(get(obj, "listen", base.listen), base.listen),
+            udp_mode=_as_str(get(obj, "udp_mode", base.udp_mode), base.udp_mode),
+            udp_batch_max=_as_int(get(obj, "udp_batch_max", base.udp_batch_max), base.udp_batch_max),
+            udp_rcvbuf=_as_int(get(obj, "udp_rcvbuf", base.udp_rcvbuf), base.udp_rcvbuf),
             replay=_as_str(get(obj, "replay", base.replay), base.replay),
             replay_speed=_as_float(get(obj, "replay_speed", base.replay_speed), base.replay_speed),
             replay_no_sleep=_as_bool(get(obj, "replay_no_sleep", base.replay_no_sleep), base.replay_no_sleep),
+            replay_start=_as_str(get(obj, "replay_start", base.replay_start), base.replay_start),
+            replay_end=_as_str(get(obj, "replay_end", base.replay_end), base.replay_end),
+            replay_batch=_as_bool(get(obj, "replay_batch", base.replay_batch), base.replay_batch),
+            events_out=_as_str(get(obj, "events_out", base.events_out), base.events_out),
 
             queue_maxsize=_as_int(get(obj, "queue_maxsize", base.queue_maxsize), base.queue_maxsize),
             dispatch_maxsize=_as_int(get(obj, "dispatch_maxsize", base.dispatch_maxsize), base.dispatch_maxsize),
+            queue_policy=_as_str(get(obj, "queue_policy", base.queue_policy), base.queue_policy),
 
             record=_as_bool(get(obj, "record", base.record), base.record),
             record_dir=_as_str(get(obj, "record_dir", base.record_dir), base.record_dir),
+            record_fsync_s=_as_float(get(obj, "record_fsync_s", base.record_fsync_s), base.record_fsync_s),
+            record_format=_as_str(get(obj, "record_format", base.record_format), base.record_format),
+            record_codec=_as_str(get(obj, "record_codec", base.record_codec), base.record_codec),
 
             stats_interval=_as_float(get(obj, "stats_interval", base.stats_interval), base.stats_interval),
             state_interval=_as_float(get(obj, "state_interval", base.state_interval), base.state_interval),
@@ -148,10 +179,13 @@ class AppConfig:
             no_engine=_as_bool(get(obj, "no_engine", base.no_engine), base.no_engine),
             rules_path=_as_str(get(obj, "rules_path", base.rules_path), base.rules_path),
             comm_throttle=_as_float(get(obj, "comm_throttle", base.comm_throttle), base.comm_throttle),
+            engine_tick_hz=_as_float(get(obj, "engine_tick_hz", base.engine_tick_hz), base.engine_tick_hz),
 
             no_supervisor=_as_bool(get(obj, "no_supervisor", base.no_supervisor), base.no_supervisor),
         )
 
         if cfg.replay_speed <= 0:
             cfg.replay_speed = 1.0
+        if cfg.engine_tick_hz <= 0:
+            cfg.engine_tick_hz = 10.0
         return cfg
\ No newline at end of file
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+# Buckets log-lineales: 8 sub-buckets por potencia de 2 (error relativo <= 12.5%).
+# Valores < 16ns van exactos. 64 exponentes alcanzan para cualquier int64 de ns.
+_SUB_BITS = 3
+_SUB = 1 << _SUB_BITS
+_N_BUCKETS = 16 + 64 * _SUB
+
+
+def _bucket(v: int) -> int:
+    if v < 16:
+        return v if v > 0 else 0
+    shift = v.bit_length() - (_SUB_BITS + 1)
+    idx = shift * _SUB + (v >> shift)
+    return idx if idx < _N_BUCKETS else _N_BUCKETS - 1
+
+
+def _upper(idx: int) -> int:
+    if idx < 16:
+        return idx
+    shift = (idx - _SUB) // _SUB
+    m = idx - shift * _SUB
+    return ((m + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias en ns (tipo HdrHistogram simplificado, sin dependencias).
+    record() es O(1) y no aloca; los percentiles devuelven el borde superior del bucket.
+    """
+
+    __slots__ = ("counts", "n", "max_ns", "sum_ns")
+
+    def __init__(self) -> None:
+        self.counts = [0] * _N_BUCKETS
+        self.n = 0
+        self.max_ns = 0
+        self.sum_ns = 0
+
+    def record(self, ns: int) -> None:
+        if ns < 0:
+            ns = 0
+        self.counts[_bucket(ns)] += 1
+        self.n += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def reset(self) -> None:
+        self.counts = [0] * _N_BUCKETS
+        self.n = 0
+        self.max_ns = 0
+        self.sum_ns = 0
+
+    def percentile(self, p: float) -> int:
+        """p en [0, 100]. Devuelve ns (0 si no hay muestras)."""
+        if self.n == 0:
+            return 0
+        target = max(1, int(round(self.n * min(100.0, max(0.0, p)) / 100.0)))
+        acc = 0
+        for idx, c in enumerate(self.counts):
+            if not c:
+                continue
+            acc += c
+            if acc >= target:
+                return min(_upper(idx), self.max_ns)
+        return self.max_ns
+
+    @property
+    def mean_ns(self) -> float:
+        return self.sum_ns / self.n if self.n else 0.0
+
+    def summary(self) -> dict[str, float]:
+        """p50/p95/p99/max en milisegundos."""
+        return {
+            "n": float(self.n),
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+    def format_ms(self) -> str:
+        if self.n == 0:
+            return "-"
+        return (
+            f"{self.percentile(50) / 1e6:.2f}/{self.percentile(95) / 1e6:.2f}/"
+            f"{self.percentile(99) / 1e6:.2f}/{self.max_ns / 1e6:.2f}"
+        )
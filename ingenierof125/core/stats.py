@@ -4,10 +4,14 @@ import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from ingenierof125.core.latency import LatencyHistogram
 from ingenierof125.state.manager import StateManager
 
+if TYPE_CHECKING:
+    from ingenierof125.engine.engine import EngineerEngine
+
 log = logging.getLogger("ingenierof125.stats")
 
 
@@ -17,17 +21,36 @@ class RuntimeStats:
 
     udp_rx: int = 0
     udp_dropq: int = 0
+    udp_dropk: int = 0      # drops del kernel (buffer del socket lleno), aparte de udp_dropq
+    udp_batches: int = 0    # lotes entregados por el lector batch
 
     replay_sent: int = 0
     dispatched_in: int = 0
+    disp_batches: int = 0   # lotes drenados por el dispatcher
+    conflated: int = 0      # payloads reemplazados por uno más nuevo del mismo ID (queue_policy=conflate)
+
+    # load shedding por clase de packet ID (queue_policy=shed): desalojados + rechazados
+    shed_low: int = 0
+    shed_mid: int = 0
+    shed_high: int = 0
 
     drop_bad_hdr: int = 0
     drop_fmt: int = 0
     drop_year: int = 0
     drop_ver: int = 0
+    drop_filter: list[int] = field(default_factory=lambda: [0] * 256)  # por packet_id (allow-list)
 
     rec_written: int = 0
     rec_drop: int = 0
+    rec_bytes: int = 0
+    rec_flush: LatencyHistogram = field(default_factory=LatencyHistogram)  # write+flush por lote (hilo escritor)
+
+    # latencias desde la recepción (rx_ns): cola -> dispatcher, estado aplicado,
+    # tick del engine con dato nuevo, alerta emitida
+    lat_queue: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lat_state: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lat_engine: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lat_alert: LatencyHistogram = field(default_factory=LatencyHistogram)
 
     ids: list[int] = field(default_factory=list)
     dec_err: int = 0
@@ -37,6 +60,14 @@ class RuntimeStats:
     def uptime_s(self) -> float:
         return time.time() - self.started_ts
 
+    def latency_summary(self) -> dict[str, dict[str, float]]:
+        return {
+            "queue": self.lat_queue.summary(),
+            "state": self.lat_state.summary(),
+            "engine": self.lat_engine.summary(),
+            "alert": self.lat_alert.summary(),
+        }
+
     # -----------------------
     # Compat aliases (viejo -> nuevo)
     # -----------------------
@@ -105,9 +136,11 @@ class StatsReporter:
         state_mgr: StateManager,
         interval_s: float = 1.0,
         queue: Optional[asyncio.Queue[bytes]] = None,
+        engine: Optional[EngineerEngine] = None,
     ) -> None:
         self.stats = stats
         self.state_mgr = state_mgr
+        self.engine = engine  # sólo para el ahorro por tick del modo lazy
         self.interval_s = max(0.1, float(interval_s))
         self.queue = queue
         self._stop = asyncio.Event()
@@ -130,12 +163,22 @@ class StatsReporter:
         ids = self.stats.ids
         ids_txt = ids[-8:] if ids else []
 
+        filt = {pid: n for pid, n in enumerate(self.stats.drop_filter) if n}
+
         # state (sin duplicar stale/t)
         try:
             state_line = self.state_mgr.format_brief() if hasattr(self.state_mgr, "format_brief") else self.state_mgr.format_one_line()
             st = self.state_mgr.stale_flags()
             stale_line = f"stale(session={st.session} lap={st.lap} status={st.status} telem={st.telemetry} dmg={st.damage})"
             t_line = f"t={self.state_mgr.state.latest_session_time:.3f} player={self.state_mgr.state.player_index} decErr={self.state_mgr.state.decode_errors}"
+            if self.state_mgr.body_cache:
+                t_line += f" body_cache={self.state_mgr.format_body_cache()}"
+            handlers = self.state_mgr.format_handlers()
+            if handlers:
+                t_line += f" handlers({handlers})"
+            if self.state_mgr.lazy is not None:
+                ticks = self.engine.ticks if self.engine is not None else 0
+                t_line += f" lazy({self.state_mgr.format_lazy(ticks)})"
         except Exception:
             state_line = "state=?"
             stale_line = "stale(?)"
@@ -143,10 +186,15 @@ class StatsReporter:
 
         return (
             f"up={self.stats.uptime_s:.1f}s "
-            f"udp_rx={self.stats.udp_rx} udp_dropQ={self.stats.udp_dropq} "
-            f"replay_sent={self.stats.replay_sent} dispatched_in={self.stats.dispatched_in} "
+            f"udp_rx={self.stats.udp_rx} udp_dropQ={self.stats.udp_dropq} udp_dropK={self.stats.udp_dropk} "
+            f"replay_sent={self.stats.replay_sent} dispatched_in={self.stats.dispatched_in} disp_batches={self.stats.disp_batches} "
             f"drop_bad_hdr={self.stats.drop_bad_hdr} drop_fmt={self.stats.drop_fmt} drop_year={self.stats.drop_year} drop_ver={self.stats.drop_ver} "
-            f"rec_ok={self.stats.rec_written} rec_drop={self.stats.rec_drop} "
-            f"q={qsize}/{qmax} ids={ids_txt} "
+            f"drop_filt={filt} "
+            f"rec_ok={self.stats.rec_written} rec_drop={self.stats.rec_drop} rec_bytes={self.stats.rec_bytes} "
+            f"rec_flush_ms={self.stats.rec_flush.format_ms()} "
+            f"q={qsize}/{qmax} conflated={self.stats.conflated} "
+            f"shed(lo/mid/hi)={self.stats.shed_low}/{self.stats.shed_mid}/{self.stats.shed_high} ids={ids_txt} "
+            f"lat_ms(p50/p95/p99/max) queue={self.stats.lat_queue.format_ms()} state={self.stats.lat_state.format_ms()} "
+            f"engine={self.stats.lat_engine.format_ms()} alert={self.stats.lat_alert.format_ms()} "
             f"state={state_line} | {stale_line} | {t_line}"
         )
\ No newline at end of file
@@ -33,6 +33,7 @@ class EventDetector:
                         Event(
                             key="fuel_low",
                             priority=Priority.IMMEDIATE_RISK,
+                            score=2.0,
                             urgency=1,
                             cooldown_s=self.cfg.cooldown("fuel_low", 25.0),
                             text=f"Combustible crítico: {fuel_rem:.2f} vueltas restantes.",
@@ -43,6 +44,7 @@ class EventDetector:
                         Event(
                             key="fuel_low",
                             priority=Priority.MANAGEMENT,
+                            score=1.0,
                             urgency=0,
                             cooldown_s=self.cfg.cooldown("fuel_low", 25.0),
                             text=f"Combustible bajo: {fuel_rem:.2f} vueltas restantes.",
@@ -63,6 +65,7 @@ class EventDetector:
                     Event(
                         key="wing_damage",
                         priority=Priority.IMMEDIATE_RISK,
+                        score=wing_max,
                         urgency=1,
                         cooldown_s=self.cfg.cooldown("wing_damage", 30.0),
                         text=f"Alerón delantero muy dañado: {wing_max:.0f}%",
@@ -73,6 +76,7 @@ class EventDetector:
                     Event(
                         key="wing_damage",
                         priority=Priority.MANAGEMENT,
+                        score=wing_max,
                         urgency=0,
                         cooldown_s=self.cfg.cooldown("wing_damage", 30.0),
                         text=f"Alerón delantero dañado: {wing_max:.0f}%",
@@ -156,6 +160,7 @@ class EventDetector:
                 Event(
                     key=f"{kind.lower()}_deployed",
                     priority=Priority.STRATEGY_OPPORTUNITY,
+                    score=1.0,
                     urgency=1,
                     cooldown_s=self.cfg.cooldown("sc_vsc_deployed", 6.0),
                     text=txt,
@@ -169,6 +174,7 @@ class EventDetector:
                 Event(
                     key=f"{kind.lower()}_ending",
                     priority=Priority.STRATEGY_OPPORTUNITY,
+                    score=1.0,
                     urgency=1,
                     cooldown_s=self.cfg.cooldown("sc_vsc_ending", 4.0),
                     text=txt,
@@ -181,6 +187,7 @@ class EventDetector:
                 Event(
                     key="formation_lap",
                     priority=Priority.INFO,
+                    score=0.0,
                     urgency=0,
                     cooldown_s=self.cfg.cooldown("formation_lap", 30.0),
                     text="Vuelta de formación.",
@@ -194,6 +201,7 @@ class EventDetector:
                 Event(
                     key=f"{kind.lower().replace('/', '_')}_cleared",
                     priority=Priority.INFO,
+                    score=0.0,
                     urgency=0,
                     cooldown_s=self.cfg.cooldown("sc_vsc_cleared", 6.0),
                     text=txt,
@@ -1,9 +1,13 @@
 ﻿from __future__ import annotations
 
+import time
 from dataclasses import dataclass
+from typing import Optional
 
 from ingenierof125.comms.logger_sink import LoggerComms
+from ingenierof125.core.latency import LatencyHistogram
 from ingenierof125.engine.detector import EventDetector
+from ingenierof125.engine.events import Event
 from ingenierof125.engine.priority import PriorityManager
 from ingenierof125.rules.model import RuleConfig
 
@@ -16,25 +20,61 @@ class EngineerEngine:
     pm: PriorityManager
     last_t: float = -1e9
 
+    # latencias rx -> tick (dato nuevo evaluado) y rx -> emit (alerta), opcionales
+    latency: Optional[LatencyHistogram] = None
+    alert_latency: Optional[LatencyHistogram] = None
+    last_rx_ns: int = 0
+    ticks: int = 0  # evaluaciones hechas (para stats por tick)
+
     @classmethod
-    def create(cls, cfg: RuleConfig, comms: LoggerComms) -> "EngineerEngine":
+    def create(
+        cls,
+        cfg: RuleConfig,
+        comms: LoggerComms,
+        *,
+        latency: Optional[LatencyHistogram] = None,
+        alert_latency: Optional[LatencyHistogram] = None,
+    ) -> "EngineerEngine":
         return cls(
             cfg=cfg,
             comms=comms,
             detector=EventDetector(cfg),
             pm=PriorityManager(throttle_s=cfg.comms_throttle_s),
+            latency=latency,
+            alert_latency=alert_latency,
         )
 
-    def tick(self, state, t: float) -> None:
+    @staticmethod
+    def _freshest_rx(state) -> int:
+        # el paquete más nuevo que alimenta esta evaluación (0 si el estado no trae rx_ns)
+        rx = 0
+        for slot in (state.session, state.lap, state.status, state.telemetry, state.damage):
+            v = getattr(slot, "rx_ns", 0)
+            if v > rx:
+                rx = v
+        return rx
+
+    def tick(self, state, t: float) -> Optional[Event]:
+        """Evalúa el estado en el instante t; devuelve el evento emitido (o None)."""
         # evita spam si el clock no avanza
         if t <= self.last_t:
-            return
+            return None
         self.last_t = t
+        self.ticks += 1
+
+        rx = self._freshest_rx(state) if (self.latency is not None or self.alert_latency is not None) else 0
+        if rx and rx != self.last_rx_ns:
+            self.last_rx_ns = rx
+            if self.latency is not None:
+                self.latency.record(time.perf_counter_ns() - rx)
 
         events = self.detector.detect(state)
         ev = self.pm.select(events, t)
         if ev is None:
-            return
+            return None
 
         self.comms.emit(ev)
         self.pm.mark_emitted(ev, t)
+        if rx and self.alert_latency is not None:
+            self.alert_latency.record(time.perf_counter_ns() - rx)
+        return ev
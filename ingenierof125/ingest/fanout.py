@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Iterable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ingenierof125.ingest.recorder import PacketRecorder
+    from ingenierof125.telemetry.packet_filter import PacketIdFilter
+
+
+class PacketFanout:
+    """
+    Fan-out directo: la fuente (UdpListener / PacketReplayer) entrega cada payload
+    al dispatcher y al recorder en un solo paso, sin cola intermedia ni task extra.
+
+    Backpressure independiente por consumidor:
+      - dispatcher: publish() no bloquea y descarta si la cola está llena (UDP);
+        publish_wait() espera lugar (replay, sin pérdidas).
+      - recorder: siempre try_enqueue() sobre su propia cola (descarta y cuenta rec_drop).
+
+    packet_filter (opcional) aplica sólo al camino del dispatcher: el recorder
+    sigue grabando todos los packet IDs.
+
+    A la cola del dispatcher va la tupla (rx_ns, payload): rx_ns es el instante de
+    recepción (time.perf_counter_ns, monotónico) y viaja hasta el estado y el engine
+    para medir latencias. Si la fuente no lo trae, se estampa acá.
+    """
+
+    def __init__(
+        self,
+        dispatch_queue: "asyncio.Queue[bytes]",
+        recorder: "Optional[PacketRecorder]" = None,
+        packet_filter: "Optional[PacketIdFilter]" = None,
+    ) -> None:
+        self._dispatch = dispatch_queue
+        self._recorder = recorder if (recorder is not None and recorder.enabled) else None
+        self._filter = packet_filter
+
+    @property
+    def dispatch_queue(self) -> "asyncio.Queue[bytes]":
+        return self._dispatch
+
+    def publish(self, data: bytes, rx_ns: int = 0) -> bool:
+        """Entrega no bloqueante. False si el dispatcher no tenía lugar (el recorder igual lo recibe)."""
+        if not rx_ns:
+            rx_ns = time.perf_counter_ns()
+        if self._recorder is not None:
+            self._recorder.try_enqueue(data, rx_ns)
+        if self._filter is not None and not self._filter.allows(data):
+            return True  # filtrado a propósito: no es un drop de cola
+        try:
+            self._dispatch.put_nowait((rx_ns, data))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def publish_batch(self, batch: Iterable[tuple[int, bytes]]) -> int:
+        """
+        Entrega un lote de items ya estampados (rx_ns, payload); devuelve cuántos no
+        entraron en la cola del dispatcher. La tupla se encola tal cual (sin realocar).
+        """
+        rec = self._recorder
+        flt = self._filter
+        put = self._dispatch.put_nowait
+        dropped = 0
+        for item in batch:
+            if rec is not None:
+                rec.try_enqueue(item[1], item[0])
+            if flt is not None and not flt.allows(item[1]):
+                continue
+            try:
+                put(item)
+            except asyncio.QueueFull:
+                dropped += 1
+        return dropped
+
+    async def publish_wait(self, data: bytes, rx_ns: int = 0) -> None:
+        """Entrega con backpressure en el dispatcher (replay: no se pierde nada)."""
+        if not rx_ns:
+            rx_ns = time.perf_counter_ns()
+        if self._recorder is not None:
+            self._recorder.try_enqueue(data, rx_ns)
+        if self._filter is not None and not self._filter.allows(data):
+            return
+        q = self._dispatch
+        if q.full():
+            # espera lugar (sin pasar por el shedding/descartes de put_nowait)
+            await q.put((rx_ns, data))
+        else:
+            q.put_nowait((rx_ns, data))
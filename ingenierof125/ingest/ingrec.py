@@ -0,0 +1,502 @@
+"""
+Formato .ingrec (grabaciones de paquetes UDP crudos).
+
+v1 (INGREC1):
+  header  <8sH>  magic + u16 version
+  records <QI>   u64 ts_ns (hora de pared de la recepción) + u32 length, y el payload
+
+v2 (INGREC2): mismos records, agrupados en bloques comprimidos independientes
+  header  <8sHB5x>                 magic + u16 version + u8 codec (default del archivo)
+  bloque  <4sBIIIIQQff> + datos    b"BLK2", codec, n, raw_len, comp_len, crc32(datos),
+                                   ts_first, ts_last, session_time min/max
+  índice  n × <QIQQff>             offset del bloque, n, ts_first, ts_last, st_min, st_max
+  trailer <4sIQ>                   b"IDX2", n_bloques, offset del índice (últimos 16 bytes)
+
+Si el archivo quedó cortado (sin índice), el lector recorre los bloques desde el
+header y se queda con los que pasan el crc.
+"""
+from __future__ import annotations
+
+import lzma
+import math
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+MAGIC_V1 = b"INGREC1\0"
+MAGIC_V2 = b"INGREC2\0"
+
+FILE_HEADER = struct.Struct("<8sH")       # común a v1/v2: magic + u16 version
+V2_HEADER = struct.Struct("<8sHB5x")      # v2: + codec por defecto (16 bytes)
+RECORD = struct.Struct("<QI")             # u64 ts_ns + u32 length
+
+BLOCK_MAGIC = b"BLK2"
+BLOCK_HEADER = struct.Struct("<4sBIIIIQQff")
+INDEX_ENTRY = struct.Struct("<QIQQff")
+INDEX_MAGIC = b"IDX2"
+TRAILER = struct.Struct("<4sIQ")
+
+# session_time del header F1 (float32 en el offset 15)
+_SESSION_TIME = struct.Struct("<f")
+_SESSION_TIME_OFFSET = 15
+_PKT_HDR_SIZE = 29
+
+# posición de un record: (bloque << 40) | offset. v1: offset absoluto en el archivo
+# (bloque 0); v2: offset dentro del bloque descomprimido. Crece con el orden de records.
+POS_BLOCK_SHIFT = 40
+_POS_OFF_MASK = (1 << POS_BLOCK_SHIFT) - 1
+
+CODEC_NONE, CODEC_ZLIB, CODEC_LZMA = 0, 1, 2
+CODECS = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "lzma": CODEC_LZMA}
+RECORD_FORMATS = ("v1", "v2")
+
+# niveles por defecto: zlib 1 / lzma 0 (rápidos; ver bench/bench_ingrec.py)
+_DEFAULT_LEVEL = {CODEC_NONE: 0, CODEC_ZLIB: 1, CODEC_LZMA: 0}
+
+
+def _compress(codec: int, level: int, raw: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(raw, level)
+    if codec == CODEC_LZMA:
+        return lzma.compress(raw, preset=level)
+    return raw
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_LZMA:
+        return lzma.decompress(data)
+    if codec == CODEC_NONE:
+        return data
+    raise ValueError(f"codec desconocido: {codec}")
+
+
+def session_time_of(payload: bytes) -> float:
+    """session_time del header F1 (nan si el payload no trae header)."""
+    if len(payload) < _PKT_HDR_SIZE:
+        return math.nan
+    return _SESSION_TIME.unpack_from(payload, _SESSION_TIME_OFFSET)[0]
+
+
+@dataclass(frozen=True, slots=True)
+class BlockInfo:
+    offset: int
+    n: int
+    ts_first: int
+    ts_last: int
+    st_min: float
+    st_max: float
+
+
+# ---------------------------------------------------------------------------
+# escritura
+# ---------------------------------------------------------------------------
+
+
+def _write_all(f: BinaryIO, data: bytes) -> None:
+    # un archivo sin buffer (FileIO) puede escribir de menos con el disco lleno
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+class IngrecV1Writer:
+    """Records <QI> sin compresión; un write por lote."""
+
+    version = 1
+    pending = 0
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+        _write_all(f, FILE_HEADER.pack(MAGIC_V1, 1))
+        self.offset = FILE_HEADER.size  # fin del último lote escrito entero
+        self.records = 0
+
+    def write_batch(self, records: Iterable[tuple[int, bytes]]) -> int:
+        pack = RECORD.pack
+        parts: list[bytes] = []
+        for ts_ns, payload in records:
+            parts.append(pack(ts_ns, len(payload)))
+            parts.append(payload)
+        blob = b"".join(parts)
+        _write_all(self._f, blob)
+        self.offset += len(blob)
+        self.records += len(parts) // 2
+        return len(blob)
+
+    def flush_block(self) -> int:
+        return 0
+
+    def abort(self) -> int:
+        """Tras un write fallido: corta el archivo al final del último lote entero."""
+        self._f.seek(self.offset)
+        self._f.truncate()
+        return 0
+
+    def close(self) -> int:
+        return 0
+
+
+class IngrecV2Writer:
+    """
+    Acumula records en un bloque y lo comprime al pasar block_bytes (crudos) o
+    cuando se pide flush_block(). close() baja el último bloque + índice + trailer.
+    """
+
+    version = 2
+
+    def __init__(
+        self,
+        f: BinaryIO,
+        *,
+        codec: str = "zlib",
+        level: Optional[int] = None,
+        block_bytes: int = 1 << 20,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"codec inválido: {codec!r} (opciones: {', '.join(CODECS)})")
+        self._f = f
+        self._codec = CODECS[codec]
+        self._level = _DEFAULT_LEVEL[self._codec] if level is None else int(level)
+        self._block_bytes = max(4096, int(block_bytes))
+        self.offset = V2_HEADER.size  # fin del último bloque escrito entero
+        self.records = 0
+        self._index: list[BlockInfo] = []
+
+        self._parts: list[bytes] = []
+        self._raw_len = 0
+        self._n = 0
+        self._ts_first = 0
+        self._ts_last = 0
+        self._st_min = math.inf
+        self._st_max = -math.inf
+
+        _write_all(f, V2_HEADER.pack(MAGIC_V2, 2, self._codec))
+
+    @property
+    def blocks(self) -> list[BlockInfo]:
+        return list(self._index)
+
+    @property
+    def pending(self) -> int:
+        return self._n
+
+    def write_batch(self, records: Iterable[tuple[int, bytes]]) -> int:
+        pack = RECORD.pack
+        unpack_st = _SESSION_TIME.unpack_from
+        written = 0
+        for ts_ns, payload in records:
+            if self._n == 0:
+                self._ts_first = ts_ns
+            self._ts_last = ts_ns
+            self._n += 1
+            if len(payload) >= _PKT_HDR_SIZE:
+                st = unpack_st(payload, _SESSION_TIME_OFFSET)[0]
+                if st < self._st_min:
+                    self._st_min = st
+                if st > self._st_max:
+                    self._st_max = st
+            self._parts.append(pack(ts_ns, len(payload)))
+            self._parts.append(payload)
+            self._raw_len += RECORD.size + len(payload)
+            if self._raw_len >= self._block_bytes:
+                written += self.flush_block()
+        return written
+
+    def flush_block(self) -> int:
+        if self._n == 0:
+            return 0
+        raw = b"".join(self._parts)
+        data = _compress(self._codec, self._level, raw)
+        st_min = self._st_min if self._st_min != math.inf else math.nan
+        st_max = self._st_max if self._st_max != -math.inf else math.nan
+        hdr = BLOCK_HEADER.pack(
+            BLOCK_MAGIC,
+            self._codec,
+            self._n,
+            len(raw),
+            len(data),
+            zlib.crc32(data),
+            self._ts_first,
+            self._ts_last,
+            st_min,
+            st_max,
+        )
+        _write_all(self._f, hdr + data)
+        self._index.append(BlockInfo(self.offset, self._n, self._ts_first, self._ts_last, st_min, st_max))
+        n_bytes = len(hdr) + len(data)
+        self.offset += n_bytes
+        self.records += self._n
+        self._reset_block()
+        return n_bytes
+
+    def _reset_block(self) -> None:
+        self._parts = []
+        self._raw_len = 0
+        self._n = 0
+        self._st_min = math.inf
+        self._st_max = -math.inf
+
+    def abort(self) -> int:
+        """
+        Tras un write fallido: descarta el bloque pendiente y corta el archivo al final
+        del último bloque entero, así offset e índice siguen coincidiendo con el disco.
+        Devuelve cuántos records se descartaron.
+        """
+        n = self._n
+        self._reset_block()
+        self._f.seek(self.offset)
+        self._f.truncate()
+        return n
+
+    def close(self) -> int:
+        written = self.flush_block()
+        idx = b"".join(
+            INDEX_ENTRY.pack(b.offset, b.n, b.ts_first, b.ts_last, b.st_min, b.st_max) for b in self._index
+        )
+        tail = idx + TRAILER.pack(INDEX_MAGIC, len(self._index), self.offset)
+        _write_all(self._f, tail)
+        return written + len(tail)
+
+
+def make_writer(
+    f: BinaryIO,
+    fmt: str = "v1",
+    *,
+    codec: str = "zlib",
+    level: Optional[int] = None,
+    block_bytes: int = 1 << 20,
+) -> "IngrecV1Writer | IngrecV2Writer":
+    fmt = (fmt or "v1").strip().lower()
+    if fmt == "v1":
+        return IngrecV1Writer(f)
+    if fmt == "v2":
+        return IngrecV2Writer(f, codec=codec, level=level, block_bytes=block_bytes)
+    raise ValueError(f"record_format inválido: {fmt!r} (opciones: {', '.join(RECORD_FORMATS)})")
+
+
+# ---------------------------------------------------------------------------
+# lectura
+# ---------------------------------------------------------------------------
+
+
+class IngrecReader:
+    """
+    Lector común v1/v2 (recorder, replayer, tools), sobre mmap.
+
+      with IngrecReader(path) as r:
+          for ts_ns, payload in r: ...
+
+    El archivo se mapea entero y se recorre con Struct.unpack_from sobre un
+    memoryview: los payloads son slices (memoryview) sin copia. Sirven tal cual
+    para unpack_from/indexado/len; quien necesite quedarse con el dato pide
+    records(copy=True) o hace bytes(payload).
+
+    v2: blocks tiene el índice (del footer, o reconstruido recorriendo el archivo
+    si faltaba; index_from_footer lo indica). records(start_block) arranca en un
+    bloque dado sin leer los anteriores.
+
+    positioned()/record_at() trabajan con posiciones (ver POS_BLOCK_SHIFT) para
+    índices externos y seek (ingest/seek.py).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self._f = open(self.path, "rb")
+        self._mm: Optional[mmap.mmap] = None
+        self._blk: tuple[int, "bytes | memoryview"] = (-1, b"")  # último bloque v2 descomprimido
+        try:
+            self._size = os.fstat(self._f.fileno()).st_size
+            if self._size < FILE_HEADER.size:
+                raise ValueError("ingrec header too short")
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buf = memoryview(self._mm)
+
+            magic, ver = FILE_HEADER.unpack_from(self._buf, 0)
+            if magic == MAGIC_V1 and ver == 1:
+                self.version = 1
+                self.codec = CODEC_NONE
+                self.blocks: list[BlockInfo] = []
+                self.index_from_footer = False
+                self._data_start = FILE_HEADER.size
+            elif magic == MAGIC_V2 and ver == 2:
+                if self._size < V2_HEADER.size:
+                    raise ValueError("ingrec v2 header too short")
+                self.codec = V2_HEADER.unpack_from(self._buf, 0)[2]
+                self.version = 2
+                self._data_start = V2_HEADER.size
+                blocks = self._read_footer()
+                self.index_from_footer = blocks is not None
+                self.blocks = blocks if blocks is not None else self._scan_blocks()
+            else:
+                raise ValueError(f"not an ingrec file (magic={bytes(magic)!r} ver={ver})")
+        except Exception:
+            self.close()
+            raise
+
+    # --- context manager ---
+
+    def __enter__(self) -> "IngrecReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Si todavía hay payloads (slices) vivos el mmap no se puede cerrar acá:
+        # queda para el GC cuando el último consumidor los suelte.
+        self._blk = (-1, b"")
+        buf = getattr(self, "_buf", None)
+        if buf is not None:
+            try:
+                buf.release()
+            except BufferError:
+                pass
+            self._buf = None  # type: ignore[assignment]
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+            self._mm = None
+        self._f.close()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def codec_name(self) -> str:
+        return next((k for k, v in CODECS.items() if v == self.codec), str(self.codec))
+
+    @property
+    def n_records(self) -> Optional[int]:
+        """Total de records (v2, por índice). v1 no lo sabe sin recorrer: None."""
+        if self.version == 2:
+            return sum(b.n for b in self.blocks)
+        return None
+
+    # --- índice v2 ---
+
+    def _read_footer(self) -> Optional[list[BlockInfo]]:
+        if self._size < self._data_start + TRAILER.size:
+            return None
+        magic, n, idx_off = TRAILER.unpack_from(self._buf, self._size - TRAILER.size)
+        if magic != INDEX_MAGIC:
+            return None
+        if idx_off + n * INDEX_ENTRY.size + TRAILER.size != self._size:
+            return None
+        unpack = INDEX_ENTRY.unpack_from
+        return [BlockInfo(*unpack(self._buf, idx_off + i * INDEX_ENTRY.size)) for i in range(n)]
+
+    def _scan_blocks(self) -> list[BlockInfo]:
+        # Fallback sin footer (grabación cortada): bloques válidos desde el header
+        buf = self._buf
+        out: list[BlockInfo] = []
+        off = self._data_start
+        while off + BLOCK_HEADER.size <= self._size:
+            magic, _codec, n, _raw_len, comp_len, crc, ts0, ts1, st0, st1 = BLOCK_HEADER.unpack_from(buf, off)
+            start = off + BLOCK_HEADER.size
+            end = start + comp_len
+            if magic != BLOCK_MAGIC or end > self._size:
+                break
+            if zlib.crc32(buf[start:end]) != crc:
+                break
+            out.append(BlockInfo(off, n, ts0, ts1, st0, st1))
+            off = end
+        return out
+
+    def read_block(self, i: int) -> "bytes | memoryview":
+        """Bytes crudos (descomprimidos) del bloque i: records <QI>+payload concatenados."""
+        b = self.blocks[i]
+        buf = self._buf
+        magic, codec, _n, raw_len, comp_len, crc, *_ = BLOCK_HEADER.unpack_from(buf, b.offset)
+        if magic != BLOCK_MAGIC:
+            raise ValueError(f"bad block magic at {b.offset}")
+        start = b.offset + BLOCK_HEADER.size
+        data = buf[start:start + comp_len]
+        if zlib.crc32(data) != crc:
+            raise ValueError(f"block crc mismatch at {b.offset}")
+        raw = _decompress(codec, data)
+        if len(raw) != raw_len:
+            raise ValueError(f"block size mismatch at {b.offset}")
+        return raw
+
+    # --- records ---
+
+    def __iter__(self) -> Iterator[tuple[int, "bytes | memoryview"]]:
+        return self.records()
+
+    def records(self, start_block: int = 0, *, copy: bool = False) -> Iterator[tuple[int, "bytes | memoryview"]]:
+        if self.version == 1:
+            yield from self._walk(self._buf, self._data_start, self._size, copy)
+            return
+        for i in range(max(0, int(start_block)), len(self.blocks)):
+            raw = self.read_block(i)
+            yield from self._walk(memoryview(raw), 0, len(raw), copy)
+
+    # --- posiciones ---
+
+    def _block_data(self, i: int) -> "bytes | memoryview":
+        if self.version == 1:
+            return self._buf
+        if self._blk[0] != i:
+            self._blk = (i, memoryview(self.read_block(i)))
+        return self._blk[1]
+
+    def positioned(self, start: int = 0, *, copy: bool = False) -> Iterator[tuple[int, int, "bytes | memoryview"]]:
+        """(pos, ts_ns, payload) desde la posición start (0 = principio)."""
+        blk, off = start >> POS_BLOCK_SHIFT, start & _POS_OFF_MASK
+        if self.version == 1:
+            yield from self._walk_pos(self._buf, max(off, self._data_start), self._size, copy, 0)
+            return
+        for i in range(blk, len(self.blocks)):
+            data = self._block_data(i)
+            yield from self._walk_pos(data, off if i == blk else 0, len(data), copy, i << POS_BLOCK_SHIFT)
+
+    def record_at(self, pos: int, *, copy: bool = False) -> tuple[int, "bytes | memoryview"]:
+        data = self._block_data(pos >> POS_BLOCK_SHIFT)
+        off = pos & _POS_OFF_MASK
+        if off + RECORD.size > len(data):
+            raise ValueError(f"record position out of range: {pos:#x}")
+        ts_ns, ln = RECORD.unpack_from(data, off)
+        off += RECORD.size
+        if off + ln > len(data):
+            raise ValueError(f"record at {pos:#x} is truncated")
+        return ts_ns, (bytes(data[off:off + ln]) if copy else data[off:off + ln])
+
+    @staticmethod
+    def _walk_pos(
+        buf: "bytes | memoryview", off: int, end: int, copy: bool, base: int
+    ) -> Iterator[tuple[int, int, "bytes | memoryview"]]:
+        unpack = RECORD.unpack_from
+        rsz = RECORD.size
+        while off + rsz <= end:
+            pos = base | off
+            ts_ns, ln = unpack(buf, off)
+            off += rsz
+            if off + ln > end:
+                return
+            yield pos, ts_ns, (bytes(buf[off:off + ln]) if copy else buf[off:off + ln])
+            off += ln
+
+    @staticmethod
+    def _walk(buf: memoryview, off: int, end: int, copy: bool) -> Iterator[tuple[int, "bytes | memoryview"]]:
+        unpack = RECORD.unpack_from
+        rsz = RECORD.size
+        while off + rsz <= end:
+            ts_ns, ln = unpack(buf, off)
+            off += rsz
+            if off + ln > end:
+                return  # último record cortado
+            yield ts_ns, (bytes(buf[off:off + ln]) if copy else buf[off:off + ln])
+            off += ln
+
+
+def iter_records(path: str, *, copy: bool = False) -> Iterator[tuple[int, "bytes | memoryview"]]:
+    with IngrecReader(path) as r:
+        yield from r.records(copy=copy)
@@ -3,19 +3,22 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-import struct
+import queue
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Any
 
+from ingenierof125.core.latency import LatencyHistogram
 from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.ingest.ingrec import CODECS, MAGIC_V1 as MAGIC, RECORD_FORMATS, make_writer  # noqa: F401 (MAGIC: compat)
 
 log = logging.getLogger("ingenierof125.recorder")
 
-MAGIC = b"INGREC1\0"              # 8 bytes
-_HEADER = struct.Struct("<8sH")   # magic + u16 version
-_RECORD = struct.Struct("<QI")    # u64 ts_ns + u32 length
+# Sentinelas internas de la cola (stop / flush por tiempo), sin wait_for por paquete
+_STOP = object()
+_FLUSH = object()
 
 
 @dataclass(slots=True)
@@ -24,6 +27,180 @@ class RecorderStats:
     dropped: int = 0
     written: int = 0
     last_path: str = ""
+    bytes_written: int = 0
+    flushes: int = 0
+    fsyncs: int = 0
+    write_errors: int = 0
+
+
+class _Writer(threading.Thread):
+    """
+    Hilo escritor: recibe lotes [(rx_ns, payload), ...] del loop, arma un único
+    buffer contiguo por lote y hace un solo write + flush. fsync por group commit:
+    como mucho uno cada fsync_s (0 = sólo al cerrar).
+
+    v2: el bloque comprimido se corta por tamaño (block_bytes) o, para no perder
+    mucho si se corta la grabación, cuando tiene más de block_max_s de antigüedad.
+
+    Si un write falla (disco lleno) el archivo va sin buffer: el writer vuelve al
+    final del último lote/bloque entero y descarta lo pendiente, que cuenta como drop.
+    written cuenta sólo records que llegaron al archivo (v2: al bajar el bloque).
+
+    El loop nunca toca el disco: hasta el open/mkdir ocurren acá.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        wall_off: int,
+        fsync_s: float,
+        max_pending: int,
+        stats: RecorderStats,
+        rstats: Optional[RuntimeStats],
+        flush_lat: LatencyHistogram,
+        *,
+        fmt: str = "v1",
+        codec: str = "zlib",
+        block_bytes: int = 1 << 20,
+        block_max_s: float = 2.0,
+    ) -> None:
+        super().__init__(name="recorder-writer", daemon=True)
+        self._path = path
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(f"record_format inválido: {fmt!r} (opciones: {', '.join(RECORD_FORMATS)})")
+        if codec not in CODECS:
+            raise ValueError(f"record_codec inválido: {codec!r} (opciones: {', '.join(CODECS)})")
+        self._fmt = fmt
+        self._codec = codec
+        self._block_bytes = block_bytes
+        self._block_max_s = max(0.0, float(block_max_s))
+        self._wall_off = wall_off
+        self._fsync_s = max(0.0, float(fsync_s))
+        self._q: "queue.Queue[Optional[list[tuple[int, bytes]]]]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._stats = stats
+        self._rstats = rstats
+        self._flush_lat = flush_lat
+        self._failed = False
+
+    def submit(self, batch: list[tuple[int, bytes]]) -> bool:
+        """No bloqueante. False si el escritor va atrasado (o falló) y el lote se descarta."""
+        if self._failed:
+            return False
+        try:
+            self._q.put_nowait(batch)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self) -> None:
+        # el sentinela tiene que entrar sí o sí (el hilo drena, no tarda)
+        self._q.put(None)
+
+    def _fsync(self, f) -> None:
+        try:
+            os.fsync(f.fileno())
+            self._stats.fsyncs += 1
+        except OSError:
+            pass
+
+    def _count_written(self, n: int, n_bytes: int) -> None:
+        self._stats.written += n
+        self._stats.bytes_written += n_bytes
+        if self._rstats is not None:
+            self._rstats.rec_written += n
+            self._rstats.rec_bytes += n_bytes
+
+    def run(self) -> None:
+        try:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            f = open(self._path, "wb", buffering=0)  # sin buffer: lo escrito es lo que está en disco
+        except OSError:
+            self._failed = True
+            log.exception("Could not open recording %s", self._path)
+            while self._q.get() is not None:
+                pass
+            return
+
+        off = self._wall_off
+        st = self._stats
+        rst = self._rstats
+        last_fsync = time.monotonic()
+        block_t0 = 0.0
+        lost = 0  # registros perdidos en la racha de errores actual (disco lleno, etc.)
+        rollback = False  # un abort() que también falló: se reintenta antes del próximo write
+        w = None
+        records0 = 0
+        try:
+            w = make_writer(f, self._fmt, codec=self._codec, block_bytes=self._block_bytes)
+            while True:
+                batch = self._q.get()
+                if batch is None:
+                    break
+
+                t0 = time.perf_counter_ns()
+                pending = w.pending
+                records0, offset0 = w.records, w.offset
+                try:
+                    if rollback:
+                        w.abort()
+                        rollback = False
+                    if w.version == 2 and not w.pending:
+                        block_t0 = time.monotonic()
+                    w.write_batch([(rx_ns + off, payload) for rx_ns, payload in batch])
+                    if w.version == 2 and w.pending and time.monotonic() - block_t0 >= self._block_max_s:
+                        w.flush_block()
+                    f.flush()
+                except OSError as e:
+                    # se vuelve al último offset bueno; el lote y el bloque pendiente se pierden
+                    # (cuentan como drop). Un log por racha, no por lote.
+                    try:
+                        w.abort()
+                        rollback = False
+                    except OSError:
+                        rollback = True
+                    self._count_written(w.records - records0, w.offset - offset0)
+                    n = pending + len(batch) - (w.records - records0)
+                    st.write_errors += 1
+                    st.dropped += n
+                    if rst is not None:
+                        rst.rec_drop += n
+                    if not lost:
+                        log.error("Recorder write failed, dropping batches until writes succeed: %s", e)
+                    lost += n
+                    continue
+                self._flush_lat.record(time.perf_counter_ns() - t0)
+                if lost:
+                    log.warning("Recorder writes recovered after %d dropped records", lost)
+                    lost = 0
+
+                self._count_written(w.records - records0, w.offset - offset0)
+                st.flushes += 1
+
+                if self._fsync_s > 0 and time.monotonic() - last_fsync >= self._fsync_s:
+                    self._fsync(f)
+                    last_fsync = time.monotonic()
+
+            if rollback:
+                w.abort()
+            records0 = w.records
+            n_bytes = w.close()
+            self._count_written(w.records - records0, n_bytes)
+        except OSError:
+            st.write_errors += 1
+            if w is not None:
+                # close a medias: el último bloque pudo bajar antes que el índice; lo pendiente se pierde
+                self._count_written(w.records - records0, 0)
+                st.dropped += w.pending
+                if rst is not None:
+                    rst.rec_drop += w.pending
+            log.exception("Recorder close failed")
+        finally:
+            try:
+                f.flush()
+            except OSError:
+                pass
+            self._fsync(f)
+            f.close()
 
 
 class PacketRecorder:
@@ -43,6 +220,13 @@ class PacketRecorder:
         queue_maxsize: int = 2048,
         flush_every: int = 64,
         *,
+        flush_interval_s: float = 0.5,
+        fsync_s: float = 0.0,
+        writer_max_pending: int = 64,
+        fmt: str = "v1",
+        codec: str = "zlib",
+        block_bytes: int = 1 << 20,
+        block_max_s: float = 2.0,
         max_queue: Optional[int] = None,          # alias viejo
         stats: Optional[RuntimeStats] = None,     # opcional viejo
         **_ignored: Any,                          # traga kwargs desconocidos
@@ -55,38 +239,71 @@ class PacketRecorder:
 
         self._out_dir = out_dir
         self._enabled = bool(enabled)
-        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=int(queue_maxsize))
+        self._queue: asyncio.Queue[tuple[int, bytes]] = asyncio.Queue(maxsize=int(queue_maxsize))
         self._flush_every = max(1, int(flush_every))
+        self._flush_interval_s = max(0.01, float(flush_interval_s))
+        self._fsync_s = max(0.0, float(fsync_s))
+        self._writer_max_pending = max(1, int(writer_max_pending))
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(f"record_format inválido: {fmt!r} (opciones: {', '.join(RECORD_FORMATS)})")
+        if codec not in CODECS:
+            raise ValueError(f"record_codec inválido: {codec!r} (opciones: {', '.join(CODECS)})")
+        self._fmt = fmt
+        self._codec = codec
+        self._block_bytes = int(block_bytes)
+        self._block_max_s = float(block_max_s)
         self._stop = asyncio.Event()
 
         self.stats = RecorderStats()
         self._rstats = stats  # RuntimeStats opcional
+        # latencia write+flush por lote (en el hilo escritor)
+        self.flush_latency = stats.rec_flush if stats is not None else LatencyHistogram()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
 
     def stop(self) -> None:
         self._stop.set()
+        self._kick(_STOP)
 
-    def try_enqueue(self, payload: bytes) -> bool:
+    def _kick(self, marker: object) -> None:
+        # Despierta un get() bloqueado; si la cola está llena el loop no está esperando
+        try:
+            self._queue.put_nowait(marker)  # type: ignore[arg-type]
+        except asyncio.QueueFull:
+            pass
+
+    async def _forward_stop(self, stop_evt: asyncio.Event) -> None:
+        await stop_evt.wait()
+        self.stop()
+
+    def try_enqueue(self, payload: bytes, rx_ns: int = 0) -> bool:
+        """rx_ns: instante de recepción (perf_counter_ns). Si falta se usa el de ahora."""
         if not self._enabled:
             return False
         try:
-            self._queue.put_nowait(payload)
+            self._queue.put_nowait((rx_ns or time.perf_counter_ns(), payload))
             self.stats.enqueued += 1
             return True
         except asyncio.QueueFull:
-            self.stats.dropped += 1
-            if self._rstats is not None:
-                self._rstats.rec_drop += 1
+            self._count_dropped(1)
             return False
 
-    async def enqueue(self, payload: bytes) -> bool:
+    async def enqueue(self, payload: bytes, rx_ns: int = 0) -> bool:
         # Compat: algunos callers usan "await recorder.enqueue(...)"
-        return self.try_enqueue(payload)
+        return self.try_enqueue(payload, rx_ns)
 
     def _new_path(self) -> str:
+        # sólo arma el nombre; el mkdir lo hace el hilo escritor
         ts = time.strftime("%Y%m%d_%H%M%S")
-        Path(self._out_dir).mkdir(parents=True, exist_ok=True)
         return str(Path(self._out_dir) / f"{ts}_f1udp.ingrec")
 
+    def _count_dropped(self, n: int) -> None:
+        self.stats.dropped += n
+        if self._rstats is not None:
+            self._rstats.rec_drop += n
+
     async def run(self, stop_evt: Optional[asyncio.Event] = None) -> None:
         if not self._enabled:
             # Igual esperamos stop para no romper pipeline
@@ -97,51 +314,76 @@ class PacketRecorder:
 
         path = self._new_path()
         self.stats.last_path = path
-        log.info("Recording to %s", path)
+        log.info("Recording to %s (format=%s codec=%s fsync_s=%s)", path, self._fmt, self._codec, self._fsync_s)
 
-        f = open(path, "wb")
-        try:
-            f.write(_HEADER.pack(MAGIC, 1))
+        loop = asyncio.get_running_loop()
+        watcher = asyncio.create_task(self._forward_stop(stop_evt)) if stop_evt is not None else None
+        flush_timer: Optional[asyncio.TimerHandle] = None
 
-            buf: list[tuple[int, bytes]] = []
+        # ts del archivo = hora de pared de la recepción: rx_ns es monotónico
+        # (perf_counter_ns), se lleva a time_ns con un offset fijado al arrancar.
+        wall_off = time.time_ns() - time.perf_counter_ns()
+        writer = _Writer(
+            path,
+            wall_off,
+            self._fsync_s,
+            self._writer_max_pending,
+            self.stats,
+            self._rstats,
+            self.flush_latency,
+            fmt=self._fmt,
+            codec=self._codec,
+            block_bytes=self._block_bytes,
+            block_max_s=self._block_max_s,
+        )
+        writer.start()
 
-            def flush() -> None:
-                if not buf:
-                    return
-                for ts_ns, payload in buf:
-                    f.write(_RECORD.pack(int(ts_ns), len(payload)))
-                    f.write(payload)
+        buf: list[tuple[int, bytes]] = []
 
-                n = len(buf)
-                self.stats.written += n
-                if self._rstats is not None:
-                    self._rstats.rec_written += n
+        def flush() -> None:
+            # entrega el lote al escritor (sin copiar) y arranca uno nuevo
+            nonlocal buf
+            if not buf:
+                return
+            if not writer.submit(buf):
+                self._count_dropped(len(buf))
+            buf = []
 
-                buf.clear()
-                f.flush()
+        try:
+            get = self._queue.get
+            get_nowait = self._queue.get_nowait
 
-            while True:
-                if self._stop.is_set() or (stop_evt is not None and stop_evt.is_set()):
-                    flush()
-                    return
+            while not self._stop.is_set():
+                item = await get()
 
-                try:
-                    payload = await asyncio.wait_for(self._queue.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    flush()
-                    continue
+                # Drena todo lo disponible en un solo paso
+                while True:
+                    if item is _STOP:
+                        break
+                    if item is _FLUSH:
+                        flush_timer = None
+                        flush()
+                    else:
+                        buf.append(item)
+                        if len(buf) >= self._flush_every:
+                            flush()
+                    try:
+                        item = get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+
+                # Lo que quede pendiente se baja por tiempo: un timer por flush, no por paquete.
+                # (si el timer ya venció sin poder encolar _FLUSH por cola llena, se rearma)
+                if buf and (flush_timer is None or flush_timer.when() <= loop.time()):
+                    flush_timer = loop.call_later(self._flush_interval_s, self._kick, _FLUSH)
 
-                buf.append((time.time_ns(), payload))
-                if len(buf) >= self._flush_every:
-                    flush()
+            flush()
 
         finally:
-            try:
-                f.flush()
-            except Exception:
-                pass
-            try:
-                os.fsync(f.fileno())
-            except Exception:
-                pass
-            f.close()
\ No newline at end of file
+            if flush_timer is not None:
+                flush_timer.cancel()
+            if watcher is not None:
+                watcher.cancel()
+            # cierre (último write + fsync + close) fuera del loop
+            await asyncio.to_thread(writer.close)
+            await asyncio.to_thread(writer.join)
@@ -3,25 +3,54 @@ from __future__ import annotations
 import asyncio
 import logging
 import struct
-from dataclasses import dataclass
-from typing import BinaryIO, Optional, TYPE_CHECKING
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional, TYPE_CHECKING
+
+from ingenierof125.core.latency import LatencyHistogram
+from ingenierof125.ingest.ingrec import IngrecReader
+from ingenierof125.ingest.seek import RecordingIndex, SeekPoint, open_window
 
 if TYPE_CHECKING:
     from ingenierof125.core.stats import RuntimeStats
+    from ingenierof125.ingest.fanout import PacketFanout
 
 
 @dataclass(slots=True)
 class ReplayStats:
     sent: int = 0
+    warm: int = 0   # paquetes de warm-up antes de la ventana (--replay-start)
+
+    # scheduler: un burst por frame, error |real - deadline| por burst
+    bursts: int = 0
+    sleeps: int = 0
+    timing: LatencyHistogram = field(default_factory=LatencyHistogram)
+    drift_ns: int = 0  # error con signo del último burst (+ = tarde)
+
+
+# frameIdentifier del header F1 (u32 en el offset 19)
+_FRAME = struct.Struct("<I")
+_FRAME_OFFSET = 19
 
 
 class PacketReplayer:
     """
-    Reproduce archivos .ingrec.
+    Reproduce archivos .ingrec (v1 o v2, vía IngrecReader).
 
     Compat:
       - versiones viejas podían pasar stats=RuntimeStats
       - versiones viejas podían pasar out=<queue> en __init__
+
+    Con sink=PacketFanout entrega directo a dispatcher+recorder (con backpressure).
+
+    Timing: cada paquete tiene un deadline absoluto (primer ts + (ts - ts0) / speed)
+    y se duerme sólo al empezar un frame nuevo: los paquetes con el mismo
+    frameIdentifier salen juntos. Si el deadline está a menos de min_sleep_s no se
+    duerme (a 50x hay miles de frames por segundo); el atraso de un sleep no se
+    acumula porque el siguiente deadline no depende de cuándo despertamos.
+
+    start/end ("1234.5" = session time, "lap:38" = vuelta) reproducen sólo esa
+    ventana: seek por índice (ingest/seek.py) y warm-up con los últimos 1/2/7/10.
     """
 
     def __init__(
@@ -31,6 +60,9 @@ class PacketReplayer:
         no_sleep: bool = False,
         out: Optional["asyncio.Queue[bytes]"] = None,
         stats: "RuntimeStats | None" = None,
+        start: str = "",
+        end: str = "",
+        min_sleep_s: float = 0.001,
         **_ignored: object,
     ) -> None:
         self._path = str(path)
@@ -38,6 +70,9 @@ class PacketReplayer:
         self._no_sleep = bool(no_sleep)
         self._default_out = out
         self._runtime_stats = stats
+        self._min_sleep_ns = max(0, int(min_sleep_s * 1e9))
+        self._start = SeekPoint.parse(start)
+        self._end = SeekPoint.parse(end)
         self._log = logging.getLogger("ingenierof125.replay")
         self._stop = asyncio.Event()
         self.stats = ReplayStats()
@@ -45,43 +80,99 @@ class PacketReplayer:
     def stop(self) -> None:
         self._stop.set()
 
-    async def run(self, out_queue: Optional["asyncio.Queue[bytes]"] = None) -> None:
+    async def run(
+        self,
+        out_queue: Optional["asyncio.Queue[bytes]"] = None,
+        *,
+        sink: "PacketFanout | None" = None,
+    ) -> None:
         out = out_queue or self._default_out
-        if out is None:
-            raise ValueError("PacketReplayer.run() necesita out_queue (o pasar out= en __init__).")
+        if out is None and sink is None:
+            raise ValueError("PacketReplayer.run() necesita out_queue o sink (o pasar out= en __init__).")
 
         self._log.info("Replaying %s (speed=%.2f no_sleep=%s)", self._path, self._speed, self._no_sleep)
 
-        with open(self._path, "rb") as f:
-            await self._loop(f, out)
-
-        self._log.info("Replay finished: sent=%s", self.stats.sent)
-
-    async def _loop(self, f: BinaryIO, out_queue: "asyncio.Queue[bytes]") -> None:
-        last_ts: Optional[float] = None
-
-        while not self._stop.is_set():
-            hdr = f.read(8)
-            if not hdr:
-                return
-
-            (ts_ms,) = struct.unpack("<Q", hdr)
-            ln_bytes = f.read(4)
-            if len(ln_bytes) < 4:
-                return
-
-            (ln,) = struct.unpack("<I", ln_bytes)
-            payload = f.read(ln)
-            if len(payload) < ln:
+        emit = sink.publish_wait if sink is not None else out.put  # type: ignore[union-attr]
+        with IngrecReader(self._path) as reader:
+            if reader.version == 2:
+                self._log.info(
+                    "ingrec v2: %s blocks, %s records (index=%s)",
+                    len(reader.blocks),
+                    reader.n_records,
+                    "footer" if reader.index_from_footer else "scan",
+                )
+            if self._start is None and self._end is None:
+                await self._loop(reader, emit)
+            else:
+                await self._play_window(reader, emit)
+
+        st = self.stats
+        self._log.info("Replay finished: sent=%s", st.sent)
+        if st.bursts:
+            self._log.info(
+                "Replay timing: bursts=%d sleeps=%d err_ms p50/p95/p99/max=%s drift=%.3fms",
+                st.bursts, st.sleeps, st.timing.format_ms(), st.drift_ns / 1e6,
+            )
+
+    async def _play_window(
+        self,
+        reader: IngrecReader,
+        emit: "Callable[[bytes], Awaitable[None]]",
+    ) -> None:
+        # armar el índice es una pasada entera la primera vez: fuera del loop
+        index = await asyncio.to_thread(RecordingIndex.for_reader, reader)
+        win = open_window(reader, index, self._start, self._end)
+        self._log.info(
+            "Replay window start=%s end=%s: warm-up=%d packets, %d records walked from checkpoint",
+            self._start, self._end, len(win.warm), win.skipped,
+        )
+        for payload in win.warm:
+            await emit(payload)
+            self.stats.warm += 1
+        await self._loop(win.records, emit)
+
+    async def _loop(
+        self,
+        records: "Iterable[tuple[int, bytes]]",
+        emit: "Callable[[bytes], Awaitable[None]]",
+    ) -> None:
+        st = self.stats
+        rt = self._runtime_stats
+        clock = time.perf_counter_ns
+        speed = self._speed
+        min_sleep = self._min_sleep_ns
+        pace = not self._no_sleep
+
+        base_ts = 0
+        base_wall = 0
+        last_ts: Optional[int] = None
+        burst_frame: Optional[int] = None
+
+        for ts_ns, payload in records:
+            if self._stop.is_set():
                 return
 
-            if last_ts is not None and not self._no_sleep:
-                dt = (ts_ms - last_ts) / 1000.0
-                if dt > 0:
-                    await asyncio.sleep(dt / self._speed)
-
-            last_ts = ts_ms
-            await out_queue.put(payload)
-            self.stats.sent += 1
-            if self._runtime_stats is not None:
-                self._runtime_stats.replay_sent += 1
\ No newline at end of file
+            if pace:
+                frame = _FRAME.unpack_from(payload, _FRAME_OFFSET)[0] if len(payload) >= _FRAME_OFFSET + 4 else None
+                if last_ts is None or ts_ns < last_ts:
+                    # primer paquete, o reloj de la grabación para atrás: se re-ancla
+                    base_ts, base_wall = ts_ns, clock()
+                    burst_frame = frame
+                    st.bursts += 1
+                elif frame is None or frame != burst_frame:
+                    burst_frame = frame
+                    deadline = base_wall + int((ts_ns - base_ts) / speed)
+                    delay = deadline - clock()
+                    if delay >= min_sleep:
+                        await asyncio.sleep(delay / 1e9)
+                        st.sleeps += 1
+                    err = clock() - deadline
+                    st.bursts += 1
+                    st.timing.record(err if err >= 0 else -err)
+                    st.drift_ns = err
+                last_ts = ts_ns
+
+            await emit(payload)
+            st.sent += 1
+            if rt is not None:
+                rt.replay_sent += 1
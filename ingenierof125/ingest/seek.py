@@ -0,0 +1,310 @@
+"""
+Seek / ventana de tiempo sobre grabaciones .ingrec.
+
+Índice sidecar (<archivo>.idx), v1 y v2 por igual: checkpoints ordenados con
+  pos      posición del record (IngrecReader.positioned / record_at)
+  st       session time de ese record
+  lap      vuelta del jugador en ese punto (0 = todavía sin LapData)
+  warm[4]  posición del último Session/LapData/CarStatus/CarDamage ANTES del checkpoint
+
+Hay un checkpoint al menos cada CHECKPOINT_S de session time, en cada cambio de vuelta
+(exacto: el LapData que la cambia) y en cada cambio de session_uid. Buscar es un bisect
+sobre st o lap; de ahí se avanza record a record como mucho CHECKPOINT_S hasta el
+inicio pedido, sin decodificar nada.
+
+El warm-up antes de la ventana son sólo los últimos 1/2/7/10 (lo que el estado
+necesita); no se reproduce lo anterior.
+
+El índice se arma en la primera búsqueda (una pasada) y se guarda al lado de la
+grabación; si el archivo cambió (tamaño/mtime) se vuelve a armar.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import os
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from ingenierof125.ingest.ingrec import IngrecReader
+from ingenierof125.telemetry.decoders_lite import decode_lap_player
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET, PKT_HDR, PKT_HDR_SIZE
+
+# Session, LapData, CarStatus, CarDamage: lo que StateManager necesita para arrancar
+WARM_PACKET_IDS = (1, 2, 7, 10)
+CHECKPOINT_S = 1.0
+
+IDX_MAGIC = b"INGIDX1\0"
+IDX_HEADER = struct.Struct("<8sHQQI")   # magic, versión, tamaño y mtime_ns del .ingrec, n
+IDX_ENTRY = struct.Struct("<QfH4Q")     # pos, st, lap, warm[4]
+NO_POS = (1 << 64) - 1
+
+_WARM_SLOT = {pid: i for i, pid in enumerate(WARM_PACKET_IDS)}
+
+
+def sidecar_path(path: str) -> str:
+    return str(path) + ".idx"
+
+
+@dataclass(frozen=True, slots=True)
+class SeekPoint:
+    """Inicio/fin de ventana: session time en segundos ("t") o número de vuelta ("lap")."""
+
+    kind: str
+    value: float
+
+    def __str__(self) -> str:
+        return f"lap:{int(self.value)}" if self.kind == "lap" else f"{self.value:g}s"
+
+    @staticmethod
+    def parse(spec: str) -> Optional["SeekPoint"]:
+        """'' -> None, '1234.5' -> session time, 'lap:38' -> vuelta."""
+        s = (spec or "").strip().lower()
+        if not s:
+            return None
+        if s.startswith("lap:"):
+            try:
+                lap = int(s[4:])
+            except ValueError:
+                raise ValueError(f"bad lap in {spec!r} (expected lap:N)") from None
+            if lap < 0:
+                raise ValueError(f"bad lap in {spec!r} (expected lap:N)")
+            return SeekPoint("lap", float(lap))
+        try:
+            t = float(s)
+        except ValueError:
+            raise ValueError(f"bad seek point {spec!r} (session seconds or lap:N)") from None
+        if not math.isfinite(t):
+            raise ValueError(f"bad seek point {spec!r} (session seconds or lap:N)")
+        return SeekPoint("t", t)
+
+
+@dataclass(slots=True)
+class RecordingIndex:
+    pos: list[int] = field(default_factory=list)
+    st: list[float] = field(default_factory=list)
+    lap: list[int] = field(default_factory=list)
+    warm: list[tuple[int, int, int, int]] = field(default_factory=list)
+
+    # ordenados => bisect; con varias sesiones en el archivo st vuelve a 0 y se busca lineal
+    st_sorted: bool = True
+    lap_sorted: bool = True
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def _finish(self) -> "RecordingIndex":
+        self.st_sorted = all(a <= b for a, b in zip(self.st, self.st[1:]))
+        self.lap_sorted = all(a <= b for a, b in zip(self.lap, self.lap[1:]))
+        return self
+
+    # --- armado ---
+
+    @classmethod
+    def build(cls, reader: IngrecReader, *, checkpoint_s: float = CHECKPOINT_S) -> "RecordingIndex":
+        idx = cls()
+        unpack = PKT_HDR.unpack_from
+        hdr_size = PKT_HDR_SIZE
+        warm = [NO_POS] * len(WARM_PACKET_IDS)
+        uid: Optional[int] = None
+        lap = 0
+        next_st = -math.inf
+
+        for pos, _ts, payload in reader.positioned():
+            if len(payload) < hdr_size:
+                continue
+            h = unpack(payload, 0)
+            pid, st = h[5], h[7]
+            if not math.isfinite(st):
+                st = idx.st[-1] if idx.st else 0.0
+
+            new_lap = lap
+            if pid == 2:
+                v = decode_lap_player(payload, h[10])
+                if v is not None:
+                    new_lap = v.lap_num
+
+            if h[6] != uid or new_lap != lap or st >= next_st:
+                if h[6] != uid:
+                    uid = h[6]
+                    warm = [NO_POS] * len(WARM_PACKET_IDS)  # sesión nueva: nada que calentar
+                idx.pos.append(pos)
+                idx.st.append(st)
+                idx.lap.append(new_lap)
+                idx.warm.append(tuple(warm))  # type: ignore[arg-type]
+                next_st = st + checkpoint_s
+            lap = new_lap
+
+            slot = _WARM_SLOT.get(pid)
+            if slot is not None:
+                warm[slot] = pos
+        return idx._finish()
+
+    # --- sidecar ---
+
+    def save(self, path: str, src_size: int, src_mtime_ns: int) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(IDX_HEADER.pack(IDX_MAGIC, 1, src_size, src_mtime_ns, len(self.pos)))
+            pack = IDX_ENTRY.pack
+            f.write(b"".join(pack(p, s, min(l, 0xFFFF), *w) for p, s, l, w in zip(self.pos, self.st, self.lap, self.warm)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, src_size: int, src_mtime_ns: int) -> Optional["RecordingIndex"]:
+        """None si no existe, está roto o es de otra versión del .ingrec."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < IDX_HEADER.size:
+            return None
+        magic, ver, size, mtime, n = IDX_HEADER.unpack_from(data, 0)
+        if magic != IDX_MAGIC or ver != 1 or size != src_size or mtime != src_mtime_ns:
+            return None
+        if len(data) != IDX_HEADER.size + n * IDX_ENTRY.size:
+            return None
+        idx = cls()
+        for p, s, l, *w in IDX_ENTRY.iter_unpack(memoryview(data)[IDX_HEADER.size:]):
+            idx.pos.append(p)
+            idx.st.append(s)
+            idx.lap.append(l)
+            idx.warm.append(tuple(w))  # type: ignore[arg-type]
+        return idx._finish()
+
+    @classmethod
+    def for_reader(cls, reader: IngrecReader, *, save: bool = True) -> "RecordingIndex":
+        log = logging.getLogger("ingenierof125.seek")
+        st = os.stat(reader.path)
+        side = sidecar_path(reader.path)
+        idx = cls.load(side, st.st_size, st.st_mtime_ns)
+        if idx is not None:
+            return idx
+
+        t0 = time.perf_counter()
+        idx = cls.build(reader)
+        log.info("Built recording index: %d checkpoints in %.2fs", len(idx), time.perf_counter() - t0)
+        if save:
+            try:
+                idx.save(side, st.st_size, st.st_mtime_ns)
+            except OSError as e:
+                log.warning("Could not save index %s: %s", side, e)
+        return idx
+
+    # --- búsqueda ---
+
+    def find(self, point: SeekPoint) -> int:
+        """Checkpoint desde el que hay que avanzar hasta point (-1 = el archivo no llega)."""
+        if not self.pos:
+            return -1
+        if point.kind == "lap":
+            lap = int(point.value)
+            if self.lap_sorted:
+                i = bisect.bisect_left(self.lap, lap)
+            else:
+                i = next((k for k, v in enumerate(self.lap) if v >= lap), len(self.lap))
+            return i if i < len(self.pos) else -1
+
+        t = point.value
+        if self.st_sorted:
+            i = bisect.bisect_right(self.st, t) - 1
+        else:
+            # varias sesiones en el archivo: la primera vez que se cruza t
+            i = next((k - 1 for k, v in enumerate(self.st) if v > t), len(self.st) - 1)
+        return max(0, i)
+
+
+@dataclass(slots=True)
+class Window:
+    """Resultado de open_window: paquetes de warm-up + records de la ventana."""
+
+    warm: list["bytes | memoryview"]
+    records: Iterator[tuple[int, "bytes | memoryview"]]
+    start_pos: int = 0
+    skipped: int = 0   # records recorridos (sin decodificar) entre el checkpoint y el inicio
+
+
+def _session_time(payload) -> float:
+    if len(payload) < PKT_HDR_SIZE:
+        return math.nan
+    return PKT_HDR.unpack_from(payload, 0)[7]
+
+
+def open_window(
+    reader: IngrecReader,
+    index: RecordingIndex,
+    start: Optional[SeekPoint] = None,
+    end: Optional[SeekPoint] = None,
+) -> Window:
+    # fin por vuelta: posición exacta del primer checkpoint de la vuelta siguiente
+    stop_pos: Optional[int] = None
+    end_t: Optional[float] = None
+    if end is not None:
+        if end.kind == "lap":
+            k = index.find(SeekPoint("lap", end.value + 1))
+            stop_pos = index.pos[k] if k >= 0 else None
+        else:
+            end_t = end.value
+
+    if start is None:
+        it = reader.positioned()
+        return Window([], _bounded(it, stop_pos, end_t))
+
+    k = index.find(start)
+    if k < 0:
+        return Window([], iter(()))
+
+    warm_pos = {pid: p for pid, p in zip(WARM_PACKET_IDS, index.warm[k]) if p != NO_POS}
+    gap: dict[int, tuple[int, "bytes | memoryview"]] = {}
+    it = reader.positioned(index.pos[k])
+    first: Optional[tuple[int, int, "bytes | memoryview"]] = None
+    skipped = 0
+    for rec in it:
+        pos, _ts, payload = rec
+        if start.kind == "lap" or not (_session_time(payload) < start.value):
+            first = rec
+            break
+        # antes del inicio: sólo se recuerda el último de cada tipo de warm-up
+        pid = payload[PACKET_ID_OFFSET] if len(payload) > PACKET_ID_OFFSET else -1
+        if pid in _WARM_SLOT:
+            gap[pid] = (pos, payload)
+        skipped += 1
+
+    warm: list[tuple[int, "bytes | memoryview"]] = []
+    for pid in WARM_PACKET_IDS:
+        if pid in gap:
+            warm.append(gap[pid])
+        elif pid in warm_pos:
+            warm.append((warm_pos[pid], reader.record_at(warm_pos[pid])[1]))
+    warm.sort(key=lambda x: x[0])
+
+    if first is None:
+        return Window([p for _, p in warm], iter(()), skipped=skipped)
+
+    def chained() -> Iterator[tuple[int, int, "bytes | memoryview"]]:
+        yield first
+        yield from it
+
+    return Window(
+        [p for _, p in warm],
+        _bounded(chained(), stop_pos, end_t),
+        start_pos=first[0],
+        skipped=skipped,
+    )
+
+
+def _bounded(
+    it: Iterator[tuple[int, int, "bytes | memoryview"]],
+    stop_pos: Optional[int],
+    end_t: Optional[float],
+) -> Iterator[tuple[int, "bytes | memoryview"]]:
+    for pos, ts_ns, payload in it:
+        if stop_pos is not None and pos >= stop_pos:
+            return
+        if end_t is not None and _session_time(payload) > end_t:
+            return
+        yield ts_ns, payload
@@ -0,0 +1 @@
+# offline: análisis de grabaciones .ingrec sin asyncio (batch replay)
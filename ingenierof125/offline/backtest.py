@@ -0,0 +1,287 @@
+"""
+Backtest de reglas: EventDetector + PriorityManager (vía EngineerEngine) sobre un
+corpus de .ingrec, en paralelo y para una grilla de overrides de reglas.
+
+Uso (desde la raíz del repo):
+  python -m ingenierof125.offline.backtest recordings/ --grid grid.json --jobs 8
+  python -m ingenierof125.offline.backtest recordings/ --grid grid.json --json --out report.json
+
+grid.json es un mapa de clave -> lista de valores (producto cartesiano) o una lista
+explícita de overrides. Las claves con punto editan mapas anidados del JSON de reglas:
+  {"thresholds.fuel_rem_laps_low": [1.5, 2.0, 2.5], "cooldowns.wing_damage": [20, 30]}
+  [{"thresholds.fuel_rem_laps_low": 1.5}, {"comms.throttle_seconds": 8}]
+El candidato 0 es siempre la regla base, sin overrides. Las claves se validan contra
+la regla base antes de arrancar (ver check_grid_keys).
+
+Unidad de trabajo: (archivo, tramo de candidatos). Cada worker decodifica su archivo una
+sola vez y evalúa todos los candidatos del tramo sobre el mismo estado. Con menos archivos
+que workers se parte la grilla para no dejar cores ociosos; los archivos grandes salen
+primero para que la cola no termine con un solo worker trabajando.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+from ingenierof125.offline.batch import BatchReplayer
+from ingenierof125.rules.load import default_rules_path, load_rules
+from ingenierof125.rules.model import RulesConfig
+
+log = logging.getLogger("ingenierof125.offline")
+
+# las que más se miran al tunear; el resto de keys va después, en orden alfabético
+_MAIN_KEYS = ("fuel_low", "wing_damage", "sc_deployed")
+
+
+def expand_grid(grid: Any) -> list[dict[str, Any]]:
+    """Lista de overrides (sin la base) a partir de un mapa clave -> valores o una lista."""
+    if isinstance(grid, Mapping):
+        keys = list(grid)
+        values = []
+        for k in keys:
+            v = grid[k]
+            if not isinstance(v, list) or not v:
+                raise ValueError(f"grid values must be non-empty lists (key {k!r})")
+            values.append(v)
+        return [dict(zip(keys, combo)) for combo in itertools.product(*values)] if keys else []
+    if isinstance(grid, list):
+        for o in grid:
+            if not isinstance(o, Mapping):
+                raise ValueError(f"grid list entries must be objects (got {o!r})")
+        return [dict(o) for o in grid]
+    raise ValueError("grid must be an object (key -> values) or a list of overrides")
+
+
+def check_grid_keys(rules: RulesConfig, candidates: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Valida las claves de los overrides contra la regla base, una vez antes de repartir.
+    Un padre que no es mapa en la base es un error (override armaría un mapa nuevo que
+    nadie lee); una hoja que la base no tiene sólo avisa: los defaults del código la
+    pueden leer igual (p.ej. cooldowns.sc_vsc_deployed).
+    """
+    seen: set[str] = set()
+    for c in candidates:
+        for key in c:
+            if key in seen or key == "throttle_s":  # throttle_s: kwarg propio de override()
+                continue
+            seen.add(key)
+            *parents, leaf = key.split(".")
+            node: Any = rules.raw
+            for i, p in enumerate(parents):
+                node = node.get(p)
+                if not isinstance(node, Mapping):
+                    path = ".".join(parents[: i + 1])
+                    raise ValueError(f"grid key {key!r}: {path!r} is not a map in the base rules")
+            if leaf not in node:
+                log.warning("Grid key %r is not in the base rules (typo?); applying it anyway", key)
+
+
+def find_recordings(root: str) -> list[str]:
+    p = Path(root)
+    if p.is_file():
+        return [str(p)]
+    return sorted(str(f) for f in p.rglob("*.ingrec"))
+
+
+def _plan(files: Sequence[str], n_cand: int, jobs: int) -> list[tuple[str, int, int]]:
+    # (archivo, desde, hasta) sobre la lista de candidatos
+    if not files or n_cand <= 0:
+        return []
+    splits = min(n_cand, max(1, -(-jobs // len(files))))
+    step = -(-n_cand // splits)
+
+    def size(f: str) -> int:
+        try:
+            return os.path.getsize(f)
+        except OSError:
+            return 0
+
+    ordered = sorted(files, key=size, reverse=True)
+    return [(f, a, min(n_cand, a + step)) for f in ordered for a in range(0, n_cand, step)]
+
+
+def _run_task(task: tuple) -> dict:
+    path, raw, overrides, start, tick_hz = task
+    base = RulesConfig.from_mapping(raw)
+    out: dict = {"path": path, "start": start, "n": len(overrides)}
+    t0 = time.perf_counter()
+    try:
+        rp = BatchReplayer([base.override(**o).as_rule_config() for o in overrides], tick_hz=tick_hz)
+        s = rp.run(path)
+    except (OSError, ValueError) as e:
+        out["error"] = str(e)
+        return out
+    out.update(
+        counts=rp.counts,
+        tick_ns=rp.tick_ns,
+        packets=s.packets,
+        session_s=s.session_s,
+        wall_s=time.perf_counter() - t0,
+    )
+    return out
+
+
+@dataclass(slots=True)
+class BacktestReport:
+    candidates: list[dict[str, Any]]
+    counts: list[dict[str, int]]
+    tick_ms: list[float]
+    files: int = 0
+    packets: int = 0
+    session_s: float = 0.0
+    cpu_s: float = 0.0       # suma del tiempo de cada tarea (lo que costaría en serie)
+    wall_s: float = 0.0
+    jobs: int = 1
+    errors: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        return self.cpu_s / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def pps(self) -> float:
+        return self.packets / self.wall_s if self.wall_s > 0 else 0.0
+
+    def keys(self) -> list[str]:
+        seen = {k for c in self.counts for k in c}
+        return [k for k in _MAIN_KEYS if k in seen] + sorted(seen.difference(_MAIN_KEYS))
+
+    def as_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "packets": self.packets,
+            "session_s": self.session_s,
+            "jobs": self.jobs,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "speedup": self.speedup,
+            "pps": self.pps,
+            "errors": [{"path": p, "error": e} for p, e in self.errors],
+            "candidates": [
+                {"overrides": o, "counts": c, "tick_ms": ms}
+                for o, c, ms in zip(self.candidates, self.counts, self.tick_ms)
+            ],
+        }
+
+
+def run_backtest(
+    paths: Sequence[str],
+    rules: RulesConfig,
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    jobs: int = 0,
+    tick_hz: float = 10.0,
+) -> BacktestReport:
+    """Corre todos los candidatos (el primero suele ser {} = base) sobre todos los archivos."""
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    cands = [dict(c) for c in candidates]
+    check_grid_keys(rules, cands)
+    raw = dict(rules.raw)
+    tasks = [(f, raw, cands[a:b], a, tick_hz) for f, a, b in _plan(paths, len(cands), jobs)]
+
+    rep = BacktestReport(
+        candidates=cands,
+        counts=[{} for _ in cands],
+        tick_ms=[0.0] * len(cands),
+        jobs=jobs,
+    )
+    failed: set[str] = set()
+
+    t0 = time.perf_counter()
+    if jobs == 1 or len(tasks) <= 1:
+        results = map(_run_task, tasks)
+        ex: Optional[ProcessPoolExecutor] = None
+    else:
+        ex = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        results = ex.map(_run_task, tasks)
+    try:
+        for r in results:
+            if "error" in r:
+                if r["path"] not in failed:
+                    failed.add(r["path"])
+                    rep.errors.append((r["path"], r["error"]))
+                continue
+            if r["start"] == 0:
+                rep.packets += r["packets"]
+                rep.session_s += r["session_s"]
+            rep.cpu_s += r["wall_s"]
+            for i, (counts, ns) in enumerate(zip(r["counts"], r["tick_ns"]), start=r["start"]):
+                agg = rep.counts[i]
+                for k, n in counts.items():
+                    agg[k] = agg.get(k, 0) + n
+                rep.tick_ms[i] += ns / 1e6
+    finally:
+        if ex is not None:
+            ex.shutdown()
+    rep.wall_s = time.perf_counter() - t0
+    rep.files = len(paths) - len(failed)
+    return rep
+
+
+def format_report(rep: BacktestReport) -> str:
+    keys = rep.keys()
+    lines = [
+        f"files={rep.files} packets={rep.packets} session={rep.session_s / 3600.0:.2f}h "
+        f"jobs={rep.jobs} wall={rep.wall_s:.2f}s cpu={rep.cpu_s:.2f}s "
+        f"(x{rep.speedup:.2f} parallel) pps={rep.pps:.0f}"
+    ]
+    for path, err in rep.errors:
+        lines.append(f"  ERROR {path}: {err}")
+    lines.append("  #  " + "".join(f"{k:>14}" for k in keys) + f"{'tick_ms':>10}  overrides")
+    for i, (o, c, ms) in enumerate(zip(rep.candidates, rep.counts, rep.tick_ms)):
+        desc = ", ".join(f"{k}={v}" for k, v in o.items()) or "(base)"
+        lines.append(f"{i:3d}  " + "".join(f"{c.get(k, 0):>14d}" for k in keys) + f"{ms:>10.1f}  {desc}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m ingenierof125.offline.backtest",
+        description="Backtest rule overrides over a directory of .ingrec recordings",
+    )
+    ap.add_argument("root", help="Directory (searched recursively) or a single .ingrec")
+    ap.add_argument("--grid", type=str, default="", help="JSON grid of rule overrides")
+    ap.add_argument("--rules-path", dest="rules_path", type=str, default="")
+    ap.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = all cores)")
+    ap.add_argument("--tick-hz", dest="tick_hz", type=float, default=10.0)
+    ap.add_argument("--json", action="store_true", help="Print the report as JSON")
+    ap.add_argument("--out", type=str, default="", help="Also write the JSON report here")
+    args = ap.parse_args(argv)
+
+    files = find_recordings(args.root)
+    if not files:
+        print(f"No .ingrec files under {args.root}")
+        return 2
+
+    candidates: list[dict[str, Any]] = [{}]
+    if args.grid:
+        try:
+            grid = json.loads(Path(args.grid).read_text(encoding="utf-8-sig"))
+            candidates += expand_grid(grid)
+        except (OSError, ValueError) as e:
+            print(f"Bad grid {args.grid}: {e}")
+            return 2
+
+    rules = load_rules(args.rules_path or default_rules_path())
+    try:
+        rep = run_backtest(files, rules, candidates, jobs=args.jobs, tick_hz=args.tick_hz)
+    except ValueError as e:
+        print(f"Bad grid {args.grid}: {e}")
+        return 2
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(rep.as_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps(rep.as_dict(), indent=2, ensure_ascii=False) if args.json else format_report(rep))
+    return 0 if not rep.errors else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
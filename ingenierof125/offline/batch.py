@@ -0,0 +1,234 @@
+"""
+Replay batch: .ingrec -> StateManager.apply_packet -> EngineerEngine en un solo loop.
+
+Sin asyncio, sin colas y sin sleeps: los records se leen del mmap (IngrecReader) y se
+aplican en orden. El engine no tickea por reloj de pared sino por session time: cada
+1/tick_hz segundos de sesión se evalúa el estado tal como estaba ANTES del paquete que
+cruzó el tick (causal, igual que el loop en vivo). Si hay un hueco en el session time
+(pausa, flashback) se hace un solo tick en el último punto de la grilla, no uno por
+cada tick perdido.
+
+Un cambio de session_uid arranca estado y engine limpios (cooldowns/throttle incluidos).
+
+Con varias RuleConfig se decodifica una sola vez y cada tick evalúa un engine por
+config sobre el mismo estado (así corre el backtest de reglas).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, TextIO, Union
+
+from ingenierof125.engine.engine import EngineerEngine
+from ingenierof125.engine.events import Event
+from ingenierof125.ingest.ingrec import IngrecReader
+from ingenierof125.rules.model import RuleConfig
+from ingenierof125.state.handlers import HandlerRegistry
+from ingenierof125.state.manager import BODY_CACHE_IDS, StateManager
+from ingenierof125.telemetry.protocol import PKT_HDR, PKT_HDR_SIZE
+
+
+# (ts_ns del paquete que disparó el tick, t de sesión del tick, evento)
+EventCallback = Callable[[int, float, Event], None]
+
+
+class _NullComms:
+    # en batch los eventos van al archivo, no al log
+    def emit(self, ev: Event) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class BatchStats:
+    packets: int = 0
+    bad: int = 0             # records sin header completo
+    ticks: int = 0
+    events: int = 0
+    sessions: int = 0
+    wall_s: float = 0.0
+    session_s: float = 0.0   # session time recorrido (suma por sesión)
+
+    @property
+    def pps(self) -> float:
+        return self.packets / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def realtime_x(self) -> float:
+        return self.session_s / self.wall_s if self.wall_s > 0 else 0.0
+
+
+class BatchReplayer:
+    def __init__(
+        self,
+        rules: Union[RuleConfig, Sequence[RuleConfig]],
+        *,
+        tick_hz: float = 10.0,
+        on_event: Optional[EventCallback] = None,
+        body_cache_ids: Sequence[int] = BODY_CACHE_IDS,
+        lazy_ids: Sequence[int] = (),
+        registry: Optional[HandlerRegistry] = None,
+    ) -> None:
+        if tick_hz <= 0:
+            raise ValueError(f"tick_hz must be > 0 (got {tick_hz})")
+        self._rules = [rules] if isinstance(rules, RuleConfig) else list(rules)
+        if not self._rules:
+            raise ValueError("need at least one RuleConfig")
+        self._dt = 1.0 / float(tick_hz)
+        self._on_event = on_event
+        self.stats = BatchStats()
+        self._body_cache_ids = tuple(body_cache_ids)
+        self._lazy_ids = tuple(lazy_ids)
+        self._registry = registry
+        self.state_mgr = self._new_state()
+        self.engines = self._new_engines()
+
+        # por config: eventos emitidos por key y ns gastados en tick()
+        self.counts: list[dict[str, int]] = [{} for _ in self._rules]
+        self.tick_ns: list[int] = [0] * len(self._rules)
+
+    @property
+    def engine(self) -> EngineerEngine:
+        return self.engines[0]
+
+    def _new_state(self) -> StateManager:
+        return StateManager(body_cache_ids=self._body_cache_ids, lazy_ids=self._lazy_ids, registry=self._registry)
+
+    def _new_engines(self) -> list[EngineerEngine]:
+        return [EngineerEngine.create(r, _NullComms()) for r in self._rules]  # type: ignore[arg-type]
+
+    def _tick(self, t: float, ts_ns: int) -> None:
+        self.stats.ticks += 1
+        state = self.state_mgr.state
+        clock = time.perf_counter_ns
+        for i, engine in enumerate(self.engines):
+            t0 = clock()
+            ev = engine.tick(state, t)
+            self.tick_ns[i] += clock() - t0
+            if ev is None:
+                continue
+            self.stats.events += 1
+            counts = self.counts[i]
+            counts[ev.key] = counts.get(ev.key, 0) + 1
+            if self._on_event is not None:
+                self._on_event(ts_ns, t, ev)
+
+    def run(self, path: str) -> BatchStats:
+        s = self.stats
+        dt = self._dt
+        unpack = PKT_HDR.unpack_from  # tupla cruda: mismo orden que PacketHeader
+        hdr_size = PKT_HDR_SIZE
+        apply = self.state_mgr.apply_header
+
+        uid: Optional[int] = None
+        next_tick: Optional[float] = None
+        st_first = st_last = 0.0
+        dirty = False  # paquetes aplicados desde el último tick
+        ts_ns = 0
+
+        t0 = time.perf_counter()
+        with IngrecReader(path) as reader:
+            for ts_ns, payload in reader:
+                if len(payload) < hdr_size:
+                    s.bad += 1
+                    continue
+                h = unpack(payload, 0)
+                s.packets += 1
+
+                if h[6] != uid:
+                    if uid is not None:
+                        if dirty and next_tick is not None:
+                            self._tick(next_tick, ts_ns)
+                        s.session_s += max(0.0, st_last - st_first)
+                        prev = self.state_mgr
+                        self.state_mgr = self._new_state()
+                        self.state_mgr.carry_stats(prev)  # hit rates / lazy: acumulados de todo el archivo
+                        self.engines = self._new_engines()
+                        apply = self.state_mgr.apply_header
+                    uid = h[6]
+                    s.sessions += 1
+                    next_tick = None
+                    dirty = False
+
+                st = h[7]
+                if st >= 0.0:  # descarta NaN/negativos para la grilla
+                    if next_tick is None:
+                        st_first = st_last = st
+                        next_tick = st + dt
+                    elif st >= next_tick:
+                        t = next_tick + ((st - next_tick) // dt) * dt
+                        self._tick(t, ts_ns)
+                        next_tick = t + dt
+                        dirty = False
+                    if st > st_last:
+                        st_last = st
+
+                apply(h, payload)  # bind de sesión + variantes format/version del registry
+                dirty = True
+
+            if dirty and next_tick is not None:
+                self._tick(next_tick, ts_ns)
+            if uid is not None:
+                s.session_s += max(0.0, st_last - st_first)
+
+        s.wall_s = time.perf_counter() - t0
+        return s
+
+
+class JsonlEventWriter:
+    """Un evento por línea (JSON) con el instante de sesión y el ts de grabación."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+
+    def __call__(self, ts_ns: int, t: float, ev: Event) -> None:
+        rec = {
+            "t": round(t, 3),
+            "ts_ns": ts_ns,
+            "key": ev.key,
+            "priority": ev.priority.name,
+            "score": ev.score,
+            "urgency": ev.urgency,
+            "text": ev.text,
+        }
+        self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def run_batch(
+    path: str,
+    rules: RuleConfig,
+    *,
+    tick_hz: float = 10.0,
+    events_out: str = "",
+    body_cache_ids: Sequence[int] = BODY_CACHE_IDS,
+    lazy_ids: Sequence[int] = (),
+) -> BatchStats:
+    log = logging.getLogger("ingenierof125.offline")
+
+    f: Optional[TextIO] = open(events_out, "w", encoding="utf-8") if events_out else None
+    try:
+        rp = BatchReplayer(
+            rules,
+            tick_hz=tick_hz,
+            on_event=JsonlEventWriter(f) if f is not None else None,
+            body_cache_ids=body_cache_ids,
+            lazy_ids=lazy_ids,
+        )
+        s = rp.run(path)
+    finally:
+        if f is not None:
+            f.close()
+
+    log.info(
+        "Batch replay: packets=%d bad=%d sessions=%d ticks=%d events=%d wall=%.3fs pps=%.0f session=%.1fs (x%.0f realtime)",
+        s.packets, s.bad, s.sessions, s.ticks, s.events, s.wall_s, s.pps, s.session_s, s.realtime_x,
+    )
+    if rp.state_mgr.body_cache:
+        log.info("Batch body cache hit rate: %s", rp.state_mgr.format_body_cache())
+    log.info("Batch state handlers: %s", rp.state_mgr.format_handlers() or "-")
+    if rp.state_mgr.lazy is not None:
+        log.info("Batch lazy state: %s", rp.state_mgr.format_lazy(rp.stats.ticks))
+    if events_out:
+        log.info("Batch events -> %s", events_out)
+    return s
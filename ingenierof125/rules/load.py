@@ -9,7 +9,7 @@ from ingenierof125.rules.model import RulesConfig
 
 def default_rules_path() -> str:
     here = Path(__file__).resolve()
-    repo_root = here.parents[3] if len(here.parents) >= 4 else here.parents[2]
+    repo_root = here.parents[2]  # <repo>/ingenierof125/rules/load.py
 
     cand_repo = repo_root / "rules" / "v1.json"
     cand_pkg = here.parent / "v1.json"
@@ -33,4 +33,4 @@ def load_rules(path: str) -> RulesConfig:
 
     text = p.read_text(encoding="utf-8-sig")
     raw: Any = json.loads(text)
-    return RulesConfig(raw)
\ No newline at end of file
+    return RulesConfig.from_mapping(raw)
\ No newline at end of file
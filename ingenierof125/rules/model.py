@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
 
 @dataclass(frozen=True, slots=True)
@@ -95,16 +95,37 @@ class RuleConfig:
 
 
 @dataclass(frozen=True, slots=True)
-class RulesConfig:
-    version: str
-    raw: Mapping[str, Any]
+class RulesConfig(Mapping[str, Any]):
+    """Reglas tal cual vienen del JSON: dict-like (solo lectura) + override + helpers."""
+
+    raw: Mapping[str, Any] = field(default_factory=dict)
+    version: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.version:
+            object.__setattr__(self, "version", str(self.raw.get("version", "v1")))
 
     @staticmethod
     def from_mapping(raw: Mapping[str, Any]) -> "RulesConfig":
         v = str(raw.get("version", "v1"))
-        return RulesConfig(version=v, raw=raw)
+        return RulesConfig(raw=raw, version=v)
+
+    # --- Mapping ---
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def override(self, *, throttle_s: float | None = None, **values: Any) -> "RulesConfig":
+        """Copia con valores reemplazados.
 
-    def override(self, *, throttle_s: float | None = None) -> "RulesConfig":
+        Las claves con punto editan mapas anidados sin pisar el resto:
+        override(**{"thresholds.fuel_rem_laps_low": 1.5}).
+        """
         new = dict(self.raw)
 
         if throttle_s is not None:
@@ -116,7 +137,17 @@ class RulesConfig:
             comms["throttle_s"] = float(throttle_s)
             new["comms"] = comms
 
-        return RulesConfig(version=self.version, raw=new)
+        for key, v in values.items():
+            *parents, leaf = key.split(".")
+            node = new
+            for p in parents:
+                child = node.get(p)
+                child = dict(child) if isinstance(child, Mapping) else {}
+                node[p] = child
+                node = child
+            node[leaf] = v
+
+        return RulesConfig(raw=new, version=self.version)
 
     @property
     def comms_throttle_s(self) -> float:
@@ -2,21 +2,68 @@ from __future__ import annotations
 
 import logging
 import math
+import time
 from dataclasses import dataclass
-from typing import Optional
-
-from ingenierof125.state.model import EngineerState
-from ingenierof125.telemetry.decoders_lite import (
-    compound_name,
-    decode_damage_player,
-    decode_lap_player,
-    decode_session,
-    decode_status_player,
-    decode_telemetry_player,
-)
+from typing import Iterable, Optional
+
+from ingenierof125.state.handlers import HANDLERS, TIMING_EVERY, Handler, HandlerRegistry, HandlerStats, Registration
+from ingenierof125.state.model import EngineerState, LazySlot, LazyStats
+from ingenierof125.telemetry.decoders_lite import PKT_HDR_SIZE, compound_name
+from ingenierof125.telemetry.formats import FORMATS, DecoderSet, FormatRegistry
+from ingenierof125.telemetry.protocol import PacketHeader
 
 log = logging.getLogger("ingenierof125.state")
 
+# Packet IDs que apply_packet usa (Session, LapData, CarTelemetry, CarStatus, CarDamage)
+STATE_PACKET_IDS = frozenset({1, 2, 6, 7, 10})
+
+# Body cache: Session (2 Hz, casi nunca cambia) y CarDamage (igual de un frame a otro la
+# mayor parte del tiempo). LapData/Telemetry/Status cambian en cada frame: ahí sólo costaría.
+BODY_CACHE_IDS = (1, 10)
+
+# Modo lazy: los que llegan a 60 Hz. El engine lee a --engine-tick-hz (10 Hz por defecto),
+# así que de cada ~6 paquetes se decodifica uno (el último).
+LAZY_STATE_IDS = (2, 6, 7)
+
+_SLOT_NAMES = {1: "session", 2: "lap", 6: "telemetry", 7: "status", 10: "damage"}
+
+_TIMING_MASK = TIMING_EVERY - 1
+_clock = time.perf_counter_ns
+
+
+def parse_body_cache_ids(spec: str) -> tuple[int, ...]:
+    """'' / 'off' => sin cache, 'state' => todos los del estado, '1,10' => lista explícita."""
+    spec = (spec or "").strip().lower()
+    if spec in ("", "off", "none"):
+        return ()
+    ids: set[int] = set()
+    for tok in spec.split(","):
+        tok = tok.strip()
+        if not tok:
+            continue
+        if tok == "state":
+            ids.update(STATE_PACKET_IDS)
+            continue
+        try:
+            pid = int(tok)
+        except ValueError:
+            raise ValueError(f"body_cache_ids inválido: {tok!r} (enteros separados por coma, 'state' u 'off')") from None
+        if pid not in STATE_PACKET_IDS:
+            raise ValueError(f"body_cache_ids: packet {pid} no lo usa el estado (opciones: {sorted(STATE_PACKET_IDS)})")
+        ids.add(pid)
+    return tuple(sorted(ids))
+
+
+@dataclass(slots=True)
+class BodyCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
 
 @dataclass(frozen=True, slots=True)
 class Ttls:
@@ -37,10 +84,48 @@ class StaleFlags:
 
 
 class StateManager:
-    def __init__(self, ttls: Optional[Ttls] = None) -> None:
+    def __init__(
+        self,
+        ttls: Optional[Ttls] = None,
+        *,
+        body_cache_ids: Iterable[int] = BODY_CACHE_IDS,
+        lazy_ids: Iterable[int] = (),
+        registry: Optional[HandlerRegistry] = None,
+        formats: Optional[FormatRegistry] = None,
+    ) -> None:
         self._state = EngineerState()
         self._ttls = ttls or Ttls()
 
+        # decoders del año del juego: se eligen una vez por session_uid (bind_session)
+        self._formats = FORMATS if formats is None else formats
+        self.decoders: DecoderSet = self._formats.default
+        self._session_uid: Optional[int] = None
+        self._unknown_formats: set[tuple[int, int]] = set()
+
+        # modo lazy: esos slots guardan el payload crudo y decodifican al leerse
+        lazy_ids = tuple(lazy_ids)
+        self.lazy: Optional[LazyStats] = LazyStats() if lazy_ids else None
+        self._lazy: dict[int, LazySlot] = {}
+        for pid in lazy_ids:
+            slot = LazySlot(self.decoders.decoder(pid), self._state, self.lazy)
+            self._lazy[pid] = slot
+            setattr(self._state, _SLOT_NAMES[pid], slot)
+
+        # por packet ID: (cuerpo sin header, player_idx, valor decodificado) del último paquete.
+        # Cuerpo idéntico => se reusa el valor y sólo se actualizan t/rx_ns. (No aplica a los lazy.)
+        self.body_cache: dict[int, BodyCacheStats] = {
+            pid: BodyCacheStats() for pid in body_cache_ids if pid not in self._lazy
+        }
+        self._bodies: dict[int, tuple[bytes, int, object]] = {}
+
+        # handlers compilados: packet_id -> ((handler, stats), ...). Los paquetes con
+        # handlers por packet_format/version se resuelven (y cachean) al ver cada variante.
+        self._registry = HANDLERS if registry is None else registry
+        self.handler_stats: dict[str, HandlerStats] = {}
+        self._table: dict[int, tuple[tuple[Handler, HandlerStats], ...]] = {}
+        self._variants: dict[int, dict[tuple[int, int], tuple[tuple[Handler, HandlerStats], ...]]] = {}
+        self._build_table()
+
     @property
     def state(self) -> EngineerState:
         return self._state
@@ -53,7 +138,141 @@ class StateManager:
     def _good_t(t: float) -> bool:
         return isinstance(t, float) and (not math.isnan(t)) and (not math.isinf(t)) and t >= 0.0
 
-    def apply_packet(self, packet_id: int, payload: bytes, session_time: float, player_index: int) -> None:
+    def _build_table(self) -> None:
+        table: dict[int, tuple[tuple[Handler, HandlerStats], ...]] = {}
+        variants: dict[int, dict[tuple[int, int], tuple[tuple[Handler, HandlerStats], ...]]] = {}
+        for pid in self._registry.packet_ids:
+            if self._registry.has_variants(pid):
+                variants[pid] = {}
+            else:
+                table[pid] = self._compile(self._registry.select(pid, 0, 0))
+        self._table = table
+        self._variants = variants
+
+    def bind_session(self, hdr: PacketHeader) -> DecoderSet:
+        """
+        Sesión nueva (session_uid): elige los decoders de (packet_format, game_year) y
+        recompila los handlers si cambian. Acepta la tupla cruda.
+        """
+        self._session_uid = hdr[6]
+        key = (hdr[0], hdr[1])  # sin packet_version: es por tipo de paquete (variantes del registry)
+        ds = self._formats.lookup(*key)
+        if ds is None:
+            ds = self._formats.default
+            if key not in self._unknown_formats:
+                self._unknown_formats.add(key)
+                log.warning(
+                    "No decoders for packet_format=%s game_year=%s (known: %s): using %s",
+                    *key,
+                    ", ".join(self._formats.known),
+                    ds.name,
+                )
+        if ds is not self.decoders:
+            log.info("Session %s: decoding with %s layouts", hdr[6], ds.name)
+            self.decoders = ds
+            for pid, slot in self._lazy.items():
+                slot.rebind(ds.decoder(pid))
+            self._bodies.clear()
+            self._build_table()
+        return ds
+
+    def _compile(self, regs: list[Registration]) -> tuple[tuple[Handler, HandlerStats], ...]:
+        out = []
+        for r in regs:
+            stats = self.handler_stats.get(r.label)
+            if stats is None:
+                stats = self.handler_stats[r.label] = HandlerStats()
+            out.append((r.factory(self), stats))
+        return tuple(out)
+
+    def slot_handler(self, packet_id: int) -> Handler:
+        """Handler de estado del jugador para un packet ID (los que registra este módulo)."""
+        decode = self.decoders.decoder(packet_id)
+
+        lazy = self._lazy.get(packet_id)
+        if lazy is not None:
+            push = lazy.push
+
+            def handle_lazy(payload, t: float, idx: int, rx_ns: int) -> None:
+                # el payload puede ser un slice de un bloque/mmap: se guarda una copia propia
+                push(payload if type(payload) is bytes else bytes(payload), idx, t, rx_ns)
+
+            return handle_lazy
+
+        slot = getattr(self._state, _SLOT_NAMES[packet_id])
+        cache = self.body_cache.get(packet_id)
+        if cache is None:
+
+            def handle(payload, t: float, idx: int, rx_ns: int) -> None:
+                v = decode(payload, idx)
+                if v is not None:
+                    slot.value = v
+                    slot.t = t
+                    slot.ok = True
+                    slot.rx_ns = rx_ns
+
+            return handle
+
+        bodies = self._bodies
+
+        def handle_cached(payload, t: float, idx: int, rx_ns: int) -> None:
+            body = payload[PKT_HDR_SIZE:]
+            if type(body) is not bytes:
+                body = bytes(body)  # memoryview: comparar bytes es mucho más rápido
+            prev = bodies.get(packet_id)
+            if prev is not None and prev[1] == idx and prev[0] == body:
+                cache.hits += 1
+                v = prev[2]
+            else:
+                cache.misses += 1
+                v = decode(payload, idx)
+                if v is not None:
+                    bodies[packet_id] = (body, idx, v)
+            if v is not None:
+                slot.value = v
+                slot.t = t
+                slot.ok = True
+                slot.rx_ns = rx_ns
+
+        return handle_cached
+
+    def carry_stats(self, prev: "StateManager") -> None:
+        """Continúa los contadores (body cache, lazy, handlers) de otro manager (cambio de sesión en batch)."""
+        for pid, c in prev.body_cache.items():
+            mine = self.body_cache.get(pid)
+            if mine is not None:
+                mine.hits += c.hits
+                mine.misses += c.misses
+        if self.lazy is not None and prev.lazy is not None:
+            self.lazy.pushed += prev.lazy.pushed
+            self.lazy.decoded += prev.lazy.decoded
+            self.lazy.decode_ns += prev.lazy.decode_ns
+        for label, h in prev.handler_stats.items():
+            mine = self.handler_stats.get(label)
+            if mine is None:
+                mine = self.handler_stats[label] = HandlerStats()
+            mine.calls += h.calls
+            mine.errors += h.errors
+            mine.timed += h.timed
+            mine.ns += h.ns
+
+    def apply_header(self, hdr: PacketHeader, payload: bytes, rx_ns: int = 0) -> None:
+        """apply_packet con el header ya parseado (PacketHeader o la tupla cruda de PKT_HDR)."""
+        if hdr[6] != self._session_uid:
+            self.bind_session(hdr)
+        self.apply_packet(hdr[5], payload, hdr[7], hdr[10], rx_ns, hdr[0], hdr[4])
+
+    def apply_packet(
+        self,
+        packet_id: int,
+        payload: bytes,
+        session_time: float,
+        player_index: int,
+        rx_ns: int = 0,
+        packet_format: int = 0,
+        packet_version: int = 0,
+    ) -> None:
+        """packet_format/packet_version sólo eligen entre variantes de handlers (0 = genéricos)."""
         if 0 <= player_index < 22:
             self._state.player_index = int(player_index)
 
@@ -62,46 +281,54 @@ class StateManager:
         else:
             session_time = self._state.latest_session_time
 
-        idx = self._state.player_index
-
-        try:
-            if packet_id == 1:
-                v = decode_session(payload)
-                if v is not None:
-                    self._state.session.value = v
-                    self._state.session.t = session_time
-                    self._state.session.ok = True
-
-            elif packet_id == 2:
-                v = decode_lap_player(payload, idx)
-                if v is not None:
-                    self._state.lap.value = v
-                    self._state.lap.t = session_time
-                    self._state.lap.ok = True
-
-            elif packet_id == 6:
-                v = decode_telemetry_player(payload, idx)
-                if v is not None:
-                    self._state.telemetry.value = v
-                    self._state.telemetry.t = session_time
-                    self._state.telemetry.ok = True
-
-            elif packet_id == 7:
-                v = decode_status_player(payload, idx)
-                if v is not None:
-                    self._state.status.value = v
-                    self._state.status.t = session_time
-                    self._state.status.ok = True
+        entries = self._table.get(packet_id)
+        if entries is None:
+            variants = self._variants.get(packet_id)
+            if variants is None:
+                return
+            key = (packet_format, packet_version)
+            entries = variants.get(key)
+            if entries is None:
+                entries = variants[key] = self._compile(self._registry.select(packet_id, packet_format, packet_version))
 
-            elif packet_id == 10:
-                v = decode_damage_player(payload, idx)
-                if v is not None:
-                    self._state.damage.value = v
-                    self._state.damage.t = session_time
-                    self._state.damage.ok = True
-
-        except Exception:
-            self._state.decode_errors += 1
+        idx = self._state.player_index
+        for fn, hs in entries:
+            n = hs.calls = hs.calls + 1
+            t0 = 0 if (n - 1) & _TIMING_MASK else _clock()  # la 1ra y 1 de cada TIMING_EVERY
+            try:
+                fn(payload, session_time, idx, rx_ns)
+            except Exception:
+                hs.errors += 1
+                self._state.decode_errors += 1
+            if t0:
+                hs.ns += _clock() - t0
+                hs.timed += 1
+
+    def format_body_cache(self) -> str:
+        """'1=98% 10=41%' (hit rate por packet ID), '' si no hay cache."""
+        return " ".join(f"{pid}={c.hit_rate * 100:.0f}%" for pid, c in sorted(self.body_cache.items()))
+
+    def format_handlers(self) -> str:
+        """'lap=2.1us telemetry=1.8us damage=2.4us/3err' (media muestreada por handler)."""
+        parts = []
+        for label, h in self.handler_stats.items():
+            if not h.calls:
+                continue
+            txt = f"{label}={h.mean_ns / 1000.0:.1f}us"
+            if h.errors:
+                txt += f"/{h.errors}err"
+            parts.append(txt)
+        return " ".join(parts)
+
+    def format_lazy(self, ticks: int = 0) -> str:
+        """'dec=120/700 saved=3.1us/tick' ('' si no hay modo lazy)."""
+        z = self.lazy
+        if z is None:
+            return ""
+        txt = f"dec={z.decoded}/{z.pushed}"
+        if ticks > 0:
+            txt += f" saved={z.saved_ns / ticks / 1000.0:.1f}us/tick"
+        return txt
 
     def stale_flags(self, now_t: Optional[float] = None) -> StaleFlags:
         t = self._state.latest_session_time if now_t is None else float(now_t)
@@ -172,4 +399,12 @@ class StateManager:
         parts = [self.format_brief()]
         parts.append(f"stale(session={st.session} lap={st.lap} status={st.status} telem={st.telemetry} dmg={st.damage})")
         parts.append(f"t={s.latest_session_time:.3f} player={s.player_index} decErr={s.decode_errors}")
-        return " | ".join(parts)
\ No newline at end of file
+        return " | ".join(parts)
+
+
+def _slot_factory(packet_id: int):
+    return lambda sm: sm.slot_handler(packet_id)
+
+
+for _pid, _name in _SLOT_NAMES.items():
+    HANDLERS.register(_pid, _slot_factory(_pid), name=_name)
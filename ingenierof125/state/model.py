@@ -1,7 +1,8 @@
 ﻿from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from ingenierof125.telemetry.decoders_lite import (
     PlayerDamageLite,
@@ -16,6 +17,7 @@ from ingenierof125.telemetry.decoders_lite import (
 class TimedValue:
     t: float = -1.0  # session_time seconds (F1 header)
     ok: bool = False
+    rx_ns: int = 0  # recepción del paquete (perf_counter_ns); 0 = desconocido
 
 
 @dataclass(slots=True)
@@ -43,6 +45,133 @@ class DamageState(TimedValue):
     value: Optional[PlayerDamageLite] = None
 
 
+@dataclass(slots=True)
+class LazyStats:
+    pushed: int = 0     # payloads guardados por apply_packet
+    decoded: int = 0    # decodes hechos al leer
+    decode_ns: int = 0  # tiempo total en esos decodes
+
+    @property
+    def skipped(self) -> int:
+        return max(0, self.pushed - self.decoded)
+
+    @property
+    def saved_ns(self) -> float:
+        """Estimado: decodes que no se hicieron x costo medio de un decode."""
+        return self.skipped * (self.decode_ns / self.decoded) if self.decoded else 0.0
+
+
+class LazySlot:
+    """
+    Slot en modo lazy: apply_packet sólo guarda el payload crudo (push) y el decode se
+    hace cuando alguien lee value/t/ok/rx_ns. Misma semántica que el slot eager: se
+    decodifica el último payload y, si no da un valor (paquete corto, NaN), el anterior,
+    etc.; t/ok/rx_ns sólo avanzan con un decode bueno. Así stale_flags da lo mismo.
+
+    decode_errors cuenta sólo los payloads que efectivamente se decodificaron.
+    """
+
+    __slots__ = ("_t", "_ok", "_rx_ns", "_value", "_pending", "_decode", "_owner", "_stats")
+
+    # tope de payloads pendientes: si nadie lee (sin engine ni stats) se resuelve igual
+    MAX_PENDING = 16
+
+    def __init__(self, decode: Callable[[Any, int], Any], owner: "EngineerState", stats: LazyStats) -> None:
+        self._t = -1.0
+        self._ok = False
+        self._rx_ns = 0
+        self._value: Any = None
+        self._pending: list[tuple[bytes, int, float, int]] = []
+        self._decode = decode
+        self._owner = owner
+        self._stats = stats
+
+    def push(self, payload: bytes, player_index: int, t: float, rx_ns: int) -> None:
+        pending = self._pending
+        pending.append((payload, player_index, t, rx_ns))
+        self._stats.pushed += 1
+        if len(pending) >= self.MAX_PENDING:
+            self._resolve()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def rebind(self, decode: Callable[[Any, int], Any]) -> None:
+        """Cambia el decoder (otro año del juego); lo pendiente se decodifica con el anterior."""
+        if self._pending:
+            self._resolve()
+        self._decode = decode
+
+    def _resolve(self) -> None:
+        pending = self._pending
+        self._pending = []
+        stats = self._stats
+        t0 = time.perf_counter_ns()
+        for payload, idx, t, rx_ns in reversed(pending):
+            stats.decoded += 1
+            try:
+                v = self._decode(payload, idx)
+            except Exception:
+                self._owner.decode_errors += 1
+                continue
+            if v is not None:
+                self._value = v
+                self._t = t
+                self._ok = True
+                self._rx_ns = rx_ns
+                break
+        stats.decode_ns += time.perf_counter_ns() - t0
+
+    @property
+    def value(self) -> Any:
+        if self._pending:
+            self._resolve()
+        return self._value
+
+    @value.setter
+    def value(self, v: Any) -> None:
+        if self._pending:
+            self._resolve()
+        self._value = v
+
+    @property
+    def t(self) -> float:
+        if self._pending:
+            self._resolve()
+        return self._t
+
+    @t.setter
+    def t(self, v: float) -> None:
+        if self._pending:
+            self._resolve()
+        self._t = v
+
+    @property
+    def ok(self) -> bool:
+        if self._pending:
+            self._resolve()
+        return self._ok
+
+    @ok.setter
+    def ok(self, v: bool) -> None:
+        if self._pending:
+            self._resolve()
+        self._ok = v
+
+    @property
+    def rx_ns(self) -> int:
+        if self._pending:
+            self._resolve()
+        return self._rx_ns
+
+    @rx_ns.setter
+    def rx_ns(self, v: int) -> None:
+        if self._pending:
+            self._resolve()
+        self._rx_ns = v
+
+
 @dataclass(slots=True)
 class EngineerState:
     # IMPORTANT: default_factory para evitar defaults mutables compartidos
@@ -56,3 +185,6 @@ class EngineerState:
     player_index: int = 0
 
     decode_errors: int = 0
+
+    # datos de handlers de plugins (state.handlers), por nombre
+    extra: dict[str, Any] = field(default_factory=dict)
@@ -3,36 +3,21 @@ from __future__ import annotations
 import math
 import struct
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
-# F1 UDP header size (ya usado en dispatcher/protocol)
-PKT_HDR_SIZE = 29
+from ingenierof125.telemetry.narrow import Layout
+from ingenierof125.telemetry.protocol import PKT_HDR_SIZE, PacketHeader, parse_header
 
-from dataclasses import dataclass
+# antes era un dataclass propio (con un campo de menos); el header es uno solo
+PacketHeaderLite = PacketHeader
 
-@dataclass(slots=True)
-class PacketHeaderLite:
-    m_packetFormat: int
-    m_gameYear: int
-    m_gameMajorVersion: int
-    m_gameMinorVersion: int
-    m_packetVersion: int
-    m_packetId: int
-    m_sessionUID: int
-    m_sessionTime: float
-    m_frameIdentifier: int
-    m_playerCarIndex: int
-    m_secondaryPlayerCarIndex: int
-
-
-def decode_packet_header(payload: bytes) -> PacketHeaderLite | None:
-    if not payload or len(payload) < PKT_HDR_SIZE:
-        return None
-    try:
-        vals = PKT_HDR.unpack_from(payload, 0)
-    except Exception:
+
+def decode_packet_header(payload: bytes) -> PacketHeader | None:
+    if not payload:
         return None
-    return PacketHeaderLite(*vals)
+    return parse_header(payload)
+
+
 N_CARS = 22
 
 # Wheel order (documentado): 0 RL, 1 RR, 2 FL, 3 FR
@@ -65,10 +50,80 @@ CAR_TELEMETRY = struct.Struct("<HfffBbHBBH4H4B4BH4f4B")
 # CarStatusData (55 bytes) * 22 => 1239 total con header
 CAR_STATUS = struct.Struct("<5BfffHHBBHBBBbfffBfffB")
 
+# PacketSessionData: primeros 7 campos (weather .. trackId), contiguos => una sola lectura
+_SESSION_HEAD = struct.Struct("<BbbBHBb")
+
 # CarDamageData (46 bytes) * 22 => 1041 total con header
 CAR_DAMAGE = struct.Struct("<4f4B4B4B18B")
 
 
+def _per_wheel(prefix: str) -> tuple[str, ...]:
+    return tuple(f"{prefix}_{w.lower()}" for w in WHEELS)
+
+
+# Nombres de cada valor (en orden) para leer sólo lo que se usa (narrow.compile_reader)
+LAPDATA_FIELDS = (
+    "last_lap_ms", "current_lap_ms",
+    "s1_ms", "s1_min", "s2_ms", "s2_min",
+    "d_front_ms", "d_front_min", "d_lead_ms", "d_lead_min",
+    "lap_distance", "total_distance", "safety_car_delta",
+    "car_pos", "lap_num", "pit_status", "num_pit_stops", "sector", "lap_invalid", "penalties",
+    "total_warnings", "corner_cut_warnings", "unserved_dt", "unserved_sg", "grid_pos",
+    "driver_status", "result_status", "pit_lane_timer_active", "pit_lane_ms", "pit_stop_ms",
+    "pit_should_serve_pen", "speedtrap_fastest_speed", "speedtrap_fastest_lap",
+)
+CAR_TELEMETRY_FIELDS = (
+    "speed_kph", "throttle", "steer", "brake", "clutch", "gear", "engine_rpm", "drs",
+    "rev_pct", "rev_bits",
+    *_per_wheel("brakes_temp"), *_per_wheel("tyres_surface_temp"), *_per_wheel("tyres_inner_temp"),
+    "engine_temp", *_per_wheel("tyres_pressure"), *_per_wheel("surface_type"),
+)
+CAR_STATUS_FIELDS = (
+    "traction_control", "abs_on", "fuel_mix", "front_brake_bias", "pit_limiter",
+    "fuel_in_tank", "fuel_capacity", "fuel_remaining_laps", "max_rpm", "idle_rpm", "max_gears",
+    "drs_allowed", "drs_activation_distance", "actual_compound", "visual_compound", "tyre_age_laps",
+    "fia_flags", "engine_power_ice", "engine_power_mguk", "ers_store_energy", "ers_deploy_mode",
+    "ers_harvest_mguk", "ers_harvest_mguh", "ers_deployed_lap", "network_paused",
+)
+CAR_DAMAGE_FIELDS = (
+    *_per_wheel("tyres_wear"), *_per_wheel("tyres_damage"), *_per_wheel("brakes_damage"),
+    *_per_wheel("tyre_blisters"),
+    "front_left_wing", "front_right_wing", "rear_wing", "floor", "diffuser", "sidepod",
+    "drs_fault", "ers_fault", "gearbox_damage", "engine_damage",
+    "engine_mguh_wear", "engine_es_wear", "engine_ce_wear", "engine_ice_wear", "engine_mguk_wear",
+    "engine_tc_wear", "engine_blown", "engine_seized",
+)
+
+LAPDATA_LAYOUT = Layout(LAPDATA, LAPDATA_FIELDS)
+CAR_TELEMETRY_LAYOUT = Layout(CAR_TELEMETRY, CAR_TELEMETRY_FIELDS)
+CAR_STATUS_LAYOUT = Layout(CAR_STATUS, CAR_STATUS_FIELDS)
+CAR_DAMAGE_LAYOUT = Layout(CAR_DAMAGE, CAR_DAMAGE_FIELDS)
+
+# Tamaño mínimo de cada paquete F1 25 (con header)
+SESSION_SIZE = 753
+LAPDATA_SIZE = 1285
+CAR_TELEMETRY_SIZE = 1352
+CAR_STATUS_SIZE = 1239
+CAR_DAMAGE_SIZE = 1041
+
+# Campos que usan los *Lite (en orden de offset => sin reordenar). Cualquier Layout de
+# otro año que tenga estos nombres sirve para make_*_decoder.
+LAP_PLAYER_FIELDS = (
+    "last_lap_ms", "current_lap_ms", "d_front_ms", "d_front_min", "d_lead_ms", "d_lead_min",
+    "car_pos", "lap_num", "sector", "penalties",
+)
+TELEMETRY_PLAYER_FIELDS = ("speed_kph", "throttle", "steer", "brake", "gear", "engine_rpm", "drs")
+STATUS_PLAYER_FIELDS = (
+    "fuel_in_tank", "fuel_remaining_laps", "drs_allowed", "actual_compound", "visual_compound", "tyre_age_laps",
+)
+DAMAGE_PLAYER_FIELDS = (*_per_wheel("tyres_wear"), "front_left_wing", "front_right_wing", "gearbox_damage", "engine_damage")
+
+LAP_PLAYER_READER = LAPDATA_LAYOUT.reader(*LAP_PLAYER_FIELDS)
+TELEMETRY_PLAYER_READER = CAR_TELEMETRY_LAYOUT.reader(*TELEMETRY_PLAYER_FIELDS)
+STATUS_PLAYER_READER = CAR_STATUS_LAYOUT.reader(*STATUS_PLAYER_FIELDS)
+DAMAGE_PLAYER_READER = CAR_DAMAGE_LAYOUT.reader(*DAMAGE_PLAYER_FIELDS)
+
+
 @dataclass(slots=True)
 class SessionLite:
     weather: int = 0
@@ -151,271 +206,188 @@ def compound_name(actual: int, visual: int) -> str:
     return f"{a}/{v}"
 
 
-def decode_session(payload: bytes) -> Optional[SessionLite]:
-    # PacketSessionData total típico: 753 bytes
-    if len(payload) < 753:
-        return None
-    off = PKT_HDR_SIZE
-
-    # Primer bloque estable
-    weather = payload[off]
-    off += 1
-    track_temp = struct.unpack_from("<b", payload, off)[0]
-    off += 1
-    air_temp = struct.unpack_from("<b", payload, off)[0]
-    off += 1
-    total_laps = payload[off]
-    off += 1
-    track_len = struct.unpack_from("<H", payload, off)[0]
-    off += 2
-    session_type = payload[off]
-    off += 1
-    track_id = struct.unpack_from("<b", payload, off)[0]
-    off += 1
-
-    # formula
-    off += 1
-    # sessionTimeLeft, sessionDuration
-    off += 2 + 2
-
-    # pitSpeedLimit + gamePaused + isSpectating + spectatorCarIndex + sliProNativeSupport + numMarshalZones
-    num_marshal_zones = payload[off + 5]
-    off += 6
-
-    # MarshalZone[21] (float + int8) => 5 bytes each
-    off += 21 * 5
-
-    safety_car_status = payload[off]
-    off += 1
-
-    # networkGame
-    off += 1
-
-    num_weather_samples = payload[off]
-    off += 1
-
-    # WeatherForecastSample[64] => 8 bytes each
-    best_10m: Optional[int] = None
-    for i in range(64):
-        st = payload[off]
-        time_offset_min = payload[off + 1]
-        rain_pct = payload[off + 7]
-        if i < int(num_weather_samples) and st == session_type and time_offset_min <= 10:
-            rp = int(rain_pct)
-            if best_10m is None or rp > best_10m:
-                best_10m = rp
-        off += 8
-
-    return SessionLite(
-        weather=int(weather),
-        track_temp_c=int(track_temp),
-        air_temp_c=int(air_temp),
-        total_laps=int(total_laps),
-        track_length_m=int(track_len),
-        session_type=int(session_type),
-        track_id=int(track_id),
-        safety_car_status=int(safety_car_status),
-        rain_next_10m_pct=best_10m,
-    )
-
-
-def decode_lap_player(payload: bytes, player_idx: int) -> Optional[PlayerLapLite]:
-    if len(payload) < 1285:
-        return None
-    if not (0 <= player_idx < N_CARS):
-        return None
-    base = PKT_HDR_SIZE + player_idx * LAPDATA.size
-    if base + LAPDATA.size > len(payload):
-        return None
-
-    (
-        last_lap_ms,
-        current_lap_ms,
-        s1_ms,
-        s1_min,
-        s2_ms,
-        s2_min,
-        d_front_ms,
-        d_front_min,
-        d_lead_ms,
-        d_lead_min,
-        lap_distance,
-        total_distance,
-        safety_car_delta,
-        car_pos,
-        lap_num,
-        pit_status,
-        num_pit_stops,
-        sector,
-        lap_invalid,
-        penalties,
-        total_warnings,
-        corner_cut_warnings,
-        unserved_dt,
-        unserved_sg,
-        grid_pos,
-        driver_status,
-        result_status,
-        pit_lane_timer_active,
-        pit_lane_ms,
-        pit_stop_ms,
-        pit_should_serve_pen,
-        speedtrap_fastest_speed,
-        speedtrap_fastest_lap,
-    ) = LAPDATA.unpack_from(payload, base)
-
-    return PlayerLapLite(
-        lap_num=int(lap_num),
-        position=int(car_pos),
-        sector=int(sector),
-        last_lap_ms=int(last_lap_ms),
-        current_lap_ms=int(current_lap_ms),
-        delta_front_ms=_ms_from_parts(d_front_ms, d_front_min),
-        delta_leader_ms=_ms_from_parts(d_lead_ms, d_lead_min),
-        penalties_s=int(penalties),
-    )
-
-
-def decode_status_player(payload: bytes, player_idx: int) -> Optional[PlayerStatusLite]:
-    if len(payload) < 1239:
-        return None
-    if not (0 <= player_idx < N_CARS):
-        return None
-    base = PKT_HDR_SIZE + player_idx * CAR_STATUS.size
-    if base + CAR_STATUS.size > len(payload):
-        return None
-
-    (
-        traction_control,
-        abs_on,
-        fuel_mix,
-        front_brake_bias,
-        pit_limiter,
-        fuel_in_tank,
-        fuel_capacity,
-        fuel_remaining_laps,
-        max_rpm,
-        idle_rpm,
-        max_gears,
-        drs_allowed,
-        drs_activation_distance,
-        actual_compound,
-        visual_compound,
-        tyre_age_laps,
-        fia_flags,
-        engine_power_ice,
-        engine_power_mguk,
-        ers_store_energy,
-        ers_deploy_mode,
-        ers_harvest_mguk,
-        ers_harvest_mguh,
-        ers_deployed_lap,
-        network_paused,
-    ) = CAR_STATUS.unpack_from(payload, base)
-
-    ft = float(fuel_in_tank)
-    fr = float(fuel_remaining_laps)
-    if not (_finite(ft) and _finite(fr)):
-        return None
-
-    return PlayerStatusLite(
-        fuel_in_tank=max(0.0, ft),
-        fuel_remaining_laps=fr,
-        actual_compound=int(actual_compound),
-        visual_compound=int(visual_compound),
-        tyre_age_laps=int(tyre_age_laps),
-        drs_allowed=int(drs_allowed),
-    )
-
-
-def decode_telemetry_player(payload: bytes, player_idx: int) -> Optional[PlayerTelemetryLite]:
-    if len(payload) < 1352:
-        return None
-    if not (0 <= player_idx < N_CARS):
-        return None
-    base = PKT_HDR_SIZE + player_idx * CAR_TELEMETRY.size
-    if base + CAR_TELEMETRY.size > len(payload):
-        return None
-
-    (
-        speed_kph,
-        throttle,
-        steer,
-        brake,
-        clutch,
-        gear,
-        engine_rpm,
-        drs,
-        rev_pct,
-        rev_bits,
-        bt0,
-        bt1,
-        bt2,
-        bt3,
-        ts0,
-        ts1,
-        ts2,
-        ts3,
-        ti0,
-        ti1,
-        ti2,
-        ti3,
-        engine_temp,
-        p0,
-        p1,
-        p2,
-        p3,
-        st0,
-        st1,
-        st2,
-        st3,
-    ) = CAR_TELEMETRY.unpack_from(payload, base)
-
-    thr = float(throttle)
-    brk = float(brake)
-    strv = float(steer)
-    if not (_finite(thr) and _finite(brk) and _finite(strv)):
-        return None
-
-    return PlayerTelemetryLite(
-        speed_kph=int(speed_kph),
-        throttle=_clamp(thr, 0.0, 1.0),
-        brake=_clamp(brk, 0.0, 1.0),
-        steer=_clamp(strv, -1.0, 1.0),
-        gear=int(gear),
-        drs=int(drs),
-        engine_rpm=int(engine_rpm),
-    )
-
-
-def decode_damage_player(payload: bytes, player_idx: int) -> Optional[PlayerDamageLite]:
-    if len(payload) < 1041:
-        return None
-    if not (0 <= player_idx < N_CARS):
-        return None
-    base = PKT_HDR_SIZE + player_idx * CAR_DAMAGE.size
-    if base + CAR_DAMAGE.size > len(payload):
-        return None
-
-    unpacked = CAR_DAMAGE.unpack_from(payload, base)
-    wear = tuple(float(_clamp(x, 0.0, 100.0)) for x in unpacked[0:4])  # type: ignore[misc]
-
-    # offsets:
-    # 0..3 floats (16B)
-    # 4 tyreDamage[4] (4B) => idx 4..7
-    # 8 brakesDamage[4] (4B) => idx 8..11
-    # then: frontLeftWing(1), frontRightWing(1), rearWing(1), floor(1), diffuser(1), sidepod(1),
-    # drsFault(1), ersFault(1), gearbox(1), engine(1), +18 bytes
-    front_left_wing = int(unpacked[16])
-    front_right_wing = int(unpacked[17])
-    gearbox_damage = int(unpacked[24])
-    engine_damage = int(unpacked[25])
-
-    return PlayerDamageLite(
-        wear=(wear[0], wear[1], wear[2], wear[3]),
-        front_left_wing=front_left_wing,
-        front_right_wing=front_right_wing,
-        gearbox_damage=gearbox_damage,
-        engine_damage=engine_damage,
-    )
-
+def make_session_decoder(packet_size: int = SESSION_SIZE) -> Callable[[bytes], Optional[SessionLite]]:
+    head_unpack = _SESSION_HEAD.unpack_from
+    # + formula, sessionTimeLeft, sessionDuration, pitSpeedLimit, gamePaused, isSpectating,
+    # spectatorCarIndex, sliProNativeSupport, numMarshalZones, MarshalZone[21] (5 bytes c/u)
+    sc_off = PKT_HDR_SIZE + _SESSION_HEAD.size + 1 + 2 + 2 + 6 + 21 * 5
+
+    def decode_session(payload: bytes) -> Optional[SessionLite]:
+        if len(payload) < packet_size:
+            return None
+
+        # Primer bloque estable: weather, trackTemp, airTemp, totalLaps, trackLength, sessionType, trackId
+        weather, track_temp, air_temp, total_laps, track_len, session_type, track_id = head_unpack(payload, PKT_HDR_SIZE)
+
+        safety_car_status = payload[sc_off]
+        # networkGame
+        num_weather_samples = payload[sc_off + 2]
+        off = sc_off + 3
+
+        # WeatherForecastSample[64] => 8 bytes each; sólo cuentan los num_weather_samples primeros
+        best_10m: Optional[int] = None
+        for _ in range(min(64, int(num_weather_samples))):
+            st = payload[off]
+            time_offset_min = payload[off + 1]
+            rain_pct = payload[off + 7]
+            if st == session_type and time_offset_min <= 10:
+                rp = int(rain_pct)
+                if best_10m is None or rp > best_10m:
+                    best_10m = rp
+            off += 8
+
+        return SessionLite(
+            weather=int(weather),
+            track_temp_c=int(track_temp),
+            air_temp_c=int(air_temp),
+            total_laps=int(total_laps),
+            track_length_m=int(track_len),
+            session_type=int(session_type),
+            track_id=int(track_id),
+            safety_car_status=int(safety_car_status),
+            rain_next_10m_pct=best_10m,
+        )
+
+    return decode_session
+
+
+def make_lap_decoder(layout: Layout, packet_size: int) -> Callable[[bytes, int], Optional[PlayerLapLite]]:
+    read = layout.reader(*LAP_PLAYER_FIELDS).unpack_from
+    size = layout.size
+
+    def decode_lap_player(payload: bytes, player_idx: int) -> Optional[PlayerLapLite]:
+        if len(payload) < packet_size:
+            return None
+        if not (0 <= player_idx < N_CARS):
+            return None
+        base = PKT_HDR_SIZE + player_idx * size
+        if base + size > len(payload):
+            return None
+
+        (
+            last_lap_ms,
+            current_lap_ms,
+            d_front_ms,
+            d_front_min,
+            d_lead_ms,
+            d_lead_min,
+            car_pos,
+            lap_num,
+            sector,
+            penalties,
+        ) = read(payload, base)
+
+        return PlayerLapLite(
+            lap_num=int(lap_num),
+            position=int(car_pos),
+            sector=int(sector),
+            last_lap_ms=int(last_lap_ms),
+            current_lap_ms=int(current_lap_ms),
+            delta_front_ms=_ms_from_parts(d_front_ms, d_front_min),
+            delta_leader_ms=_ms_from_parts(d_lead_ms, d_lead_min),
+            penalties_s=int(penalties),
+        )
+
+    return decode_lap_player
+
+
+def make_status_decoder(layout: Layout, packet_size: int) -> Callable[[bytes, int], Optional[PlayerStatusLite]]:
+    read = layout.reader(*STATUS_PLAYER_FIELDS).unpack_from
+    size = layout.size
+
+    def decode_status_player(payload: bytes, player_idx: int) -> Optional[PlayerStatusLite]:
+        if len(payload) < packet_size:
+            return None
+        if not (0 <= player_idx < N_CARS):
+            return None
+        base = PKT_HDR_SIZE + player_idx * size
+        if base + size > len(payload):
+            return None
+
+        fuel_in_tank, fuel_remaining_laps, drs_allowed, actual_compound, visual_compound, tyre_age_laps = read(
+            payload, base
+        )
+
+        ft = float(fuel_in_tank)
+        fr = float(fuel_remaining_laps)
+        if not (_finite(ft) and _finite(fr)):
+            return None
+
+        return PlayerStatusLite(
+            fuel_in_tank=max(0.0, ft),
+            fuel_remaining_laps=fr,
+            actual_compound=int(actual_compound),
+            visual_compound=int(visual_compound),
+            tyre_age_laps=int(tyre_age_laps),
+            drs_allowed=int(drs_allowed),
+        )
+
+    return decode_status_player
+
+
+def make_telemetry_decoder(layout: Layout, packet_size: int) -> Callable[[bytes, int], Optional[PlayerTelemetryLite]]:
+    read = layout.reader(*TELEMETRY_PLAYER_FIELDS).unpack_from
+    size = layout.size
+
+    def decode_telemetry_player(payload: bytes, player_idx: int) -> Optional[PlayerTelemetryLite]:
+        if len(payload) < packet_size:
+            return None
+        if not (0 <= player_idx < N_CARS):
+            return None
+        base = PKT_HDR_SIZE + player_idx * size
+        if base + size > len(payload):
+            return None
+
+        speed_kph, throttle, steer, brake, gear, engine_rpm, drs = read(payload, base)
+
+        thr = float(throttle)
+        brk = float(brake)
+        strv = float(steer)
+        if not (_finite(thr) and _finite(brk) and _finite(strv)):
+            return None
+
+        return PlayerTelemetryLite(
+            speed_kph=int(speed_kph),
+            throttle=_clamp(thr, 0.0, 1.0),
+            brake=_clamp(brk, 0.0, 1.0),
+            steer=_clamp(strv, -1.0, 1.0),
+            gear=int(gear),
+            drs=int(drs),
+            engine_rpm=int(engine_rpm),
+        )
+
+    return decode_telemetry_player
+
+
+def make_damage_decoder(layout: Layout, packet_size: int) -> Callable[[bytes, int], Optional[PlayerDamageLite]]:
+    read = layout.reader(*DAMAGE_PLAYER_FIELDS).unpack_from
+    size = layout.size
+
+    def decode_damage_player(payload: bytes, player_idx: int) -> Optional[PlayerDamageLite]:
+        if len(payload) < packet_size:
+            return None
+        if not (0 <= player_idx < N_CARS):
+            return None
+        base = PKT_HDR_SIZE + player_idx * size
+        if base + size > len(payload):
+            return None
+
+        w_rl, w_rr, w_fl, w_fr, front_left_wing, front_right_wing, gearbox_damage, engine_damage = read(payload, base)
+
+        return PlayerDamageLite(
+            wear=(_clamp(w_rl, 0.0, 100.0), _clamp(w_rr, 0.0, 100.0), _clamp(w_fl, 0.0, 100.0), _clamp(w_fr, 0.0, 100.0)),
+            front_left_wing=front_left_wing,
+            front_right_wing=front_right_wing,
+            gearbox_damage=gearbox_damage,
+            engine_damage=engine_damage,
+        )
+
+    return decode_damage_player
+
+
+# Decoders F1 25 (los de siempre). Para otros años: telemetry.formats.
+decode_session = make_session_decoder(SESSION_SIZE)
+decode_lap_player = make_lap_decoder(LAPDATA_LAYOUT, LAPDATA_SIZE)
+decode_status_player = make_status_decoder(CAR_STATUS_LAYOUT, CAR_STATUS_SIZE)
+decode_telemetry_player = make_telemetry_decoder(CAR_TELEMETRY_LAYOUT, CAR_TELEMETRY_SIZE)
+decode_damage_player = make_damage_decoder(CAR_DAMAGE_LAYOUT, CAR_DAMAGE_SIZE)
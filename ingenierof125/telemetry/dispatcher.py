@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
 from ingenierof125.core.stats import RuntimeStats
 from ingenierof125.state.manager import StateManager
-from ingenierof125.telemetry.protocol import PacketHeader
+from ingenierof125.telemetry.formats import FORMATS
+from ingenierof125.telemetry.protocol import parse_header
+
+# Sentinela para despertar un get() bloqueado al hacer stop() (sin timeouts por paquete)
+_STOP = object()
 
 
 class PacketDispatcher:
@@ -18,9 +23,12 @@ class PacketDispatcher:
         *,
         strict_format: bool = False,
         strict_game_year: bool = False,
+        batch_max: int = 256,
     ) -> None:
         self._log = logging.getLogger("ingenierof125.dispatcher")
         self._stop = asyncio.Event()
+        self._in_queue: "asyncio.Queue[tuple[int, bytes]] | None" = None
+        self._batch_max = max(1, int(batch_max))
 
         self._expected_packet_format = int(expected_packet_format)
         self._expected_game_year = int(expected_game_year)
@@ -36,6 +44,14 @@ class PacketDispatcher:
 
     def stop(self) -> None:
         self._stop.set()
+        q = self._in_queue
+        if q is None:
+            return
+        try:
+            q.put_nowait(_STOP)  # type: ignore[arg-type]
+        except asyncio.QueueFull:
+            # cola llena => el loop no está esperando; ve el flag al terminar el lote
+            pass
 
     def _touch_ids(self, packet_id: int) -> None:
         # RuntimeStats.ids hoy es list[int]. Si mañana pasa a dict, también banca.
@@ -53,58 +69,90 @@ class PacketDispatcher:
         elif isinstance(ids, dict):
             ids[packet_id] = int(ids.get(packet_id, 0)) + 1
 
-    async def run(self, in_queue: "asyncio.Queue[bytes]") -> None:
+    async def run(self, in_queue: "asyncio.Queue[tuple[int, bytes]]") -> None:
+        """
+        Drena en lotes: espera sólo si la cola está vacía y después saca todo lo
+        disponible con get_nowait() (hasta batch_max, luego cede el loop).
+
+        Items: (rx_ns, payload) desde PacketFanout; un payload suelto también se
+        acepta (sin rx_ns no se miden latencias).
+        """
+        self._in_queue = in_queue
         self._log.info("Dispatcher running")
+
+        get = in_queue.get
+        get_nowait = in_queue.get_nowait
+        process = self._process
+        batch_max = self._batch_max
+
         while not self._stop.is_set():
-            try:
-                data = await asyncio.wait_for(in_queue.get(), timeout=0.5)
-            except asyncio.TimeoutError:
-                continue
-
-            self._stats.dispatched_in += 1
-
-            hdr = PacketHeader.try_parse(data)
-            if hdr is None:
-                self._stats.drop_bad_hdr += 1
-                continue
-
-            if hdr.packet_format != self._expected_packet_format:
-                if self._strict_format:
-                    self._stats.drop_fmt += 1
-                    continue
-                if not self._warned_format:
-                    self._warned_format = True
-                    self._log.warning(
-                        "packet_format mismatch (got=%s expected=%s) but strict_format=False -> ACCEPTING",
-                        hdr.packet_format,
-                        self._expected_packet_format,
-                    )
-
-            if hdr.game_year != self._expected_game_year:
-                if self._strict_game_year:
-                    self._stats.drop_year += 1
-                    continue
-                if not self._warned_year:
-                    self._warned_year = True
-                    self._log.warning(
-                        "game_year mismatch (got=%s expected=%s) but strict_game_year=False -> ACCEPTING",
-                        hdr.game_year,
-                        self._expected_game_year,
-                    )
-
-            # debug ids
-            self._touch_ids(int(hdr.packet_id))
-
-            # Actualiza estado normalizado
-            if self._state is not None:
+            item = await get()
+            n = 0
+            while item is not _STOP:
+                if type(item) is tuple:
+                    process(item[1], item[0])
+                else:
+                    process(item)
+                n += 1
+                if n >= batch_max:
+                    break
                 try:
-                    self._state.apply_packet(
-                        packet_id=int(hdr.packet_id),
-                        payload=data,
-                        session_time=float(hdr.session_time),
-                        player_index=int(hdr.player_car_index),
-                    )
-                except Exception:
-                    self._stats.dec_err += 1
-                    if self._log.isEnabledFor(logging.DEBUG):
-                        self._log.exception("apply_packet failed")
\ No newline at end of file
+                    item = get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+            if n:
+                self._stats.disp_batches += 1
+            if n >= batch_max:
+                await asyncio.sleep(0)  # lote lleno: no acaparar el loop
+
+    def _process(self, data: bytes, rx_ns: int = 0) -> None:
+        st = self._stats
+        st.dispatched_in += 1
+        if rx_ns:
+            st.lat_queue.record(time.perf_counter_ns() - rx_ns)
+
+        hdr = parse_header(data)
+        if hdr is None:
+            self._stats.drop_bad_hdr += 1
+            return
+
+        if hdr.packet_format != self._expected_packet_format:
+            if self._strict_format:
+                self._stats.drop_fmt += 1
+                return
+            if not self._warned_format:
+                self._warned_format = True
+                self._log.warning(
+                    "packet_format mismatch (got=%s expected=%s) but strict_format=False -> ACCEPTING (%s layouts)",
+                    hdr.packet_format,
+                    self._expected_packet_format,
+                    FORMATS.select(hdr.packet_format, hdr.game_year).name,
+                )
+
+        if hdr.game_year != self._expected_game_year:
+            if self._strict_game_year:
+                self._stats.drop_year += 1
+                return
+            if not self._warned_year:
+                self._warned_year = True
+                self._log.warning(
+                    "game_year mismatch (got=%s expected=%s) but strict_game_year=False -> ACCEPTING (%s layouts)",
+                    hdr.game_year,
+                    self._expected_game_year,
+                    FORMATS.select(hdr.packet_format, hdr.game_year).name,
+                )
+
+        # debug ids
+        self._touch_ids(hdr.packet_id)
+
+        # Actualiza estado normalizado (el header ya viene tipado del struct: sin int()/float())
+        if self._state is not None:
+            try:
+                self._state.apply_header(hdr, data, rx_ns)
+                if rx_ns:
+                    st.lat_state.record(time.perf_counter_ns() - rx_ns)
+            except Exception:
+                self._stats.dec_err += 1
+                if self._log.isEnabledFor(logging.DEBUG):
+                    self._log.exception("apply_packet failed")
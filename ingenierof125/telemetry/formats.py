@@ -0,0 +1,133 @@
+"""
+Decoders por versión del juego: (packet_format, game_year) -> DecoderSet.
+
+Un DecoderSet trae los Layout y tamaños de paquete de un año y los decoders del jugador
+ya compilados para esos layouts. StateManager elige uno cuando aparece un session_uid
+nuevo (bind_session) y desde ahí decodifica sin mirar la versión paquete a paquete.
+
+  F1 25 (2025/25)  CarDamage 46 bytes/auto (con tyreBlisters), 1041 total
+  F1 24 (2024/24)  CarDamage 42 bytes/auto (sin tyreBlisters),  953 total
+
+El resto de lo que se lee (Session, LapData, CarTelemetry, CarStatus) es igual en los dos.
+Para otro año: armar su DecoderSet con make_decoder_set(...) y FORMATS.register(...).
+
+packet_version no es parte de la clave: es de cada tipo de paquete, y el primer paquete
+de una sesión no dice nada de los demás. Un layout distinto para una versión de un
+paquete va como variante en el HandlerRegistry (register(..., packet_version=N)), que
+se resuelve por packet ID.
+"""
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from ingenierof125.telemetry.decoders_lite import (
+    CAR_DAMAGE_FIELDS,
+    CAR_DAMAGE_LAYOUT,
+    CAR_DAMAGE_SIZE,
+    CAR_STATUS_LAYOUT,
+    CAR_STATUS_SIZE,
+    CAR_TELEMETRY_LAYOUT,
+    CAR_TELEMETRY_SIZE,
+    LAPDATA_LAYOUT,
+    LAPDATA_SIZE,
+    N_CARS,
+    PKT_HDR_SIZE,
+    SESSION_SIZE,
+    make_damage_decoder,
+    make_lap_decoder,
+    make_session_decoder,
+    make_status_decoder,
+    make_telemetry_decoder,
+)
+from ingenierof125.telemetry.narrow import Layout
+
+# packet_id -> fn(payload, player_idx)
+PlayerDecoder = Callable[[Any, int], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class DecoderSet:
+    name: str
+    packet_format: int
+    game_year: int
+    layouts: dict[int, Layout]            # packet_id -> Layout por auto (LapData, Telemetry, Status, Damage)
+    sizes: dict[int, int]                 # packet_id -> tamaño mínimo del paquete
+    decoders: dict[int, PlayerDecoder]    # packet_id -> decoder del jugador
+
+    def decoder(self, packet_id: int) -> PlayerDecoder:
+        return self.decoders[packet_id]
+
+
+def make_decoder_set(
+    name: str,
+    packet_format: int,
+    game_year: int,
+    *,
+    session_size: int = SESSION_SIZE,
+    lap: Layout = LAPDATA_LAYOUT,
+    lap_size: int = LAPDATA_SIZE,
+    telemetry: Layout = CAR_TELEMETRY_LAYOUT,
+    telemetry_size: int = CAR_TELEMETRY_SIZE,
+    status: Layout = CAR_STATUS_LAYOUT,
+    status_size: int = CAR_STATUS_SIZE,
+    damage: Layout = CAR_DAMAGE_LAYOUT,
+    damage_size: int = CAR_DAMAGE_SIZE,
+) -> DecoderSet:
+    """DecoderSet a partir de los layouts de un año (por defecto los de F1 25)."""
+    for pid, layout, size in ((2, lap, lap_size), (6, telemetry, telemetry_size), (7, status, status_size), (10, damage, damage_size)):
+        if size < PKT_HDR_SIZE + N_CARS * layout.size:
+            raise ValueError(f"{name}: packet {pid} size {size} < 22 x {layout.size} + header")
+
+    session = make_session_decoder(session_size)
+    return DecoderSet(
+        name=name,
+        packet_format=packet_format,
+        game_year=game_year,
+        layouts={2: lap, 6: telemetry, 7: status, 10: damage},
+        sizes={1: session_size, 2: lap_size, 6: telemetry_size, 7: status_size, 10: damage_size},
+        decoders={
+            1: lambda payload, idx: session(payload),
+            2: make_lap_decoder(lap, lap_size),
+            6: make_telemetry_decoder(telemetry, telemetry_size),
+            7: make_status_decoder(status, status_size),
+            10: make_damage_decoder(damage, damage_size),
+        },
+    )
+
+
+# F1 24: CarDamageData sin m_tyreBlisters[4]
+CAR_DAMAGE_24 = struct.Struct("<4f4B4B18B")
+CAR_DAMAGE_24_LAYOUT = Layout(CAR_DAMAGE_24, tuple(n for n in CAR_DAMAGE_FIELDS if not n.startswith("tyre_blisters")))
+CAR_DAMAGE_24_SIZE = PKT_HDR_SIZE + N_CARS * CAR_DAMAGE_24.size  # 953
+
+F1_25 = make_decoder_set("F1 25", 2025, 25)
+F1_24 = make_decoder_set("F1 24", 2024, 24, damage=CAR_DAMAGE_24_LAYOUT, damage_size=CAR_DAMAGE_24_SIZE)
+
+
+class FormatRegistry:
+    def __init__(self, default: DecoderSet) -> None:
+        self.default = default
+        # (packet_format, game_year) -> DecoderSet
+        self._sets: dict[tuple[int, int], DecoderSet] = {}
+
+    def register(self, ds: DecoderSet) -> None:
+        self._sets[(ds.packet_format, ds.game_year)] = ds
+
+    def lookup(self, packet_format: int, game_year: int) -> Optional[DecoderSet]:
+        """None si el año no está registrado."""
+        return self._sets.get((packet_format, game_year))
+
+    def select(self, packet_format: int, game_year: int) -> DecoderSet:
+        ds = self.lookup(packet_format, game_year)
+        return self.default if ds is None else ds
+
+    @property
+    def known(self) -> list[str]:
+        return sorted({ds.name for ds in self._sets.values()})
+
+
+FORMATS = FormatRegistry(F1_25)
+FORMATS.register(F1_25)
+FORMATS.register(F1_24)
@@ -0,0 +1,169 @@
+"""
+Decoders angostos: leer sólo los campos que un consumidor usa.
+
+Un Layout nombra cada campo de un struct.Struct empaquetado ("<...", sin padding
+implícito) y sabe su offset. compile_reader(layout, campos) arma el lector mínimo:
+
+  - los campos pedidos se ordenan por offset y se agrupan en lecturas;
+  - campos contiguos van en un mismo formato ("<II" en vez de dos unpack);
+  - huecos chicos (<= max_gap bytes) se saltan con "x" dentro del mismo formato,
+    que es más barato que otra llamada a unpack_from;
+  - el resultado sale en el orden pedido (si coincide con el de offsets, sin
+    reordenar nada).
+
+  lap = Layout(LAPDATA, LAPDATA_FIELDS)
+  read = compile_reader(lap, ("car_pos", "lap_num")).unpack_from
+  pos, lap_num = read(payload, base)
+"""
+from __future__ import annotations
+
+import operator
+import re
+import struct
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+_TOKEN = re.compile(r"\s*(\d*)([xcbB?hHiIlLqQnNefdsp])")
+DEFAULT_MAX_GAP = 16
+
+
+def _expand(fmt: str) -> list[tuple[str, int, int]]:
+    """Formato empaquetado -> [(código, offset, tamaño)] por valor (los 'x' no son valores)."""
+    if not fmt or fmt[0] not in "<=!>":
+        raise ValueError(f"layout format must be packed with an explicit byte order: {fmt!r}")
+    order = fmt[0]
+    out: list[tuple[str, int, int]] = []
+    off = 0
+    pos = 1
+    while pos < len(fmt):
+        m = _TOKEN.match(fmt, pos)
+        if m is None:
+            raise ValueError(f"unsupported format {fmt!r} at {pos}")
+        count = int(m.group(1) or 1)
+        code = m.group(2)
+        pos = m.end()
+        if code == "x":
+            off += count
+        elif code in "sp":
+            out.append((f"{count}{code}", off, count))
+            off += count
+        else:
+            size = struct.calcsize(order + code)
+            for _ in range(count):
+                out.append((code, off, size))
+                off += size
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class Layout:
+    """Nombres + offsets de cada valor de un Struct empaquetado."""
+
+    st: struct.Struct
+    names: tuple[str, ...]
+    fields: dict[str, tuple[str, int, int]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        expanded = _expand(self.st.format)
+        if len(expanded) != len(self.names):
+            raise ValueError(f"layout {self.st.format!r} has {len(expanded)} values, got {len(self.names)} names")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("duplicate field names in layout")
+        object.__setattr__(self, "fields", dict(zip(self.names, expanded)))
+
+    @property
+    def size(self) -> int:
+        return self.st.size
+
+    @property
+    def order(self) -> str:
+        return self.st.format[0]
+
+    def field(self, name: str) -> tuple[str, int, int]:
+        """(código, offset, tamaño) de un campo."""
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise ValueError(f"unknown field {name!r}") from None
+
+    def offset(self, name: str) -> int:
+        return self.field(name)[1]
+
+    def reader(self, *names: str, max_gap: int = DEFAULT_MAX_GAP) -> "FieldReader":
+        return compile_reader(self, names, max_gap=max_gap)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldReader:
+    names: tuple[str, ...]
+    reads: tuple[tuple[int, struct.Struct], ...]   # (offset relativo al registro, Struct)
+    unpack_from: Callable[..., tuple]              # (buffer, base=0) -> valores en el orden de names
+
+    @property
+    def formats(self) -> tuple[str, ...]:
+        return tuple(s.format for _, s in self.reads)
+
+    @property
+    def span(self) -> int:
+        """Bytes desde el inicio del registro hasta el final del último campo leído."""
+        off, s = self.reads[-1]
+        return off + s.size
+
+
+def compile_reader(layout: Layout, names: Sequence[str], *, max_gap: int = DEFAULT_MAX_GAP) -> FieldReader:
+    names = tuple(names)
+    if not names:
+        raise ValueError("need at least one field")
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate fields: {names}")
+
+    by_off = sorted(names, key=layout.offset)
+    groups: list[tuple[int, list[str], int]] = []  # (offset inicial, formato, fin)
+    for name in by_off:
+        code, off, size = layout.field(name)
+        if groups and off - groups[-1][2] <= max_gap:
+            start, parts, end = groups[-1]
+            gap = off - end
+            if gap:
+                parts.append(f"{gap}x" if gap > 1 else "x")
+            parts.append(code)
+            groups[-1] = (start, parts, off + size)
+        else:
+            groups.append((off, [code], off + size))
+
+    order = layout.order
+    reads = tuple((start, struct.Struct(order + "".join(parts))) for start, parts, _ in groups)
+
+    # posición de cada campo pedido dentro de la tupla concatenada (orden por offset)
+    perm = [by_off.index(n) for n in names]
+    identity = perm == list(range(len(names)))
+    pick = None if identity else operator.itemgetter(*perm)
+
+    if len(reads) == 1:
+        (off0, s0), = reads
+        u0 = s0.unpack_from
+        if identity:
+            def unpack_from(buf, base: int = 0) -> tuple:
+                return u0(buf, base + off0)
+        else:
+            def unpack_from(buf, base: int = 0) -> tuple:
+                return pick(u0(buf, base + off0))
+    elif len(reads) == 2:
+        (off0, s0), (off1, s1) = reads
+        u0, u1 = s0.unpack_from, s1.unpack_from
+        if identity:
+            def unpack_from(buf, base: int = 0) -> tuple:
+                return u0(buf, base + off0) + u1(buf, base + off1)
+        else:
+            def unpack_from(buf, base: int = 0) -> tuple:
+                return pick(u0(buf, base + off0) + u1(buf, base + off1))
+    else:
+        bound = tuple((off, s.unpack_from) for off, s in reads)
+
+        def unpack_from(buf, base: int = 0) -> tuple:
+            vals: tuple = ()
+            for off, u in bound:
+                vals += u(buf, base + off)
+            return vals if pick is None else pick(vals)
+
+    return FieldReader(names, reads, unpack_from)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET
+
+
+class PacketIdFilter:
+    """
+    Allow-list por packet_id: lee el byte del header en su offset fijo, sin parsear
+    el header, y descarta antes de encolar. Cuenta descartes por packet_id.
+    """
+
+    __slots__ = ("allow", "dropped", "_table")
+
+    def __init__(self, allow: Iterable[int], dropped: Optional[list[int]] = None) -> None:
+        self.allow = frozenset(int(x) for x in allow if 0 <= int(x) < 256)
+        self._table = bytes(1 if i in self.allow else 0 for i in range(256))
+        # contadores por packet_id (se puede compartir la lista con RuntimeStats.drop_filter)
+        self.dropped = dropped if dropped is not None else [0] * 256
+
+    def allows(self, data: bytes) -> bool:
+        if len(data) <= PACKET_ID_OFFSET:
+            return True  # que el dispatcher lo cuente como header inválido
+        pid = data[PACKET_ID_OFFSET]
+        if self._table[pid]:
+            return True
+        self.dropped[pid] += 1
+        return False
+
+    @classmethod
+    def parse(cls, spec: str, dropped: Optional[list[int]] = None) -> "Optional[PacketIdFilter]":
+        """
+        "" => sin filtro (None)
+        "state" => los packet IDs que consume StateManager (incluye los de plugins)
+        "1,2,3,6,7,10" => lista explícita (se puede combinar: "state,3")
+        """
+        spec = (spec or "").strip()
+        if not spec:
+            return None
+
+        ids: set[int] = set()
+        for tok in spec.split(","):
+            tok = tok.strip().lower()
+            if not tok:
+                continue
+            if tok == "state":
+                from ingenierof125.state.manager import HANDLERS
+
+                ids.update(HANDLERS.packet_ids)
+                continue
+            try:
+                ids.add(int(tok))
+            except ValueError:
+                raise ValueError(f"packet_allow inválido: {tok!r} (usar enteros separados por coma o 'state')") from None
+        return cls(ids, dropped=dropped)
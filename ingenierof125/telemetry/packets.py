@@ -0,0 +1,492 @@
+"""
+Vistas de los paquetes F1 25 que decoders_lite no decodifica (Motion, Event,
+Participants, CarSetups, FinalClassification, LobbyInfo, SessionHistory, TyreSets,
+MotionEx, TimeTrial, LapPositions).
+
+Una vista no decodifica nada al armarse: guarda un memoryview del payload y cada campo
+se lee con su propio unpack_from recién cuando se pide. Armarla cuesta lo mismo sea
+cual sea el paquete, así que sumarlas no le cambia el costo al camino caliente.
+Cada campo es una property de una clase armada por spec/bloque al importar (sin
+__getattr__: un atributo que falla primero cuesta una AttributeError).
+
+  view = view_packet(payload)            # None si el id no tiene vista o el tamaño no da
+  view.header.session_time
+  view.cars[3].race_number               # Participants: un campo de un auto
+  view.cars[3].read("team_id", "name")   # varios con un lector compilado (narrow)
+  view.cars.column("world_position_x")   # Motion: un campo de los 22 autos
+  view.details.vehicle_idx               # Event: detalles según el código ("FTLP", ...)
+
+Tamaño: el paquete tiene que medir exactamente lo que dice el spec (los de otros años
+miden distinto). Cada spec se arma en orden desde el header y al importarse se verifica
+que cierre con el tamaño oficial.
+
+La vista vive lo que vive el buffer: con payloads de IngrecReader (slices sin copia) sólo
+vale mientras el reader está abierto.
+
+Como plugin de estado, guarda la última vista de cada paquete en state.extra[nombre]
+(los Event, los últimos EVENT_HISTORY en state.extra["events"]):
+  --state-plugins ingenierof125.telemetry.packets
+"""
+from __future__ import annotations
+
+import struct
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Union
+
+from ingenierof125.telemetry.decoders_lite import N_CARS, WHEELS
+from ingenierof125.telemetry.narrow import FieldReader, Layout
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET, PKT_HDR_SIZE, PacketHeader, parse_header
+
+if TYPE_CHECKING:
+    from ingenierof125.state.handlers import HandlerRegistry
+
+Getter = Callable[[Any, int], Any]  # (buffer, base) -> valor
+
+EVENT_HISTORY = 64
+
+
+def _wheels(prefix: str) -> tuple[str, ...]:
+    return tuple(f"{prefix}_{w.lower()}" for w in WHEELS)
+
+
+def _xyz(prefix: str) -> tuple[str, ...]:
+    return (f"{prefix}_x", f"{prefix}_y", f"{prefix}_z")
+
+
+def _cstr(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+def _getter(order: str, code: str, off: int) -> Getter:
+    u = struct.Struct(order + code).unpack_from
+    if code.endswith("s"):  # char[n] terminado en NUL
+        def get(buf, base: int) -> str:
+            return _cstr(u(buf, base + off)[0])
+    else:
+        def get(buf, base: int) -> Any:
+            return u(buf, base + off)[0]
+    return get
+
+
+def _record_property(order: str, code: str, off: int) -> property:
+    """Campo de un RecordView (offset relativo a self._base)."""
+    u = struct.Struct(order + code).unpack_from
+    if code.endswith("s"):
+        def fget(self) -> str:
+            return _cstr(u(self._buf, self._base + off)[0])
+    else:
+        def fget(self) -> Any:
+            return u(self._buf, self._base + off)[0]
+    return property(fget)
+
+
+def _packet_property(order: str, code: str, off: int) -> property:
+    """Campo suelto de un PacketView (offset absoluto)."""
+    u = struct.Struct(order + code).unpack_from
+    if code.endswith("s"):
+        def fget(self) -> str:
+            return _cstr(u(self.buf, off)[0])
+    else:
+        def fget(self) -> Any:
+            return u(self.buf, off)[0]
+    return property(fget)
+
+
+def _array_property(block: "Block") -> property:
+    def fget(self) -> ArrayView:
+        return ArrayView(self.buf, block)
+    return property(fget)
+
+
+@dataclass(frozen=True, slots=True)
+class Block:
+    """Un Layout en un offset del paquete: campos sueltos (count=None) o un array de registros."""
+
+    name: str
+    layout: Layout
+    offset: int
+    count: Optional[int] = None
+    getters: dict[str, Getter] = field(init=False, repr=False, compare=False)
+    record_cls: type["RecordView"] = field(init=False, repr=False, compare=False)
+    _readers: dict[tuple[str, ...], FieldReader] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        order = self.layout.order
+        fields = self.layout.fields.items()
+        object.__setattr__(self, "getters", {n: _getter(order, c, off) for n, (c, off, _) in fields})
+        attrs: dict[str, Any] = {n: _record_property(order, c, off) for n, (c, off, _) in fields}
+        attrs["__slots__"] = ()
+        object.__setattr__(self, "record_cls", type(f"{self.name}_record", (RecordView,), attrs))
+        object.__setattr__(self, "_readers", {})
+
+    @property
+    def size(self) -> int:
+        return self.layout.size * (1 if self.count is None else self.count)
+
+    def reader(self, names: tuple[str, ...]) -> FieldReader:
+        r = self._readers.get(names)
+        if r is None:
+            r = self._readers[names] = self.layout.reader(*names)
+        return r
+
+
+class RecordView:
+    """Un registro (un auto, una vuelta, ...) sobre el buffer: los campos se leen al pedirlos."""
+
+    __slots__ = ("_buf", "_base", "_block")
+
+    def __init__(self, buf: memoryview, base: int, block: Block) -> None:
+        self._buf = buf
+        self._base = base
+        self._block = block
+
+    def read(self, *names: str) -> tuple:
+        """Varios campos de una (lector compilado y cacheado por combinación de nombres; char[n] como bytes)."""
+        return self._block.reader(names).unpack_from(self._buf, self._base)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Todo el registro (un solo unpack; los char[n] quedan como bytes)."""
+        layout = self._block.layout
+        return dict(zip(layout.names, layout.st.unpack_from(self._buf, self._base)))
+
+    def __repr__(self) -> str:
+        return f"<{self._block.name} @{self._base}>"
+
+
+class ArrayView:
+    __slots__ = ("_buf", "_block")
+
+    def __init__(self, buf: memoryview, block: Block) -> None:
+        self._buf = buf
+        self._block = block
+
+    def __len__(self) -> int:
+        return self._block.count or 0
+
+    def __getitem__(self, i: int) -> RecordView:
+        n = self._block.count or 0
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"{self._block.name} index out of range: {i}")
+        b = self._block
+        return b.record_cls(self._buf, b.offset + i * b.layout.size, b)
+
+    def __iter__(self) -> Iterator[RecordView]:
+        b = self._block
+        cls, buf, step = b.record_cls, self._buf, b.layout.size
+        for i in range(len(self)):
+            yield cls(buf, b.offset + i * step, b)
+
+    def column(self, name: str) -> list[Any]:
+        """Un campo de todos los registros."""
+        b = self._block
+        try:
+            get = b.getters[name]
+        except KeyError:
+            raise ValueError(f"{b.name} has no field {name!r}") from None
+        buf, off, step = self._buf, b.offset, b.layout.size
+        return [get(buf, off + i * step) for i in range(len(self))]
+
+
+class PacketView:
+    """Paquete entero sobre un memoryview; campos sueltos como atributos, arrays como ArrayView."""
+
+    __slots__ = ("spec", "buf")
+
+    def __init__(self, spec: "PacketSpec", buf: memoryview) -> None:
+        self.spec = spec
+        self.buf = buf
+
+    @property
+    def header(self) -> PacketHeader:
+        return parse_header(self.buf)  # type: ignore[return-value]  # el tamaño ya se validó
+
+    def __repr__(self) -> str:
+        return f"<{self.spec.name} view, {len(self.buf)} bytes>"
+
+
+# Event: los detalles dependen del código (union de 12 bytes en el offset 33)
+EVENT_DETAILS_OFFSET = PKT_HDR_SIZE + 4
+
+
+def _event(code: str, fmt: str, names: tuple[str, ...]) -> tuple[str, Block]:
+    return code, Block(code, Layout(struct.Struct(fmt), names), EVENT_DETAILS_OFFSET)
+
+
+EVENT_DETAILS: dict[str, Block] = dict(
+    (
+        _event("FTLP", "<Bf", ("vehicle_idx", "lap_time")),
+        _event("RTMT", "<BB", ("vehicle_idx", "reason")),
+        _event("DRSD", "<B", ("reason",)),
+        _event("TMPT", "<B", ("vehicle_idx",)),
+        _event("RCWN", "<B", ("vehicle_idx",)),
+        _event(
+            "PENA",
+            "<7B",
+            ("penalty_type", "infringement_type", "vehicle_idx", "other_vehicle_idx", "time", "lap_num", "places_gained"),
+        ),
+        _event(
+            "SPTP",
+            "<BfBBBf",
+            (
+                "vehicle_idx", "speed", "is_overall_fastest_in_session", "is_driver_fastest_in_session",
+                "fastest_vehicle_idx_in_session", "fastest_speed_in_session",
+            ),
+        ),
+        _event("STLG", "<B", ("num_lights",)),
+        _event("DTSV", "<B", ("vehicle_idx",)),
+        _event("SGSV", "<B", ("vehicle_idx",)),
+        _event("FLBK", "<If", ("flashback_frame_identifier", "flashback_session_time")),
+        _event("BUTN", "<I", ("button_status",)),
+        _event("OVTK", "<BB", ("overtaking_vehicle_idx", "being_overtaken_vehicle_idx")),
+        _event("SCAR", "<BB", ("safety_car_type", "event_type")),
+        _event("COLL", "<BB", ("vehicle1_idx", "vehicle2_idx")),
+    )
+)
+
+
+class EventView(PacketView):
+    __slots__ = ()
+
+    @property
+    def details(self) -> Optional[RecordView]:
+        """Detalles del evento, o None si el código no trae (SSTA, SEND, LGOT, ...)."""
+        block = EVENT_DETAILS.get(self.code)
+        return None if block is None else block.record_cls(self.buf, block.offset, block)
+
+
+Part = Union[Layout, tuple[str, Layout, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class PacketSpec:
+    packet_id: int
+    name: str
+    size: int
+    blocks: tuple[Block, ...]
+    view_cls: type[PacketView] = PacketView
+    arrays: dict[str, Block] = field(init=False, repr=False, compare=False)
+    _cls: type[PacketView] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        attrs: dict[str, Any] = {"__slots__": ()}
+        arrays: dict[str, Block] = {}
+        for b in self.blocks:
+            if b.count is None:
+                order = b.layout.order
+                for n, (c, off, _) in b.layout.fields.items():
+                    attrs[n] = _packet_property(order, c, b.offset + off)
+            else:
+                arrays[b.name] = b
+                attrs[b.name] = _array_property(b)
+        object.__setattr__(self, "arrays", arrays)
+        object.__setattr__(self, "_cls", type(f"{self.name}_view", (self.view_cls,), attrs))
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Campos sueltos (los arrays están en self.arrays)."""
+        return tuple(n for b in self.blocks if b.count is None for n in b.layout.names)
+
+    def view(self, payload) -> Optional[PacketView]:
+        """Vista del payload, o None si no mide exactamente self.size."""
+        if len(payload) != self.size:
+            return None
+        return self._cls(self, memoryview(payload))
+
+
+def packet_spec(packet_id: int, name: str, size: int, *parts: Part, view_cls: type[PacketView] = PacketView) -> PacketSpec:
+    """
+    Spec con las partes en orden después del header: un Layout son campos sueltos,
+    (nombre, Layout, n) es un array. ValueError si no cierra con el tamaño oficial.
+    """
+    off = PKT_HDR_SIZE
+    blocks: list[Block] = []
+    seen: set[str] = set()
+    for i, part in enumerate(parts):
+        if isinstance(part, Layout):
+            block = Block(f"{name}[{i}]", part, off)
+            names = part.names
+        else:
+            arr_name, layout, count = part
+            block = Block(arr_name, layout, off, count)
+            names = (arr_name,)
+        if seen.intersection(names):
+            raise ValueError(f"{name}: duplicate fields {sorted(seen.intersection(names))}")
+        seen.update(names)
+        blocks.append(block)
+        off += block.size
+    if off != size:
+        raise ValueError(f"{name}: layout is {off} bytes, expected {size}")
+    return PacketSpec(packet_id, name, size, tuple(blocks), view_cls)
+
+
+def _layout(fmt: str, *names: str) -> Layout:
+    return Layout(struct.Struct(fmt), tuple(names))
+
+
+# --- F1 25 ---
+
+# CarMotionData (60 bytes)
+CAR_MOTION_LAYOUT = _layout(
+    "<6f6h6f",
+    *_xyz("world_position"), *_xyz("world_velocity"),
+    *_xyz("world_forward_dir"), *_xyz("world_right_dir"),
+    "g_force_lateral", "g_force_longitudinal", "g_force_vertical",
+    "yaw", "pitch", "roll",
+)
+
+# ParticipantData (57 bytes), liveryColours[4] como r/g/b
+PARTICIPANT_LAYOUT = _layout(
+    "<7B32sBBHBB12B",
+    "ai_controlled", "driver_id", "network_id", "team_id", "my_team", "race_number", "nationality",
+    "name", "your_telemetry", "show_online_names", "tech_level", "platform", "num_colours",
+    *(f"livery_{i}_{c}" for i in range(4) for c in "rgb"),
+)
+
+# CarSetupData (50 bytes)
+CAR_SETUP_LAYOUT = _layout(
+    "<4B4f9B4fBf",
+    "front_wing", "rear_wing", "on_throttle", "off_throttle",
+    "front_camber", "rear_camber", "front_toe", "rear_toe",
+    "front_suspension", "rear_suspension", "front_anti_roll_bar", "rear_anti_roll_bar",
+    "front_suspension_height", "rear_suspension_height", "brake_pressure", "brake_bias", "engine_braking",
+    *_wheels("tyre_pressure"),
+    "ballast", "fuel_load",
+)
+
+# FinalClassificationData (46 bytes)
+FINAL_CLASSIFICATION_LAYOUT = _layout(
+    "<7BId3B8B8B8B",
+    "position", "num_laps", "grid_position", "points", "num_pit_stops", "result_status", "result_reason",
+    "best_lap_time_ms", "total_race_time", "penalties_time", "num_penalties", "num_tyre_stints",
+    *(f"tyre_stints_actual_{i}" for i in range(8)),
+    *(f"tyre_stints_visual_{i}" for i in range(8)),
+    *(f"tyre_stints_end_laps_{i}" for i in range(8)),
+)
+
+# LobbyInfoData (42 bytes)
+LOBBY_INFO_LAYOUT = _layout(
+    "<4B32s3BHB",
+    "ai_controlled", "team_id", "nationality", "platform", "name",
+    "car_number", "your_telemetry", "show_online_names", "tech_level", "ready_status",
+)
+
+# SessionHistory: LapHistoryData (14 bytes) x 100, TyreStintHistoryData (3 bytes) x 8
+LAP_HISTORY_LAYOUT = _layout(
+    "<IHBHBHBB",
+    "lap_time_ms", "s1_ms", "s1_min", "s2_ms", "s2_min", "s3_ms", "s3_min", "lap_valid_bit_flags",
+)
+TYRE_STINT_LAYOUT = _layout("<3B", "end_lap", "tyre_actual_compound", "tyre_visual_compound")
+
+# TyreSetData (10 bytes) x 20
+TYRE_SET_LAYOUT = _layout(
+    "<7BhB",
+    "actual_tyre_compound", "visual_tyre_compound", "wear", "available", "recommended_session",
+    "life_span", "usable_life", "lap_delta_time", "fitted",
+)
+
+# MotionEx: sólo el auto del jugador
+MOTION_EX_LAYOUT = _layout(
+    "<61f",
+    *_wheels("suspension_position"), *_wheels("suspension_velocity"), *_wheels("suspension_acceleration"),
+    *_wheels("wheel_speed"), *_wheels("wheel_slip_ratio"), *_wheels("wheel_slip_angle"),
+    *_wheels("wheel_lat_force"), *_wheels("wheel_long_force"),
+    "height_of_cog_above_ground",
+    *_xyz("local_velocity"), *_xyz("angular_velocity"), *_xyz("angular_acceleration"),
+    "front_wheels_angle", *_wheels("wheel_vert_force"),
+    "front_aero_height", "rear_aero_height", "front_roll_angle", "rear_roll_angle",
+    "chassis_yaw", "chassis_pitch",
+    *_wheels("wheel_camber"), *_wheels("wheel_camber_gain"),
+)
+
+# TimeTrialDataSet (24 bytes) x 3: jugador (sesión), mejor personal, rival
+TIME_TRIAL_LAYOUT = _layout(
+    "<BB4I6B",
+    "car_idx", "team_id", "lap_time_ms", "s1_ms", "s2_ms", "s3_ms",
+    "traction_control", "gearbox_assist", "anti_lock_brakes", "equal_car_performance", "custom_setup", "valid",
+)
+
+# LapPositions: posición de cada auto al final de cada vuelta (50 x 22)
+LAP_POSITIONS_LAYOUT = _layout(f"<{N_CARS}B", *(f"car_{i}" for i in range(N_CARS)))
+
+
+MOTION = packet_spec(0, "motion", 1349, ("cars", CAR_MOTION_LAYOUT, N_CARS))
+EVENT = packet_spec(3, "event", 45, _layout("<4s12x", "code"), view_cls=EventView)
+PARTICIPANTS = packet_spec(4, "participants", 1284, _layout("<B", "num_active_cars"), ("cars", PARTICIPANT_LAYOUT, N_CARS))
+CAR_SETUPS = packet_spec(
+    5, "car_setups", 1133, ("cars", CAR_SETUP_LAYOUT, N_CARS), _layout("<f", "next_front_wing_value")
+)
+FINAL_CLASSIFICATION = packet_spec(
+    8, "final_classification", 1042, _layout("<B", "num_cars"), ("cars", FINAL_CLASSIFICATION_LAYOUT, N_CARS)
+)
+LOBBY_INFO = packet_spec(9, "lobby_info", 954, _layout("<B", "num_players"), ("cars", LOBBY_INFO_LAYOUT, N_CARS))
+SESSION_HISTORY = packet_spec(
+    11,
+    "session_history",
+    1460,
+    _layout(
+        "<7B",
+        "car_idx", "num_laps", "num_tyre_stints",
+        "best_lap_time_lap_num", "best_s1_lap_num", "best_s2_lap_num", "best_s3_lap_num",
+    ),
+    ("laps", LAP_HISTORY_LAYOUT, 100),
+    ("stints", TYRE_STINT_LAYOUT, 8),
+)
+TYRE_SETS = packet_spec(
+    12, "tyre_sets", 231, _layout("<B", "car_idx"), ("sets", TYRE_SET_LAYOUT, 20), _layout("<B", "fitted_idx")
+)
+MOTION_EX = packet_spec(13, "motion_ex", 273, MOTION_EX_LAYOUT)
+TIME_TRIAL = packet_spec(14, "time_trial", 101, ("sets", TIME_TRIAL_LAYOUT, 3))
+LAP_POSITIONS = packet_spec(
+    15, "lap_positions", 1131, _layout("<BB", "num_laps", "lap_start"), ("laps", LAP_POSITIONS_LAYOUT, 50)
+)
+
+# packet_id -> spec
+PACKET_SPECS: dict[int, PacketSpec] = {
+    s.packet_id: s
+    for s in (
+        MOTION, EVENT, PARTICIPANTS, CAR_SETUPS, FINAL_CLASSIFICATION, LOBBY_INFO,
+        SESSION_HISTORY, TYRE_SETS, MOTION_EX, TIME_TRIAL, LAP_POSITIONS,
+    )
+}
+
+
+def view_packet(payload) -> Optional[PacketView]:
+    """Vista según el packet_id del header; None si no hay spec o el tamaño no coincide."""
+    if len(payload) < PKT_HDR_SIZE:
+        return None
+    spec = PACKET_SPECS.get(payload[PACKET_ID_OFFSET])
+    return None if spec is None else spec.view(payload)
+
+
+# --- plugin de estado (--state-plugins ingenierof125.telemetry.packets) ---
+
+def _view_factory(spec: PacketSpec):
+    def factory(sm):
+        extra = sm.state.extra
+        make = spec.view
+        if spec.packet_id == EVENT.packet_id:
+            events = extra.setdefault("events", deque(maxlen=EVENT_HISTORY))
+
+            def handle(payload, t, idx, rx_ns) -> None:
+                v = make(payload)
+                if v is not None:
+                    events.append(v)
+        else:
+            key = spec.name
+
+            def handle(payload, t, idx, rx_ns) -> None:
+                v = make(payload)
+                if v is not None:
+                    extra[key] = v
+
+        return handle
+
+    return factory
+
+
+def register(registry: "HandlerRegistry") -> None:
+    for spec in PACKET_SPECS.values():
+        registry.register(spec.packet_id, _view_factory(spec), name=spec.name)
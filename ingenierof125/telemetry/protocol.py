@@ -1,11 +1,25 @@
 ﻿from __future__ import annotations
 
 import struct
-from dataclasses import dataclass
+from typing import NamedTuple, Optional
 
+# F1 25 header: 29 bytes, little-endian, packed
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+PKT_HDR_SIZE = PKT_HDR.size
+
+# Offset fijo de m_packetId en el header (<H + 4xB): se puede leer sin parsear el header
+PACKET_ID_OFFSET = 6
+
+
+class PacketHeader(NamedTuple):
+    """
+    Header parseado una sola vez (dispatcher) y pasado tal cual a estado/tools.
+
+    Es una tupla: se arma directo desde PKT_HDR.unpack_from sin copiar campos, y los
+    valores ya vienen con el tipo correcto (int / float del struct), sin coerciones.
+    Los loops calientes pueden indexar igual que con la tupla cruda (h[5] = packet_id).
+    """
 
-@dataclass(frozen=True, slots=True)
-class PacketHeader:
     packet_format: int
     game_year: int
     game_major_version: int
@@ -19,15 +33,17 @@ class PacketHeader:
     player_car_index: int
     secondary_player_car_index: int
 
-    # F1 25 header: 29 bytes, little-endian, packed
-    _STRUCT = struct.Struct("<HBBBBBQfIIBB")
-
     @staticmethod
     def try_parse(data: bytes) -> "PacketHeader | None":
-        if len(data) < PacketHeader._STRUCT.size:
-            return None
-        try:
-            pf, gy, gmaj, gmin, pver, pid, suid, st, frame, oframe, pci, spci = PacketHeader._STRUCT.unpack_from(data, 0)
-            return PacketHeader(pf, gy, gmaj, gmin, pver, pid, suid, st, frame, oframe, pci, spci)
-        except Exception:
-            return None
+        return parse_header(data)
+
+
+_unpack = PKT_HDR.unpack_from
+_new = tuple.__new__
+
+
+def parse_header(data: bytes) -> Optional[PacketHeader]:
+    """PacketHeader de un payload, o None si no llega a 29 bytes."""
+    if len(data) < PKT_HDR_SIZE:
+        return None
+    return _new(PacketHeader, _unpack(data, 0))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Iterable, TYPE_CHECKING
+
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET
+
+if TYPE_CHECKING:
+    from ingenierof125.core.stats import RuntimeStats
+
+# fifo: asyncio.Queue tal cual. conflate: latest-wins por packet ID (ver ConflatingQueue).
+# shed: con la cola llena desaloja primero los tipos de menor valor (ver SheddingQueue).
+QUEUE_POLICIES = ("fifo", "conflate", "shed")
+
+# Tipos donde el paquete nuevo deja obsoleto al anterior (estado "último valor").
+# Event(3), Participants, FinalClassification, SessionHistory (uno por auto), etc. quedan FIFO sin pérdida.
+CONFLATE_PACKET_IDS = frozenset({0, 1, 2, 6, 7, 10, 13, 15})
+
+
+# Clases de valor para load shedding (índice = clase)
+SHED_LOW, SHED_MID, SHED_HIGH = 0, 1, 2
+SHED_CLASS_NAMES = ("low", "mid", "high")
+
+# Session, LapData, Event, CarStatus, CarDamage: protegidos
+SHED_HIGH_IDS = frozenset({1, 2, 3, 7, 10})
+# CarTelemetry, Participants, FinalClassification, SessionHistory, TyreSets
+SHED_MID_IDS = frozenset({4, 6, 8, 11, 12})
+# el resto (Motion, CarSetups, LobbyInfo, MotionEx, TimeTrial, LapPositions, desconocidos): low
+
+
+def _payload_of(item: Any) -> "bytes | None":
+    """Payload de un item de la cola: (rx_ns, payload) o el payload suelto. None si no es un paquete."""
+    if type(item) is tuple and len(item) == 2:
+        item = item[1]
+    if isinstance(item, (bytes, bytearray, memoryview)) and len(item) > PACKET_ID_OFFSET:
+        return item  # type: ignore[return-value]
+    return None
+
+
+class _SlotRef:
+    __slots__ = ("pid",)
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+
+
+class ConflatingQueue(asyncio.Queue):
+    """
+    Cola latest-wins para el camino de estado.
+
+    - packet IDs conflatables: un slot por ID con el payload más nuevo. Si llega otro
+      antes de que el dispatcher lo saque, reemplaza al viejo (y se cuenta en conflated).
+    - el resto (Event, etc.) y cualquier item que no sea un paquete: FIFO sin pérdida.
+
+    El slot conserva la posición de llegada del primer payload pendiente, así que con
+    el dispatcher atrasado la profundidad queda acotada (<= 1 por ID conflatable) y la
+    latencia no crece con la cola.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        conflate_ids: Iterable[int] = CONFLATE_PACKET_IDS,
+        stats: "RuntimeStats | None" = None,
+    ) -> None:
+        ids = {int(x) for x in conflate_ids if 0 <= int(x) < 256}
+        self._conflate_table = bytes(1 if i in ids else 0 for i in range(256))
+        self._refs = [_SlotRef(i) for i in range(256)]
+        self._stats = stats
+        self.conflated = 0
+        super().__init__(maxsize)
+
+    # --- hooks de asyncio.Queue (mismo mecanismo que PriorityQueue/LifoQueue) ---
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: deque[Any] = deque()
+        self._slots: dict[int, Any] = {}
+
+    def _conflatable_pid(self, item: Any) -> int:
+        data = _payload_of(item)
+        if data is not None:
+            pid = data[PACKET_ID_OFFSET]
+            if self._conflate_table[pid]:
+                return pid
+        return -1
+
+    def _put(self, item: Any) -> None:
+        pid = self._conflatable_pid(item)
+        if pid < 0:
+            self._queue.append(item)
+            return
+        self._slots[pid] = item
+        self._queue.append(self._refs[pid])
+
+    def _get(self) -> Any:
+        entry = self._queue.popleft()
+        if type(entry) is _SlotRef:
+            return self._slots.pop(entry.pid)
+        return entry
+
+    def put_nowait(self, item: Any) -> None:
+        pid = self._conflatable_pid(item)
+        if pid >= 0 and pid in self._slots:
+            # ya hay uno pendiente de este ID: reemplazo en el lugar (no crece, no despierta a nadie)
+            self._slots[pid] = item
+            self.conflated += 1
+            if self._stats is not None:
+                self._stats.conflated += 1
+            return
+        super().put_nowait(item)
+
+
+class _Lanes:
+    """Un deque por clase; len() es el total (lo usan qsize/empty/full de asyncio.Queue)."""
+
+    __slots__ = ("lanes", "n")
+
+    def __init__(self) -> None:
+        self.lanes: tuple[deque[tuple[int, Any]], ...] = (deque(), deque(), deque())
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+
+class SheddingQueue(asyncio.Queue):
+    """
+    Cola acotada con shedding por prioridad de packet ID.
+
+    Con lugar se comporta como FIFO. Llena:
+      - si hay encolado algo de una clase menor que el entrante, se desaloja el más
+        viejo de la clase más baja y entra el nuevo;
+      - si no, se descarta el entrante (QueueFull, como una cola normal).
+    Los descartes se cuentan por clase (shed[low/mid/high]) y en RuntimeStats.shed_*.
+    Items que no son paquetes (sentinelas) cuentan como high.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        high_ids: Iterable[int] = SHED_HIGH_IDS,
+        mid_ids: Iterable[int] = SHED_MID_IDS,
+        stats: "RuntimeStats | None" = None,
+    ) -> None:
+        high = {int(x) for x in high_ids}
+        mid = {int(x) for x in mid_ids}
+        self._class_table = bytes(
+            SHED_HIGH if i in high else (SHED_MID if i in mid else SHED_LOW) for i in range(256)
+        )
+        self._stats = stats
+        self._seq = 0
+        self.shed = [0, 0, 0]
+        super().__init__(maxsize)
+
+    def _class_of(self, item: Any) -> int:
+        data = _payload_of(item)
+        if data is not None:
+            return self._class_table[data[PACKET_ID_OFFSET]]
+        return SHED_HIGH
+
+    def _count_shed(self, cls: int) -> None:
+        self.shed[cls] += 1
+        st = self._stats
+        if st is None:
+            return
+        if cls == SHED_LOW:
+            st.shed_low += 1
+        elif cls == SHED_MID:
+            st.shed_mid += 1
+        else:
+            st.shed_high += 1
+
+    # --- hooks de asyncio.Queue ---
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = _Lanes()  # type: ignore[assignment]
+
+    def _put(self, item: Any) -> None:
+        self._seq += 1
+        self._queue.lanes[self._class_of(item)].append((self._seq, item))
+        self._queue.n += 1
+
+    def _get(self) -> Any:
+        # FIFO global: la cabeza con menor secuencia entre las tres clases
+        best = None
+        for lane in self._queue.lanes:
+            if lane and (best is None or lane[0][0] < best[0][0]):
+                best = lane
+        self._queue.n -= 1
+        return best.popleft()[1]  # type: ignore[union-attr]
+
+    def put_nowait(self, item: Any) -> None:
+        if self.full():
+            cls = self._class_of(item)
+            lanes = self._queue.lanes
+            victim = next((c for c in range(cls) if lanes[c]), -1)
+            if victim < 0:
+                self._count_shed(cls)
+                raise asyncio.QueueFull
+            lanes[victim].popleft()
+            self._queue.n -= 1
+            # el desalojado nunca lo saca un consumidor: se cierra acá para que join() no se cuelgue
+            self.task_done()
+            self._count_shed(victim)
+        super().put_nowait(item)
+
+
+def make_dispatch_queue(policy: str, maxsize: int, stats: "RuntimeStats | None" = None) -> "asyncio.Queue[tuple[int, bytes]]":
+    policy = (policy or "fifo").strip().lower()
+    if policy == "fifo":
+        return asyncio.Queue(maxsize=maxsize)
+    if policy == "conflate":
+        return ConflatingQueue(maxsize, stats=stats)
+    if policy == "shed":
+        return SheddingQueue(maxsize, stats=stats)
+    raise ValueError(f"queue_policy inválida: {policy!r} (opciones: {', '.join(QUEUE_POLICIES)})")
@@ -0,0 +1,399 @@
+"""
+Generador sintético de paquetes F1 25 (sin grabaciones).
+
+Session, LapData, CarTelemetry, CarStatus y CarDamage para los 22 autos, armados con los
+mismos struct.Struct de decoders_lite (estructuralmente válidos: tamaños, offsets y
+rangos reales). Determinista por seed: los parámetros por auto salen del seed y los
+valores cuadro a cuadro son funciones suaves de la distancia recorrida.
+
+Escenarios (scripts con tiempo de sesión):
+  safety_car@120:60   SC desplegado a los 120 s durante 60 s (+10 s de "ending")
+  vsc@300:30          ídem con VSC
+  fuel_low@400:90     el margen de combustible del jugador cae a -0.5 vueltas en 90 s
+  wing_damage@200:45  alerón delantero izquierdo del jugador al 45%
+
+Uso:
+  python -m ingenierof125.telemetry.synthetic out.ingrec --seconds 600 --seed 3 \\
+      --scenario safety_car@120:60 --scenario fuel_low@300
+  python -m ingenierof125 --replay out.ingrec
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Optional
+
+from ingenierof125.telemetry.decoders_lite import (
+    CAR_DAMAGE,
+    CAR_STATUS,
+    CAR_TELEMETRY,
+    LAPDATA,
+    N_CARS,
+    PKT_HDR_SIZE,
+)
+from ingenierof125.telemetry.protocol import PKT_HDR
+
+SESSION_SIZE = 753
+LAPDATA_SIZE = PKT_HDR_SIZE + N_CARS * LAPDATA.size + 2
+TELEMETRY_SIZE = PKT_HDR_SIZE + N_CARS * CAR_TELEMETRY.size + 3
+STATUS_SIZE = PKT_HDR_SIZE + N_CARS * CAR_STATUS.size
+DAMAGE_SIZE = PKT_HDR_SIZE + N_CARS * CAR_DAMAGE.size
+
+# packet_id -> Hz (0 = tasa de envío, como en el juego)
+DEFAULT_RATES: Mapping[int, float] = {1: 2.0, 2: 0.0, 6: 0.0, 7: 0.0, 10: 10.0}
+
+# kind -> arg por defecto (duración en s, o % para el alerón)
+SCENARIOS: Mapping[str, float] = {"safety_car": 60.0, "vsc": 30.0, "fuel_low": 60.0, "wing_damage": 40.0}
+
+_SC_ENDING_S = 10.0
+_FUEL_BURN_KG = 1.6  # por vuelta
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    kind: str
+    at_s: float
+    arg: float
+
+    @staticmethod
+    def parse(spec: str) -> "Scenario":
+        """'kind@segundos[:arg]', p.ej. 'safety_car@120:60' o 'wing_damage@200'."""
+        kind, sep, rest = spec.strip().partition("@")
+        if not sep or kind not in SCENARIOS:
+            raise ValueError(f"bad scenario {spec!r} (expected kind@seconds[:arg], kinds: {', '.join(SCENARIOS)})")
+        at_s, _, arg = rest.partition(":")
+        try:
+            return Scenario(kind, float(at_s), float(arg) if arg else SCENARIOS[kind])
+        except ValueError:
+            raise ValueError(f"bad scenario {spec!r} (expected kind@seconds[:arg])") from None
+
+
+@dataclass(slots=True)
+class _Car:
+    pace_mps: float        # velocidad media en verde
+    phase: float           # desfase de las curvas de velocidad/temperaturas
+    dist: float            # distancia total (arranca detrás de la línea según la grilla)
+    fuel_margin: float     # vueltas de sobra con las que arranca
+    wear_rate: float       # % de desgaste por vuelta
+    grid: int
+    lap_start_t: float = 0.0
+    last_lap_ms: int = 0
+    lap_num: int = 1
+
+
+class SyntheticRace:
+    """
+    Carrera sintética de 22 autos.
+
+      race = SyntheticRace(seed=3, scenarios=[Scenario.parse("safety_car@120:60")])
+      for ts_ns, payload in race.packets(600): ...
+      race.write("out.ingrec", 600)
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int = 1,
+        send_hz: int = 60,
+        rates: Optional[Mapping[int, float]] = None,
+        scenarios: Iterable[Scenario] = (),
+        player_index: int = 0,
+        total_laps: int = 50,
+        track_length_m: int = 5000,
+        t0_ns: int = 1_700_000_000_000_000_000,
+    ) -> None:
+        if send_hz <= 0:
+            raise ValueError(f"send_hz must be > 0 (got {send_hz})")
+        if not (0 <= player_index < N_CARS):
+            raise ValueError(f"player_index out of range: {player_index}")
+        self.seed = seed
+        self.send_hz = int(send_hz)
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        for pid in self.rates:
+            if pid not in DEFAULT_RATES:
+                raise ValueError(f"packet id {pid} is not generated (supported: {sorted(DEFAULT_RATES)})")
+        self.scenarios = list(scenarios)
+        self.player_index = player_index
+        self.total_laps = total_laps
+        self.track_length_m = track_length_m
+        self.t0_ns = t0_ns
+
+        rng = random.Random(seed)
+        self.session_uid = rng.getrandbits(64)
+        lap_s = 90.0
+        self.cars = [
+            _Car(
+                pace_mps=track_length_m / (lap_s * (1.0 + rng.uniform(0.0, 0.02))),
+                phase=rng.uniform(0.0, 2 * math.pi),
+                dist=-8.0 * i,
+                fuel_margin=rng.uniform(2.6, 3.6),
+                wear_rate=rng.uniform(1.5, 2.5),
+                grid=i + 1,
+            )
+            for i in range(N_CARS)
+        ]
+        self._every = {pid: (1 if hz <= 0 else max(1, round(self.send_hz / hz))) for pid, hz in self.rates.items()}
+
+    # --- escenarios ---
+
+    def sc_status(self, t: float) -> int:
+        for s in self.scenarios:
+            if s.kind in ("safety_car", "vsc"):
+                if s.at_s <= t < s.at_s + s.arg:
+                    return 1 if s.kind == "safety_car" else 2
+                if s.at_s + s.arg <= t < s.at_s + s.arg + _SC_ENDING_S:
+                    return 4
+        return 0
+
+    def _fuel_drop(self, t: float, base: float) -> float:
+        # vueltas de margen perdidas por el escenario (rampa hasta -0.5)
+        for s in self.scenarios:
+            if s.kind == "fuel_low" and t >= s.at_s:
+                k = min(1.0, (t - s.at_s) / s.arg) if s.arg > 0 else 1.0
+                return k * (base + 0.5)
+        return 0.0
+
+    def _wing(self, t: float) -> int:
+        pct = 0.0
+        for s in self.scenarios:
+            if s.kind == "wing_damage" and t >= s.at_s:
+                pct = max(pct, s.arg)
+        return int(min(100.0, pct))
+
+    # --- paquetes ---
+
+    def _header(self, buf: bytearray, pid: int, t: float, frame: int) -> None:
+        PKT_HDR.pack_into(buf, 0, 2025, 25, 1, 0, 1, pid, self.session_uid, t, frame, frame, self.player_index, 255)
+
+    def _session(self, t: float, frame: int) -> bytes:
+        buf = bytearray(SESSION_SIZE)
+        self._header(buf, 1, t, frame)
+        off = PKT_HDR_SIZE
+        # weather, trackTemp, airTemp, totalLaps, trackLength, sessionType(15=carrera), trackId, formula
+        struct.pack_into("<BbbBHBbB", buf, off, 0, 32, 24, self.total_laps, self.track_length_m, 15, 10, 0)
+        off += 9
+        remaining = max(0, int(self.total_laps * 95 - t))
+        struct.pack_into("<HH", buf, off, remaining, self.total_laps * 95)
+        off += 4
+        # pitSpeedLimit, gamePaused, isSpectating, spectatorCarIndex, sliProNativeSupport, numMarshalZones
+        struct.pack_into("<6B", buf, off, 80, 0, 0, 255, 0, 21)
+        off += 6 + 21 * 5
+        buf[off] = self.sc_status(t)
+        off += 2  # + networkGame
+        buf[off] = 4  # numWeatherForecastSamples
+        off += 1
+        for i, minutes in enumerate((0, 5, 10, 15)):
+            # sessionType, timeOffset, weather, trackTemp, trackTempChange, airTemp, airTempChange, rain%
+            struct.pack_into("<BBBbbbbB", buf, off + i * 8, 15, minutes, 0, 32, 2, 24, 2, 5 + minutes)
+        return bytes(buf)
+
+    def _lap(self, t: float, frame: int, order: list[int]) -> bytes:
+        buf = bytearray(LAPDATA_SIZE)
+        self._header(buf, 2, t, frame)
+        L = self.track_length_m
+        leader = self.cars[order[0]]
+        pos_of = {ci: p + 1 for p, ci in enumerate(order)}
+        sc = self.sc_status(t)
+        pack = LAPDATA.pack_into
+        for i, c in enumerate(self.cars):
+            lap_dist = c.dist % L if c.dist >= 0 else c.dist
+            cur_ms = int(max(0.0, t - c.lap_start_t) * 1000)
+            sector = min(2, int((lap_dist if lap_dist > 0 else 0) * 3 // L))
+            gap_lead_ms = int(max(0.0, leader.dist - c.dist) / leader.pace_mps * 1000)
+            ahead = order[max(0, pos_of[i] - 2)]
+            gap_front_ms = int(max(0.0, self.cars[ahead].dist - c.dist) / c.pace_mps * 1000)
+            pack(
+                buf,
+                PKT_HDR_SIZE + i * LAPDATA.size,
+                c.last_lap_ms, cur_ms,
+                cur_ms % 60000 if sector > 0 else 0, 0,
+                0, 0,
+                gap_front_ms % 60000, gap_front_ms // 60000,
+                gap_lead_ms % 60000, gap_lead_ms // 60000,
+                float(lap_dist), float(c.dist), 0.0 if sc == 0 else 1.5,
+                pos_of[i], c.lap_num, 0, 0, sector, 0, 0, 0, 0, 0, 0, c.grid, 4, 2, 0,
+                0, 0, 0, 0.0, 255,
+            )
+        buf[-2] = 255
+        buf[-1] = 255
+        return bytes(buf)
+
+    def _speed(self, c: _Car, t: float) -> float:
+        # kph: media según pace, curvas a lo largo de la vuelta
+        x = (c.dist % self.track_length_m) / self.track_length_m
+        base = c.pace_mps * 3.6 * (0.6 if self.sc_status(t) in (1, 2) else 1.0)
+        return max(60.0, base * (1.0 + 0.35 * math.sin(2 * math.pi * 6 * x + c.phase)))
+
+    def _telemetry(self, t: float, frame: int) -> bytes:
+        buf = bytearray(TELEMETRY_SIZE)
+        self._header(buf, 6, t, frame)
+        pack = CAR_TELEMETRY.pack_into
+        for i, c in enumerate(self.cars):
+            kph = self._speed(c, t)
+            x = (c.dist % self.track_length_m) / self.track_length_m
+            accel = math.cos(2 * math.pi * 6 * x + c.phase)
+            throttle = min(1.0, max(0.0, 0.6 + 0.6 * accel))
+            brake = min(1.0, max(0.0, -0.8 * accel - 0.2))
+            gear = min(8, 1 + int(kph // 42))
+            rpm = 4000 + int((kph % 42) / 42 * 7500)
+            pack(
+                buf,
+                PKT_HDR_SIZE + i * CAR_TELEMETRY.size,
+                int(kph), throttle, 0.2 * math.sin(2 * math.pi * 6 * x), brake, 0, gear, rpm, 0, int(rpm / 120), 0,
+                500, 500, 520, 520,
+                95, 95, 98, 98,
+                100, 100, 102, 102,
+                105,
+                23.0, 23.0, 22.5, 22.5,
+                0, 0, 0, 0,
+            )
+        buf[-3] = 255
+        buf[-2] = 255
+        buf[-1] = 0
+        return bytes(buf)
+
+    def _status(self, t: float, frame: int) -> bytes:
+        buf = bytearray(STATUS_SIZE)
+        self._header(buf, 7, t, frame)
+        pack = CAR_STATUS.pack_into
+        L = self.track_length_m
+        for i, c in enumerate(self.cars):
+            laps_done = max(0.0, c.dist / L)
+            laps_to_go = max(0.0, self.total_laps - laps_done)
+            margin = c.fuel_margin
+            if i == self.player_index:
+                margin -= self._fuel_drop(t, c.fuel_margin)
+            fuel = max(0.0, _FUEL_BURN_KG * (laps_to_go + margin))
+            age = c.lap_num - 1
+            pack(
+                buf,
+                PKT_HDR_SIZE + i * CAR_STATUS.size,
+                1, 1, 1, 56, 0,
+                fuel, 110.0, margin,
+                12500, 4000,
+                8, 0, 0,
+                18, 17, age, 0,
+                560000.0, 120000.0, 3.0e6, 1,
+                0.0, 0.0, 0.0,
+                0,
+            )
+        return bytes(buf)
+
+    def _damage(self, t: float, frame: int) -> bytes:
+        buf = bytearray(DAMAGE_SIZE)
+        self._header(buf, 10, t, frame)
+        pack = CAR_DAMAGE.pack_into
+        L = self.track_length_m
+        wing = self._wing(t)
+        for i, c in enumerate(self.cars):
+            w = min(100.0, max(0.0, c.dist / L) * c.wear_rate)
+            fl = wing if i == self.player_index else 0
+            pack(
+                buf,
+                PKT_HDR_SIZE + i * CAR_DAMAGE.size,
+                w, w, w * 1.1, w * 1.1,
+                int(w), int(w), int(w * 1.1), int(w * 1.1),
+                0, 0, 0, 0,
+                0, 0, 0, 0,
+                fl, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                0, 0, 0, 0, 0, 0, 0, 0,
+            )
+        return bytes(buf)
+
+    def _advance(self, t: float, dt: float) -> None:
+        L = self.track_length_m
+        for c in self.cars:
+            if c.dist < 0:
+                c.dist += 20.0 * dt  # de la grilla a la línea
+                continue
+            c.dist += self._speed(c, t) / 3.6 * dt
+            lap = 1 + int(c.dist // L)
+            if lap != c.lap_num:
+                c.last_lap_ms = int((t - c.lap_start_t) * 1000)
+                c.lap_start_t = t
+                c.lap_num = lap
+
+    def packets(self, seconds: float) -> Iterator[tuple[int, bytes]]:
+        """(ts_ns, payload) en orden de frame; ts = t0 + session time (+20 µs por paquete)."""
+        dt = 1.0 / self.send_hz
+        every = self._every
+        for frame in range(int(seconds * self.send_hz)):
+            t = frame * dt
+            if frame:
+                self._advance(t, dt)
+            ts = self.t0_ns + int(t * 1e9)
+            k = 0
+            order: Optional[list[int]] = None
+            for pid in (1, 2, 6, 7, 10):
+                n = every.get(pid)
+                if n is None or frame % n:
+                    continue
+                if pid == 1:
+                    payload = self._session(t, frame)
+                elif pid == 2:
+                    order = order or sorted(range(N_CARS), key=lambda ci: -self.cars[ci].dist)
+                    payload = self._lap(t, frame, order)
+                elif pid == 6:
+                    payload = self._telemetry(t, frame)
+                elif pid == 7:
+                    payload = self._status(t, frame)
+                else:
+                    payload = self._damage(t, frame)
+                yield ts + k * 20_000, payload
+                k += 1
+
+    def write(self, path: str, seconds: float, *, fmt: str = "v2", codec: str = "zlib") -> int:
+        """Graba la carrera como .ingrec (para el replayer/batch). Devuelve los records escritos."""
+        from ingenierof125.ingest.ingrec import make_writer
+
+        n = 0
+        batch: list[tuple[int, bytes]] = []
+        with open(path, "wb") as f:
+            w = make_writer(f, fmt, codec=codec)
+            for rec in self.packets(seconds):
+                batch.append(rec)
+                if len(batch) >= 256:
+                    w.write_batch(batch)
+                    n += len(batch)
+                    batch = []
+            if batch:
+                w.write_batch(batch)
+                n += len(batch)
+            w.close()
+        return n
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m ingenierof125.telemetry.synthetic",
+        description="Write a synthetic 22-car F1 25 race as .ingrec",
+    )
+    ap.add_argument("out", help="Output .ingrec")
+    ap.add_argument("--seconds", type=float, default=300.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--send-hz", dest="send_hz", type=int, default=60)
+    ap.add_argument("--player", type=int, default=0, help="Player car index")
+    ap.add_argument("--scenario", action="append", default=[], help="kind@seconds[:arg] (repeatable)")
+    ap.add_argument("--format", dest="fmt", choices=("v1", "v2"), default="v2")
+    args = ap.parse_args(argv)
+
+    try:
+        race = SyntheticRace(
+            seed=args.seed,
+            send_hz=args.send_hz,
+            player_index=args.player,
+            scenarios=[Scenario.parse(s) for s in args.scenario],
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 2
+    n = race.write(args.out, args.seconds, fmt=args.fmt)
+    print(f"{args.out}: {n} packets, {args.seconds:.0f}s @ {args.send_hz} Hz, seed={args.seed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,25 +2,71 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import select
+import socket
+import threading
+import time
+from typing import Callable, Optional, TYPE_CHECKING
 
 from ingenierof125.core.stats import RuntimeStats
 
+if TYPE_CHECKING:
+    from ingenierof125.ingest.fanout import PacketFanout
+
 log = logging.getLogger("ingenierof125.udp")
 
+# "callback": un datagram_received por paquete (asyncio). "batch": hilo lector que drena el socket en lotes.
+UDP_MODES = ("callback", "batch")
+
+# F1 25: el paquete más grande ronda 1.4KB; 2KB por slot sobra
+_SLOT = 2048
+
+
+def kernel_drops(sock: socket.socket) -> Optional[int]:
+    """
+    Drops del kernel para este socket (buffer de recepción lleno).
+    Linux: columna 'drops' de /proc/net/udp{,6}. En otras plataformas devuelve None.
+    """
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+    except Exception:
+        return None
+    for path in ("/proc/net/udp", "/proc/net/udp6"):
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                next(f, None)  # encabezado
+                for line in f:
+                    cols = line.split()
+                    if len(cols) >= 13 and cols[9] == inode:
+                        return int(cols[12])
+        except (OSError, ValueError):
+            continue
+    return None
+
 
 class _Protocol(asyncio.DatagramProtocol):
-    def __init__(self, out_queue: "asyncio.Queue[bytes]", drop_when_full: bool, stats: RuntimeStats) -> None:
+    def __init__(
+        self,
+        out_queue: "asyncio.Queue[bytes] | None",
+        stats: RuntimeStats,
+        sink: "PacketFanout | None" = None,
+    ) -> None:
         self._out = out_queue
-        self._drop_when_full = drop_when_full
         self.stats = stats
+        self._sink = sink
 
     def datagram_received(self, data: bytes, addr) -> None:
+        rx_ns = time.perf_counter_ns()
         self.stats.udp_rx += 1
 
-        if self._drop_when_full and self._out.full():
-            self.stats.udp_dropq += 1
+        if self._sink is not None:
+            if not self._sink.publish(data, rx_ns):
+                self.stats.udp_dropq += 1
             return
 
+        # Sin chequeo previo de full(): put_nowait decide (una SheddingQueue puede desalojar
+        # algo de menor valor para hacerle lugar); si no entra, QueueFull => drop.
         try:
             self._out.put_nowait(data)
         except asyncio.QueueFull:
@@ -30,32 +76,197 @@ class _Protocol(asyncio.DatagramProtocol):
         log.error("UDP error_received: %s", exc)
 
 
+class _BatchReader(threading.Thread):
+    """
+    Hilo lector: espera con select() y drena el socket (no bloqueante) con recv_into
+    sobre un buffer prealocado de batch_max slots. Entrega el lote entero al loop
+    con un solo call_soon_threadsafe, como items (rx_ns, payload) estampados al
+    momento de cada recv (no al llegar el lote al loop).
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        loop: asyncio.AbstractEventLoop,
+        deliver: Callable[[list[tuple[int, bytes]]], None],
+        batch_max: int,
+    ) -> None:
+        super().__init__(name="udp-batch-reader", daemon=True)
+        self._sock = sock
+        self._loop = loop
+        self._deliver = deliver
+        self._batch_max = max(1, int(batch_max))
+        self._buf = bytearray(_SLOT * self._batch_max)
+        self._halt = threading.Event()
+
+    def halt(self) -> None:
+        self._halt.set()
+
+    def run(self) -> None:
+        sock = self._sock
+        view = memoryview(self._buf)
+        n_max = self._batch_max
+        lens: list[int] = []
+        stamps: list[int] = []
+        clock = time.perf_counter_ns
+
+        while not self._halt.is_set():
+            try:
+                readable, _, _ = select.select([sock], [], [], 0.2)
+            except (OSError, ValueError):
+                return  # socket cerrado
+            if not readable:
+                continue
+
+            lens.clear()
+            stamps.clear()
+            off = 0
+            while len(lens) < n_max:
+                try:
+                    n = sock.recv_into(view[off:off + _SLOT], _SLOT)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except ConnectionResetError:
+                    # Windows: ICMP port unreachable de un envío previo; se ignora
+                    continue
+                except OSError:
+                    self._halt.set()
+                    break
+                stamps.append(clock())
+                lens.append(n)
+                off += _SLOT
+
+            if not lens:
+                continue
+
+            batch = [(stamps[i], bytes(view[i * _SLOT:i * _SLOT + n])) for i, n in enumerate(lens)]
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, batch)
+            except RuntimeError:
+                return  # loop cerrado
+
+
 class UdpListener:
     def __init__(
         self,
         host: str,
         port: int,
-        out_queue: "asyncio.Queue[bytes]",
-        drop_when_full: bool,
+        out_queue: "asyncio.Queue[bytes] | None",
         stats: RuntimeStats,
+        *,
+        sink: "PacketFanout | None" = None,
+        mode: str = "callback",
+        batch_max: int = 256,
+        rcvbuf: int = 0,
+        kernel_poll_s: float = 1.0,
     ) -> None:
+        if mode not in UDP_MODES:
+            raise ValueError(f"UdpListener mode inválido: {mode!r} (opciones: {', '.join(UDP_MODES)})")
+        if out_queue is None and sink is None:
+            raise ValueError("UdpListener necesita out_queue o sink")
         self.host = host
         self.port = port
+        self.mode = mode
+        self.local_addr: Optional[tuple] = None
         self._out = out_queue
-        self._drop_when_full = drop_when_full
+        self._sink = sink
         self._stats = stats
+        self._batch_max = max(1, int(batch_max))
+        self._rcvbuf = max(0, int(rcvbuf))
+        self._kernel_poll_s = float(kernel_poll_s)
         self._stop = asyncio.Event()
 
     async def run(self) -> None:
+        if self.mode == "batch":
+            await self._run_batch()
+        else:
+            await self._run_callback()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def _run_callback(self) -> None:
         loop = asyncio.get_running_loop()
         transport, _ = await loop.create_datagram_endpoint(
-            lambda: _Protocol(self._out, self._drop_when_full, self._stats),
+            lambda: _Protocol(self._out, self._stats, self._sink),
             local_addr=(self.host, self.port),
         )
         try:
-            await self._stop.wait()
+            sock = transport.get_extra_info("socket")
+            if sock is not None:
+                self._tune(sock)
+                self.local_addr = sock.getsockname()
+            await self._wait_stop(sock)
         finally:
             transport.close()
 
-    def stop(self) -> None:
-        self._stop.set()
\ No newline at end of file
+    async def _run_batch(self) -> None:
+        loop = asyncio.get_running_loop()
+        # familia según el host (IPv4/IPv6), como create_datagram_endpoint en modo callback
+        family, type_, proto, _, addr = (
+            await loop.getaddrinfo(self.host or None, self.port, type=socket.SOCK_DGRAM, flags=socket.AI_PASSIVE)
+        )[0]
+        sock = socket.socket(family, type_, proto)
+        try:
+            self._tune(sock)
+            sock.bind(addr)
+            sock.setblocking(False)
+            self.local_addr = sock.getsockname()
+
+            reader = _BatchReader(sock, loop, self._deliver_batch, self._batch_max)
+            reader.start()
+            log.info("UDP batch reader on %s:%s (batch_max=%s)", self.host, self.port, self._batch_max)
+            try:
+                await self._wait_stop(sock)
+            finally:
+                reader.halt()
+                await asyncio.to_thread(reader.join, 1.0)
+        finally:
+            sock.close()
+
+    def _tune(self, sock: socket.socket) -> None:
+        if self._rcvbuf > 0:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._rcvbuf)
+            except OSError:
+                log.warning("Could not set SO_RCVBUF=%s", self._rcvbuf)
+
+    def _deliver_batch(self, batch: list[tuple[int, bytes]]) -> None:
+        # Corre en el loop: mismo contrato que _Protocol, pero un callback por lote
+        st = self._stats
+        st.udp_rx += len(batch)
+        st.udp_batches += 1
+
+        if self._sink is not None:
+            st.udp_dropq += self._sink.publish_batch(batch)
+            return
+
+        # out_queue directo (sin fanout): payload suelto, como en modo callback
+        put = self._out.put_nowait  # type: ignore[union-attr]
+        for _, data in batch:
+            try:
+                put(data)
+            except asyncio.QueueFull:
+                st.udp_dropq += 1
+
+    async def _poll_kernel_drops(self, sock: Optional[socket.socket]) -> None:
+        if sock is None:
+            return
+        # leer /proc/net/udp{,6} es I/O de archivo (y crece con los sockets): fuera del loop
+        n = await asyncio.to_thread(kernel_drops, sock)
+        if n is not None:
+            # contador propio del socket (arranca en 0 al crearlo)
+            self._stats.udp_dropk = n
+
+    async def _wait_stop(self, sock: Optional[socket.socket]) -> None:
+        if self._kernel_poll_s <= 0:
+            await self._stop.wait()
+            return
+
+        await self._poll_kernel_drops(sock)
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self._kernel_poll_s)
+            except asyncio.TimeoutError:
+                pass
+            await self._poll_kernel_drops(sock)
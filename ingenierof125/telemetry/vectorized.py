@@ -0,0 +1,113 @@
+"""
+Decodificación de los 22 autos de un paquete con NumPy (opcional).
+
+Los dtypes estructurados se arman de los mismos Layout que usan los decoders del
+jugador (LAPDATA, CAR_TELEMETRY, CAR_STATUS, CAR_DAMAGE): mismos nombres de campo,
+mismos offsets. Un paquete entero es un np.frombuffer de 22 filas sobre el payload,
+sin copiar y sin trabajo por auto en Python:
+
+  laps = decode_lap_all(payload)          # ndarray (22,) o None si el paquete es corto
+  laps["car_pos"], laps["lap_num"]        # columnas
+  status = decode_status_all(payload)
+  status["fuel_remaining_laps"][rivals]
+
+El array es una vista de sólo lectura sobre el payload (vive lo que vive el payload);
+.copy() si hay que modificarlo. Sin numpy instalado el módulo importa igual
+(HAVE_NUMPY = False) y las funciones levantan ImportError.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from ingenierof125.telemetry.decoders_lite import (
+    CAR_DAMAGE_LAYOUT,
+    CAR_STATUS_LAYOUT,
+    CAR_TELEMETRY_LAYOUT,
+    LAPDATA_LAYOUT,
+    N_CARS,
+    PKT_HDR_SIZE,
+)
+from ingenierof125.telemetry.narrow import Layout
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import numpy
+
+HAVE_NUMPY = np is not None
+
+_NP_CODES = {
+    "?": "?",
+    "b": "i1",
+    "B": "u1",
+    "h": "i2",
+    "H": "u2",
+    "i": "i4",
+    "I": "u4",
+    "l": "i4",
+    "L": "u4",
+    "q": "i8",
+    "Q": "u8",
+    "e": "f2",
+    "f": "f4",
+    "d": "f8",
+}
+
+
+def _require() -> None:
+    if np is None:
+        raise ImportError("numpy is required for all-car decoding (pip install numpy)")
+
+
+def layout_dtype(layout: Layout) -> "numpy.dtype":
+    """dtype estructurado equivalente a un Layout (mismos nombres y offsets, itemsize = Struct.size)."""
+    _require()
+    order = "<" if layout.order in "<=" else ">"
+    formats: list[str] = []
+    offsets: list[int] = []
+    for name in layout.names:
+        code, off, size = layout.field(name)
+        if code.endswith("s"):
+            formats.append(f"S{size}")
+        elif code in _NP_CODES:
+            formats.append(order + _NP_CODES[code])
+        else:
+            raise ValueError(f"field {name!r}: struct code {code!r} has no numpy equivalent")
+        offsets.append(off)
+    return np.dtype({"names": list(layout.names), "formats": formats, "offsets": offsets, "itemsize": layout.size})
+
+
+if HAVE_NUMPY:
+    LAPDATA_DTYPE = layout_dtype(LAPDATA_LAYOUT)
+    CAR_TELEMETRY_DTYPE = layout_dtype(CAR_TELEMETRY_LAYOUT)
+    CAR_STATUS_DTYPE = layout_dtype(CAR_STATUS_LAYOUT)
+    CAR_DAMAGE_DTYPE = layout_dtype(CAR_DAMAGE_LAYOUT)
+else:
+    LAPDATA_DTYPE = CAR_TELEMETRY_DTYPE = CAR_STATUS_DTYPE = CAR_DAMAGE_DTYPE = None
+
+
+def decode_cars(payload: Any, dtype: "numpy.dtype") -> "Optional[numpy.ndarray]":
+    """Los 22 registros después del header como array estructurado (None si el paquete es corto)."""
+    _require()
+    if len(payload) < PKT_HDR_SIZE + N_CARS * dtype.itemsize:
+        return None
+    return np.frombuffer(payload, dtype=dtype, count=N_CARS, offset=PKT_HDR_SIZE)
+
+
+def decode_lap_all(payload: Any) -> "Optional[numpy.ndarray]":
+    return decode_cars(payload, LAPDATA_DTYPE)
+
+
+def decode_telemetry_all(payload: Any) -> "Optional[numpy.ndarray]":
+    return decode_cars(payload, CAR_TELEMETRY_DTYPE)
+
+
+def decode_status_all(payload: Any) -> "Optional[numpy.ndarray]":
+    return decode_cars(payload, CAR_STATUS_DTYPE)
+
+
+def decode_damage_all(payload: Any) -> "Optional[numpy.ndarray]":
+    return decode_cars(payload, CAR_DAMAGE_DTYPE)
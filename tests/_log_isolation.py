@@ -0,0 +1,25 @@
+"""
+setUpModule/tearDownModule para módulos de test que loguean.
+
+test_logging_setup mockea el FileHandler y setup_logging lo deja colgado del root logger;
+cualquier log posterior revienta comparando record.levelno con un MagicMock. Los módulos
+que loguean lo importan y corren con el root logger limpio:
+
+  from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+"""
+import logging
+
+_saved: list[tuple[list, int]] = []
+
+
+def setUpModule() -> None:
+    root = logging.getLogger()
+    _saved.append((root.handlers[:], root.level))
+    root.handlers[:] = [h for h in root.handlers if isinstance(h, logging.Handler)]
+
+
+def tearDownModule() -> None:
+    root = logging.getLogger()
+    handlers, level = _saved.pop()
+    root.handlers[:] = handlers
+    root.setLevel(level)
@@ -0,0 +1,210 @@
+import asyncio
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.ingest.ingrec import IngrecReader
+from ingenierof125.ingest.recorder import PacketRecorder
+from ingenierof125.telemetry.dispatcher import PacketDispatcher
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def make_packet(packet_id: int, frame: int) -> bytes:
+    return PKT_HDR.pack(2025, 25, 1, 0, 1, packet_id, 1, float(frame) / 60.0, frame, frame, 0, 255) + b"\x00" * 16
+
+
+class TestDispatcherBatchDrain(unittest.IsolatedAsyncioTestCase):
+    async def test_drains_backlog_in_batches(self):
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=100)
+        for i in range(50):
+            q.put_nowait(make_packet(0, i))
+
+        disp = PacketDispatcher(2025, 25, stats=stats, batch_max=16)
+        task = asyncio.create_task(disp.run(q))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(stats.dispatched_in, 50)
+        # 50 paquetes con lotes de 16 => 4 lotes
+        self.assertEqual(stats.disp_batches, 4)
+
+        disp.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    async def test_stop_wakes_idle_dispatcher(self):
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=10)
+        disp = PacketDispatcher(2025, 25)
+        task = asyncio.create_task(disp.run(q))
+        await asyncio.sleep(0.01)
+        disp.stop()
+        await asyncio.wait_for(task, timeout=0.2)
+
+    async def test_stop_with_full_queue(self):
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=4)
+        for i in range(4):
+            q.put_nowait(make_packet(0, i))
+        disp = PacketDispatcher(2025, 25, stats=stats)
+        disp.stop()  # antes de arrancar, cola llena
+        await asyncio.wait_for(disp.run(q), timeout=0.2)
+
+
+class TestRecorderBatchDrain(unittest.IsolatedAsyncioTestCase):
+    async def test_records_and_stops_via_event(self):
+        with tempfile.TemporaryDirectory() as d:
+            stats = RuntimeStats()
+            rec = PacketRecorder(out_dir=d, enabled=True, queue_maxsize=64, flush_every=1000, stats=stats)
+            stop_evt = asyncio.Event()
+            task = asyncio.create_task(rec.run(stop_evt))
+            await asyncio.sleep(0.01)
+
+            for i in range(10):
+                rec.try_enqueue(make_packet(6, i))
+            await asyncio.sleep(0.01)
+
+            stop_evt.set()
+            await asyncio.wait_for(task, timeout=1.0)
+
+            self.assertEqual(rec.stats.written, 10)
+            self.assertEqual(stats.rec_written, 10)
+            self.assertGreater(Path(rec.stats.last_path).stat().st_size, 10 * len(make_packet(6, 0)))
+
+    async def test_time_based_flush_when_idle(self):
+        with tempfile.TemporaryDirectory() as d:
+            rec = PacketRecorder(out_dir=d, enabled=True, flush_every=1000, flush_interval_s=0.02)
+            task = asyncio.create_task(rec.run())
+            await asyncio.sleep(0.01)
+
+            rec.try_enqueue(make_packet(6, 1))
+            await asyncio.sleep(0.1)
+            self.assertEqual(rec.stats.written, 1)  # bajó sin esperar a stop ni a flush_every
+
+            rec.stop()
+            await asyncio.wait_for(task, timeout=1.0)
+
+
+class TestRecorderWriterThread(unittest.IsolatedAsyncioTestCase):
+    async def _record(self, d: str, batches: int, **kw) -> PacketRecorder:
+        stats = RuntimeStats()
+        rec = PacketRecorder(out_dir=d, enabled=True, flush_every=4, stats=stats, **kw)
+        task = asyncio.create_task(rec.run())
+        await asyncio.sleep(0.01)
+        for b in range(batches):
+            for i in range(4):
+                rec.try_enqueue(make_packet(6, b * 4 + i))
+            await asyncio.sleep(0.01)
+        rec.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+        return rec
+
+    async def test_one_write_per_batch_and_metrics(self):
+        with tempfile.TemporaryDirectory() as d:
+            rec = await self._record(d, 3)
+            size = Path(rec.stats.last_path).stat().st_size
+
+            self.assertEqual(rec.stats.written, 12)
+            self.assertEqual(rec.stats.flushes, 3)
+            self.assertEqual(rec.stats.bytes_written, size - 10)  # todo menos el header del archivo
+            self.assertEqual(rec.flush_latency.n, 3)
+            self.assertEqual(rec.stats.fsyncs, 1)  # fsync_s=0: sólo al cerrar
+
+    async def test_group_commit_fsync(self):
+        with tempfile.TemporaryDirectory() as d:
+            rec = await self._record(d, 3, fsync_s=1e-6)
+            self.assertGreaterEqual(rec.stats.fsyncs, 3)
+
+    async def test_write_errors_count_as_drops(self):
+        failing = {"on": False}
+
+        class _DiskFull:
+            def __init__(self, f):
+                self._f = f
+
+            def write(self, data):
+                if failing["on"]:
+                    raise OSError(28, "No space left on device")
+                return self._f.write(data)
+
+            def __getattr__(self, name):
+                return getattr(self._f, name)
+
+        real_open = open
+
+        def fake_open(path, mode="r", *a, **kw):
+            return _DiskFull(real_open(path, mode, *a, **kw))
+
+        with tempfile.TemporaryDirectory() as d, mock.patch("ingenierof125.ingest.recorder.open", fake_open, create=True):
+            stats = RuntimeStats()
+            rec = PacketRecorder(out_dir=d, enabled=True, flush_every=4, stats=stats)
+            task = asyncio.create_task(rec.run())
+            await asyncio.sleep(0.01)
+            with self.assertLogs("ingenierof125.recorder", level="WARNING") as cm:
+                for b in range(5):
+                    failing["on"] = b < 3
+                    for i in range(4):
+                        rec.try_enqueue(make_packet(6, b * 4 + i))
+                    await asyncio.sleep(0.02)
+                rec.stop()
+                await asyncio.wait_for(task, timeout=1.0)
+
+        self.assertEqual(rec.stats.write_errors, 3)
+        self.assertEqual((rec.stats.dropped, stats.rec_drop), (12, 12))
+        self.assertEqual(rec.stats.written, 8)
+        self.assertEqual([r.levelname for r in cm.records], ["ERROR", "WARNING"])  # uno por racha + recuperación
+        self.assertIn("12 dropped", cm.output[1])
+
+    async def test_v2_partial_write_rolls_back_to_last_block(self):
+        # v2, un bloque por lote; el write fallido deja medio bloque en el archivo
+        failing = {"on": False}
+
+        class _ShortWrite:
+            def __init__(self, f):
+                self._f = f
+
+            def write(self, data):
+                if failing["on"]:
+                    self._f.write(bytes(data[: len(data) // 2]))
+                    raise OSError(28, "No space left on device")
+                return self._f.write(data)
+
+            def __getattr__(self, name):
+                return getattr(self._f, name)
+
+        real_open = open
+
+        def fake_open(path, mode="r", *a, **kw):
+            return _ShortWrite(real_open(path, mode, *a, **kw))
+
+        sent = {}
+        with tempfile.TemporaryDirectory() as d:
+            with mock.patch("ingenierof125.ingest.recorder.open", fake_open, create=True):
+                stats = RuntimeStats()
+                rec = PacketRecorder(out_dir=d, enabled=True, flush_every=4, stats=stats, fmt="v2", block_max_s=0.0)
+                task = asyncio.create_task(rec.run())
+                await asyncio.sleep(0.01)
+                with self.assertLogs("ingenierof125.recorder", level="WARNING"):
+                    for b in range(5):
+                        failing["on"] = b in (1, 2)
+                        sent[b] = [make_packet(6, b * 4 + i) for i in range(4)]
+                        for p in sent[b]:
+                            rec.try_enqueue(p)
+                        await asyncio.sleep(0.02)
+                    rec.stop()
+                    await asyncio.wait_for(task, timeout=1.0)
+
+            with IngrecReader(rec.stats.last_path) as r:
+                on_disk = [bytes(p) for _, p in r]
+                self.assertEqual(r.n_records, len(on_disk))  # índice del footer consistente con los bloques
+
+        self.assertEqual(on_disk, sent[0] + sent[3] + sent[4])
+        self.assertEqual((rec.stats.written, rec.stats.dropped), (12, 8))
+        self.assertEqual(rec.stats.written + rec.stats.dropped, 20)
+        self.assertEqual((stats.rec_written, stats.rec_drop), (12, 8))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
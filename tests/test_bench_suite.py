@@ -0,0 +1,33 @@
+import unittest
+
+from bench.bench_suite import BenchResult, check_budgets, report, run
+
+
+class TestBenchSuite(unittest.TestCase):
+    def test_budgets_flag_regressions_only(self):
+        results = [BenchResult("decode.lap", 1000, 0.01), BenchResult("pipeline", 1000, 0.5)]
+        budgets = {
+            "decode.lap": {"max_ns_per_op": 20000},   # 10 µs/op: ok
+            "pipeline": {"min_ops_s": 5000},          # 2000 ops/s: falla
+            "recorder.write": {"min_ops_s": 1e9},     # no corrió: se ignora
+        }
+        failures = check_budgets(results, budgets)
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0].startswith("pipeline:"))
+
+    def test_run_subset_reports_json_ready_results(self):
+        results = run(seconds=0.5, repeat=1, only="decode.")
+        self.assertEqual(
+            [r.name for r in results],
+            ["decode.session", "decode.lap", "decode.telemetry", "decode.status", "decode.damage"],
+        )
+        rep = report(results, [], seconds=0.5, repeat=1)
+        self.assertEqual(rep["meta"]["race_seconds"], 0.5)
+        for r in rep["results"]:
+            self.assertGreater(r["ops"], 0)
+            self.assertGreater(r["ops_s"], 0.0)
+            self.assertIn("mb_s", r)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
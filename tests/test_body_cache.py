@@ -0,0 +1,84 @@
+import struct
+import unittest
+
+from ingenierof125.state.manager import BODY_CACHE_IDS, StateManager, parse_body_cache_ids
+from ingenierof125.telemetry.synthetic import SyntheticRace
+
+# session_time en el header (offset 15)
+_ST = struct.Struct("<f")
+
+
+def _restamp(payload: bytes, session_time: float) -> bytes:
+    b = bytearray(payload)
+    _ST.pack_into(b, 15, session_time)
+    return bytes(b)
+
+
+class TestBodyCache(unittest.TestCase):
+    def setUp(self) -> None:
+        pkts = [p for _, p in SyntheticRace(seed=3).packets(2.0)]
+        self.session = next(p for p in pkts if p[6] == 1)
+        self.damage = next(p for p in pkts if p[6] == 10)
+
+    def test_identical_body_reuses_value_and_updates_time(self) -> None:
+        sm = StateManager()
+        sm.apply_packet(10, self.damage, 1.0, 0, rx_ns=100)
+        v = sm.state.damage.value
+        self.assertIsNotNone(v)
+
+        sm.apply_packet(10, _restamp(self.damage, 2.0), 2.0, 0, rx_ns=200)
+        self.assertIs(sm.state.damage.value, v)
+        self.assertEqual(sm.state.damage.t, 2.0)
+        self.assertEqual(sm.state.damage.rx_ns, 200)
+        self.assertEqual((sm.body_cache[10].hits, sm.body_cache[10].misses), (1, 1))
+        self.assertEqual(sm.format_body_cache(), "1=0% 10=50%")
+
+    def test_changed_body_is_decoded(self) -> None:
+        sm = StateManager()
+        sm.apply_packet(10, self.damage, 1.0, 0)
+        b = bytearray(self.damage)
+        b[-1] ^= 0xFF
+        sm.apply_packet(10, bytes(b), 2.0, 0)
+        self.assertEqual(sm.body_cache[10].hits, 0)
+        self.assertEqual(sm.body_cache[10].misses, 2)
+
+    def test_player_change_is_a_miss(self) -> None:
+        sm = StateManager()
+        sm.apply_packet(10, self.damage, 1.0, 0)
+        sm.apply_packet(10, self.damage, 2.0, 5)
+        self.assertEqual(sm.body_cache[10].hits, 0)
+
+    def test_memoryview_payload(self) -> None:
+        sm = StateManager()
+        sm.apply_packet(1, memoryview(self.session), 1.0, 0)
+        sm.apply_packet(1, memoryview(self.session), 1.5, 0)
+        self.assertEqual(sm.body_cache[1].hits, 1)
+        self.assertEqual(sm.state.session.t, 1.5)
+
+    def test_disabled(self) -> None:
+        sm = StateManager(body_cache_ids=())
+        sm.apply_packet(10, self.damage, 1.0, 0)
+        v = sm.state.damage.value
+        sm.apply_packet(10, self.damage, 2.0, 0)
+        self.assertIsNot(sm.state.damage.value, v)
+        self.assertEqual(sm.state.damage.value, v)
+        self.assertEqual(sm.format_body_cache(), "")
+
+
+class TestParseBodyCacheIds(unittest.TestCase):
+    def test_parse(self) -> None:
+        self.assertEqual(parse_body_cache_ids("1,10"), BODY_CACHE_IDS)
+        self.assertEqual(parse_body_cache_ids("off"), ())
+        self.assertEqual(parse_body_cache_ids(""), ())
+        self.assertEqual(parse_body_cache_ids("state"), (1, 2, 6, 7, 10))
+        self.assertEqual(parse_body_cache_ids(" 10 , 1 "), (1, 10))
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_body_cache_ids("3")
+        with self.assertRaises(ValueError):
+            parse_body_cache_ids("x")
+
+
+if __name__ == "__main__":
+    unittest.main()
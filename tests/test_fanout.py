@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from ingenierof125.ingest.fanout import PacketFanout
+from ingenierof125.ingest.recorder import PacketRecorder
+
+
+class TestPacketFanout(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_independent_backpressure(self):
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=2)
+        rec = PacketRecorder(enabled=True, queue_maxsize=10)
+        fan = PacketFanout(q, recorder=rec)
+
+        self.assertTrue(fan.publish(b"a"))
+        self.assertTrue(fan.publish(b"b"))
+        self.assertFalse(fan.publish(b"c"))  # dispatcher lleno
+
+        # el recorder recibió todo igual
+        self.assertEqual(rec.stats.enqueued, 3)
+        self.assertEqual(q.qsize(), 2)
+
+    async def test_publish_batch_counts_drops(self):
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=3)
+        fan = PacketFanout(q)
+        dropped = fan.publish_batch([(i, d) for i, d in enumerate([b"1", b"2", b"3", b"4", b"5"], 1)])
+        self.assertEqual(dropped, 2)
+        self.assertEqual([q.get_nowait() for _ in range(3)], [(1, b"1"), (2, b"2"), (3, b"3")])
+
+    async def test_disabled_recorder_is_skipped(self):
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=4)
+        rec = PacketRecorder(enabled=False)
+        fan = PacketFanout(q, recorder=rec)
+        fan.publish(b"x")
+        self.assertEqual(rec.stats.enqueued, 0)
+        self.assertEqual(q.qsize(), 1)
+
+    async def test_publish_wait_applies_backpressure(self):
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        fan = PacketFanout(q)
+        await fan.publish_wait(b"1")
+
+        pending = asyncio.create_task(fan.publish_wait(b"2"))
+        await asyncio.sleep(0.01)
+        self.assertFalse(pending.done())
+
+        self.assertEqual(q.get_nowait()[1], b"1")
+        await asyncio.wait_for(pending, timeout=1.0)
+        self.assertEqual(q.get_nowait()[1], b"2")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+import unittest
+from dataclasses import replace
+
+from ingenierof125.state.handlers import HANDLERS
+from ingenierof125.state.manager import LAZY_STATE_IDS, StateManager
+from ingenierof125.telemetry.decoders_lite import CAR_DAMAGE_LAYOUT, CAR_DAMAGE_SIZE, N_CARS, PKT_HDR_SIZE
+from ingenierof125.telemetry.formats import CAR_DAMAGE_24_LAYOUT, CAR_DAMAGE_24_SIZE, F1_24, F1_25, FORMATS, FormatRegistry
+from ingenierof125.telemetry.protocol import PKT_HDR, parse_header
+
+
+def make_damage(layout, size: int, fmt: int, year: int, uid: int, t: float, player: int = 3, version: int = 1) -> bytes:
+    buf = bytearray(size)
+    PKT_HDR.pack_into(buf, 0, fmt, year, 1, 0, version, 10, uid, t, 1, 1, player, 255)
+    for i in range(N_CARS):
+        vals = dict.fromkeys(layout.names, 0)
+        vals.update(tyres_wear_rl=10.0, tyres_wear_rr=11.0, tyres_wear_fl=12.0, tyres_wear_fr=13.0)
+        vals.update(front_left_wing=i, front_right_wing=i + 1, gearbox_damage=7, engine_damage=8)
+        layout.st.pack_into(buf, PKT_HDR_SIZE + i * layout.size, *(vals[n] for n in layout.names))
+    return bytes(buf)
+
+
+def f1_24(uid: int, t: float, version: int = 1) -> bytes:
+    return make_damage(CAR_DAMAGE_24_LAYOUT, CAR_DAMAGE_24_SIZE, 2024, 24, uid, t, version=version)
+
+
+def f1_25(uid: int, t: float, version: int = 1) -> bytes:
+    return make_damage(CAR_DAMAGE_LAYOUT, CAR_DAMAGE_SIZE, 2025, 25, uid, t, version=version)
+
+
+class TestFormatRegistry(unittest.TestCase):
+    def test_lookup(self):
+        self.assertIs(FORMATS.lookup(2025, 25), F1_25)
+        self.assertIs(FORMATS.lookup(2024, 24), F1_24)
+        self.assertIsNone(FORMATS.lookup(2023, 23))
+        self.assertIs(FORMATS.select(2023, 23), F1_25)
+        self.assertEqual(CAR_DAMAGE_24_SIZE, 953)
+
+    def test_register_replaces_year(self):
+        reg = FormatRegistry(F1_25)
+        reg.register(F1_24)
+        patched = replace(F1_24, name="F1 24 patch")
+        reg.register(patched)
+        self.assertIs(reg.lookup(2024, 24), patched)
+        self.assertEqual(reg.known, ["F1 24 patch"])
+
+
+class TestBindSession(unittest.TestCase):
+    def _damage(self, sm: StateManager):
+        d = sm.state.damage.value
+        return d.front_left_wing, d.front_right_wing, d.wear, d.gearbox_damage
+
+    def test_f1_24_damage_then_f1_25(self):
+        for lazy_ids in ((), LAZY_STATE_IDS):
+            sm = StateManager(lazy_ids=lazy_ids)
+            p = f1_24(uid=1, t=1.0)
+            sm.apply_header(parse_header(p), p)
+            self.assertIs(sm.decoders, F1_24)
+            self.assertEqual(self._damage(sm), (3, 4, (10.0, 11.0, 12.0, 13.0), 7))
+
+            p = f1_25(uid=2, t=2.0)
+            sm.apply_header(parse_header(p), p)
+            self.assertIs(sm.decoders, F1_25)
+            self.assertEqual(self._damage(sm), (3, 4, (10.0, 11.0, 12.0, 13.0), 7))
+            self.assertEqual(sm.state.damage.t, 2.0)
+            self.assertEqual(sm.state.decode_errors, 0)
+
+    def test_first_packet_version_does_not_pick_the_set(self):
+        sm = StateManager()
+        for uid, version in ((1, 1), (2, 3)):
+            p = f1_24(uid=uid, t=1.0, version=version)
+            sm.apply_header(parse_header(p), p)
+            self.assertIs(sm.decoders, F1_24)
+            self.assertEqual(self._damage(sm)[0], 3)
+
+    def test_packet_version_variant_resolved_per_packet(self):
+        # una versión distinta de un paquete: variante del HandlerRegistry, no otro DecoderSet
+        seen = []
+        reg = HANDLERS.copy()
+        reg.register(10, lambda sm: lambda p, t, i, rx: seen.append(t), name="damage", packet_format=2025, packet_version=2)
+        sm = StateManager(registry=reg)
+        for t, version in ((1.0, 2), (2.0, 1), (3.0, 2)):
+            p = f1_25(uid=1, t=t, version=version)
+            sm.apply_header(parse_header(p), p)
+
+        self.assertIs(sm.decoders, F1_25)
+        self.assertEqual(seen, [1.0, 3.0])
+        self.assertEqual(sm.state.damage.t, 2.0)  # el decoder genérico sólo vio la versión 1
+
+    def test_f1_24_packet_with_f1_25_layout_is_rejected(self):
+        sm = StateManager()
+        p = f1_24(uid=1, t=1.0)
+        sm.apply_packet(10, p, 1.0, 3)  # sin header: sin bind, layouts por defecto
+        self.assertIsNone(sm.state.damage.value)
+
+    def test_unknown_format_uses_default(self):
+        sm = StateManager()
+        p = make_damage(CAR_DAMAGE_LAYOUT, CAR_DAMAGE_SIZE, 2026, 26, uid=5, t=1.0)
+        with self.assertLogs("ingenierof125.state", level="WARNING") as cm:
+            sm.apply_header(parse_header(p), p)
+            sm.bind_session(parse_header(p))  # una sola advertencia por formato
+        self.assertEqual(len(cm.output), 1)
+        self.assertIn("packet_format=2026", cm.output[0])
+        self.assertIs(sm.decoders, F1_25)
+        self.assertEqual(self._damage(sm)[0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
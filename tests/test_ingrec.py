@@ -0,0 +1,163 @@
+import asyncio
+import io
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from ingenierof125.ingest.ingrec import (
+    INDEX_ENTRY,
+    TRAILER,
+    IngrecReader,
+    IngrecV2Writer,
+    iter_records,
+    make_writer,
+)
+from ingenierof125.ingest.recorder import PacketRecorder
+from ingenierof125.ingest.replay import PacketReplayer
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def make_packet(packet_id: int, frame: int) -> bytes:
+    hdr = PKT_HDR.pack(2025, 25, 1, 0, 1, packet_id, 1, frame / 60.0, frame, frame, 0, 255)
+    return hdr + bytes([frame % 7]) * 200
+
+
+def make_records(n: int) -> list[tuple[int, bytes]]:
+    return [(1_000_000_000 + i * 16_666_667, make_packet(6, i)) for i in range(n)]
+
+
+def write_file(path: str, fmt: str, records, **kw) -> None:
+    with open(path, "wb") as f:
+        w = make_writer(f, fmt, **kw)
+        w.write_batch(records)
+        w.close()
+
+
+class TestIngrecFormat(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = self._td.name
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def test_roundtrip_v1_and_v2_codecs(self):
+        recs = make_records(300)
+        for fmt, codec in (("v1", "zlib"), ("v2", "none"), ("v2", "zlib"), ("v2", "lzma")):
+            with self.subTest(fmt=fmt, codec=codec):
+                path = os.path.join(self.dir, f"{fmt}_{codec}.ingrec")
+                write_file(path, fmt, recs, codec=codec, block_bytes=8192)
+                self.assertEqual(list(iter_records(path)), recs)
+
+    def test_v2_index_and_session_time_ranges(self):
+        path = os.path.join(self.dir, "a.ingrec")
+        write_file(path, "v2", make_records(300), block_bytes=8192)
+        with IngrecReader(path) as r:
+            self.assertEqual(r.version, 2)
+            self.assertTrue(r.index_from_footer)
+            self.assertGreater(len(r.blocks), 1)
+            self.assertEqual(r.n_records, 300)
+            for a, b in zip(r.blocks, r.blocks[1:]):
+                self.assertLessEqual(a.st_max, b.st_min)
+                self.assertLess(a.ts_last, b.ts_first)
+
+            # arrancar en un bloque intermedio: sin leer los anteriores
+            k = len(r.blocks) // 2
+            skipped = sum(b.n for b in r.blocks[:k])
+            got = list(r.records(start_block=k))
+            self.assertEqual(len(got), 300 - skipped)
+            self.assertEqual(got[0][0], r.blocks[k].ts_first)
+
+    def test_truncated_file_falls_back_to_scan(self):
+        path = os.path.join(self.dir, "cut.ingrec")
+        recs = make_records(300)
+        write_file(path, "v2", recs, block_bytes=8192)
+        with IngrecReader(path) as r:
+            blocks = r.blocks
+        # sin footer y con el último bloque a medias (grabación cortada)
+        cut = blocks[-1].offset + 20
+        with open(path, "r+b") as f:
+            f.truncate(cut)
+
+        with IngrecReader(path) as r:
+            self.assertFalse(r.index_from_footer)
+            self.assertEqual(r.blocks, blocks[:-1])
+            self.assertEqual(list(r), recs[: sum(b.n for b in blocks[:-1])])
+
+    def test_payloads_are_zero_copy_slices(self):
+        path = os.path.join(self.dir, "zc.ingrec")
+        recs = make_records(10)
+        write_file(path, "v1", recs)
+        with IngrecReader(path) as r:
+            got = list(r)
+            self.assertIsInstance(got[0][1], memoryview)
+            self.assertEqual(PKT_HDR.unpack_from(got[3][1], 0)[8], 3)  # frame
+            owned = list(r.records(copy=True))
+            self.assertIsInstance(owned[0][1], bytes)
+        # cerrar con slices vivos no rompe; siguen siendo legibles
+        self.assertEqual(bytes(got[-1][1]), recs[-1][1])
+
+    def test_truncated_v1_record_is_ignored(self):
+        path = os.path.join(self.dir, "cut1.ingrec")
+        recs = make_records(5)
+        write_file(path, "v1", recs)
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+        self.assertEqual(list(iter_records(path, copy=True)), recs[:4])
+
+    def test_rejects_unknown_magic(self):
+        path = os.path.join(self.dir, "bad.ingrec")
+        Path(path).write_bytes(b"NOPE\0\0\0\0" + b"\x01\x00" + b"x" * 20)
+        with self.assertRaises(ValueError):
+            IngrecReader(path)
+
+    def test_writer_trailer_points_at_index(self):
+        buf = io.BytesIO()
+        w = IngrecV2Writer(buf, block_bytes=4096)
+        w.write_batch(make_records(50))
+        w.close()
+        data = buf.getvalue()
+        magic, n, idx_off = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+        self.assertEqual(magic, b"IDX2")
+        self.assertEqual(n, len(w.blocks))
+        self.assertEqual(idx_off, len(data) - TRAILER.size - n * INDEX_ENTRY.size)
+
+
+class TestIngrecPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_recorder_v2_then_replay(self):
+        with tempfile.TemporaryDirectory() as d:
+            rec = PacketRecorder(out_dir=d, enabled=True, flush_every=16, fmt="v2", block_bytes=8192)
+            task = asyncio.create_task(rec.run())
+            await asyncio.sleep(0.01)
+            sent = [make_packet(2, i) for i in range(100)]
+            for p in sent:
+                rec.try_enqueue(p)
+            await asyncio.sleep(0.02)
+            rec.stop()
+            await asyncio.wait_for(task, timeout=2.0)
+
+            self.assertEqual([p for _, p in iter_records(rec.stats.last_path)], sent)
+
+            q: asyncio.Queue[bytes] = asyncio.Queue()
+            rp = PacketReplayer(rec.stats.last_path, no_sleep=True)
+            await rp.run(q)
+            self.assertEqual([q.get_nowait() for _ in range(q.qsize())], sent)
+
+    async def test_replay_v1_skips_file_header(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "a.ingrec")
+            recs = make_records(20)
+            write_file(path, "v1", recs)
+
+            q: asyncio.Queue[bytes] = asyncio.Queue()
+            rp = PacketReplayer(path, no_sleep=True)
+            await rp.run(q)
+            self.assertEqual(rp.stats.sent, 20)
+            self.assertEqual(q.get_nowait(), recs[0][1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+import asyncio
+import struct
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ingenierof125.core.latency import LatencyHistogram
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.ingest.fanout import PacketFanout
+from ingenierof125.ingest.recorder import PacketRecorder
+from ingenierof125.state.manager import StateManager
+from ingenierof125.telemetry.dispatcher import PacketDispatcher
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def make_session_packet(frame: int) -> bytes:
+    hdr = PKT_HDR.pack(2025, 25, 1, 0, 1, 1, 1, float(frame) / 60.0, frame, frame, 0, 255)
+    return hdr + b"\x00" * (753 - len(hdr))
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_error(self):
+        h = LatencyHistogram()
+        for us in range(1, 1001):
+            h.record(us * 1000)
+
+        self.assertEqual(h.n, 1000)
+        self.assertEqual(h.max_ns, 1_000_000)
+        for p, exact in ((50, 500_000), (95, 950_000), (99, 990_000)):
+            got = h.percentile(p)
+            self.assertGreaterEqual(got, exact)
+            self.assertLessEqual(got, exact * 1.13)
+
+    def test_empty_and_reset(self):
+        h = LatencyHistogram()
+        self.assertEqual(h.percentile(99), 0)
+        self.assertEqual(h.format_ms(), "-")
+        h.record(5)
+        h.record(-3)  # reloj raro: se clampa a 0
+        self.assertEqual(h.percentile(100), 5)
+        h.reset()
+        self.assertEqual(h.n, 0)
+
+
+class TestReceiveTimestamps(unittest.IsolatedAsyncioTestCase):
+    async def test_rx_ns_reaches_state_and_histograms(self):
+        stats = RuntimeStats()
+        sm = StateManager()
+        q: asyncio.Queue = asyncio.Queue(maxsize=16)
+        fan = PacketFanout(q)
+
+        rx = time.perf_counter_ns()
+        self.assertTrue(fan.publish(make_session_packet(1), rx))
+
+        disp = PacketDispatcher(2025, 25, stats=stats, state_manager=sm)
+        task = asyncio.create_task(disp.run(q))
+        await asyncio.sleep(0.02)
+        disp.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+        self.assertEqual(sm.state.session.rx_ns, rx)
+        self.assertEqual(stats.lat_queue.n, 1)
+        self.assertEqual(stats.lat_state.n, 1)
+        self.assertGreaterEqual(stats.lat_state.max_ns, stats.lat_queue.max_ns)
+
+    async def test_recorder_persists_receive_time(self):
+        with tempfile.TemporaryDirectory() as td:
+            rec = PacketRecorder(out_dir=td, enabled=True)
+            task = asyncio.create_task(rec.run())
+            await asyncio.sleep(0.01)
+
+            # recibido hace 2s: el archivo tiene que reflejar eso, no el momento de escritura
+            rx = time.perf_counter_ns() - 2_000_000_000
+            rec.try_enqueue(b"abc", rx)
+            await asyncio.sleep(0.01)
+            rec.stop()
+            await asyncio.wait_for(task, timeout=1.0)
+
+            data = Path(rec.stats.last_path).read_bytes()
+            ts_ns, n = struct.unpack_from("<QI", data, 10)
+            self.assertEqual(n, 3)
+            age_s = (time.time_ns() - ts_ns) / 1e9
+            self.assertGreater(age_s, 1.5)
+            self.assertLess(age_s, 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
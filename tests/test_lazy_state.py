@@ -0,0 +1,105 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from ingenierof125.offline.batch import BatchReplayer
+from ingenierof125.rules.model import RuleConfig
+from ingenierof125.state.manager import LAZY_STATE_IDS, StateManager
+from ingenierof125.state.model import LazySlot
+from ingenierof125.telemetry.decoders_lite import CAR_TELEMETRY, CAR_TELEMETRY_LAYOUT, PKT_HDR_SIZE
+from ingenierof125.telemetry.synthetic import Scenario, SyntheticRace
+
+
+def _snapshot(sm: StateManager) -> tuple:
+    s = sm.state
+    slots = tuple((x.value, x.t, x.ok, x.rx_ns) for x in (s.session, s.lap, s.status, s.telemetry, s.damage))
+    return slots, sm.stale_flags(), s.latest_session_time, s.player_index
+
+
+class TestLazyState(unittest.TestCase):
+    def setUp(self) -> None:
+        self.records = list(SyntheticRace(seed=5, scenarios=[Scenario.parse("fuel_low@1")]).packets(3.0))
+
+    def test_same_state_as_eager_at_every_read(self) -> None:
+        eager = StateManager()
+        lazy = StateManager(lazy_ids=LAZY_STATE_IDS)
+        self.assertIsInstance(lazy.state.telemetry, LazySlot)
+
+        for n, (ts, p) in enumerate(self.records):
+            st = struct.unpack_from("<f", p, 15)[0]
+            for sm in (eager, lazy):
+                sm.apply_packet(p[6], p, st, p[27], rx_ns=ts)
+            if n % 31 == 0:  # lecturas espaciadas, como el engine
+                self.assertEqual(_snapshot(lazy), _snapshot(eager))
+        self.assertEqual(_snapshot(lazy), _snapshot(eager))
+
+        z = lazy.lazy
+        self.assertGreater(z.pushed, z.decoded)
+        self.assertGreater(z.skipped, 0)
+        self.assertIn("saved=", lazy.format_lazy(ticks=10))
+        self.assertEqual(eager.format_lazy(), "")
+
+    def test_stale_flags_before_any_read(self) -> None:
+        lazy = StateManager(lazy_ids=LAZY_STATE_IDS)
+        self.assertTrue(lazy.stale_flags().telemetry)
+        p = next(p for _, p in self.records if p[6] == 6)
+        lazy.apply_packet(6, p, 1.0, 0)
+        self.assertEqual(lazy.state.telemetry.pending, 1)
+        self.assertFalse(lazy.stale_flags(1.1).telemetry)
+        self.assertEqual(lazy.state.telemetry.pending, 0)
+        self.assertEqual(lazy.state.telemetry.t, 1.0)
+
+    def test_bad_latest_falls_back_to_previous(self) -> None:
+        good = next(p for _, p in self.records if p[6] == 6)
+        bad = bytearray(good)
+        struct.pack_into("<f", bad, PKT_HDR_SIZE + CAR_TELEMETRY_LAYOUT.offset("throttle"), float("nan"))  # auto 0
+        for sm in (StateManager(), StateManager(lazy_ids=LAZY_STATE_IDS)):
+            sm.apply_packet(6, good, 1.0, 0, rx_ns=1)
+            sm.apply_packet(6, bytes(bad), 1.1, 0, rx_ns=2)
+            self.assertEqual((sm.state.telemetry.t, sm.state.telemetry.rx_ns), (1.0, 1))
+            self.assertIsNotNone(sm.state.telemetry.value)
+
+    def test_short_and_memoryview_payloads(self) -> None:
+        good = next(p for _, p in self.records if p[6] == 6)
+        sm = StateManager(lazy_ids=LAZY_STATE_IDS)
+        sm.apply_packet(6, memoryview(good), 1.0, 0)
+        sm.apply_packet(6, good[: PKT_HDR_SIZE + CAR_TELEMETRY.size], 1.2, 0)
+        self.assertEqual(sm.state.telemetry.t, 1.0)
+        self.assertIs(type(sm.state.telemetry.value).__name__, "PlayerTelemetryLite")
+
+    def test_pending_is_bounded(self) -> None:
+        p = next(p for _, p in self.records if p[6] == 6)
+        sm = StateManager(lazy_ids=LAZY_STATE_IDS)
+        for i in range(100):
+            sm.apply_packet(6, p, float(i), 0)
+        self.assertLess(sm.state.telemetry.pending, LazySlot.MAX_PENDING)
+
+
+class TestLazyBatch(unittest.TestCase):
+    def test_same_events_as_eager(self) -> None:
+        race = SyntheticRace(seed=2, scenarios=[Scenario.parse(s) for s in ("safety_car@2", "fuel_low@1", "wing_damage@3")])
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "race.ingrec")
+            race.write(path, 20.0)
+
+            def run(lazy_ids):
+                got = []
+                rp = BatchReplayer(
+                    RuleConfig(comms_throttle_s=0.0),
+                    tick_hz=10.0,
+                    on_event=lambda ts, t, ev: got.append((ts, t, ev.key)),
+                    lazy_ids=lazy_ids,
+                )
+                rp.run(path)
+                return got, rp
+
+            eager, _ = run(())
+            lazy, rp = run(LAZY_STATE_IDS)
+        self.assertTrue(eager)
+        self.assertEqual(lazy, eager)
+        self.assertGreater(rp.state_mgr.lazy.skipped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import random
+import struct
+import unittest
+
+from ingenierof125.telemetry import decoders_lite as dl
+from ingenierof125.telemetry.narrow import Layout, compile_reader
+from ingenierof125.telemetry.synthetic import Scenario, SyntheticRace
+
+LAYOUTS = (dl.LAPDATA_LAYOUT, dl.CAR_TELEMETRY_LAYOUT, dl.CAR_STATUS_LAYOUT, dl.CAR_DAMAGE_LAYOUT)
+
+
+class TestCompileReader(unittest.TestCase):
+    def test_fields_match_full_unpack_in_requested_order(self):
+        rng = random.Random(4)
+        for layout in LAYOUTS:
+            buf = bytes(rng.getrandbits(8) for _ in range(layout.size * 3))
+            full = layout.st.unpack_from(buf, layout.size)
+            expected = dict(zip(layout.names, full))
+            for _ in range(20):
+                names = rng.sample(layout.names, rng.randint(1, len(layout.names)))
+                got = compile_reader(layout, names).unpack_from(buf, layout.size)
+                # NaN != NaN: se compara la representación en bytes
+                self.assertEqual(repr(got), repr(tuple(expected[n] for n in names)))
+
+    def test_contiguous_and_small_gaps_fuse_into_one_read(self):
+        lay = dl.LAPDATA_LAYOUT
+        self.assertEqual(lay.reader("last_lap_ms", "current_lap_ms").formats, ("<II",))
+        self.assertEqual(lay.reader("car_pos", "lap_num", "sector").formats, ("<BB2xB",))
+        # hueco grande => dos lecturas
+        r = lay.reader("last_lap_ms", "speedtrap_fastest_lap", max_gap=4)
+        self.assertEqual(len(r.reads), 2)
+        self.assertEqual(r.span, lay.size)
+
+    def test_rejects_bad_layouts_and_fields(self):
+        with self.assertRaises(ValueError):
+            Layout(struct.Struct("<HB"), ("a",))
+        with self.assertRaises(ValueError):
+            Layout(struct.Struct("HB"), ("a", "b"))
+        with self.assertRaises(ValueError):
+            dl.LAPDATA_LAYOUT.reader("lap_num", "nope")
+        with self.assertRaises(ValueError):
+            dl.LAPDATA_LAYOUT.reader("lap_num", "lap_num")
+
+
+class TestNarrowDecoders(unittest.TestCase):
+    def test_player_decoders_match_full_struct(self):
+        race = SyntheticRace(seed=2, scenarios=[Scenario("wing_damage", 0.0, 35.0), Scenario("safety_car", 0.0, 60.0)])
+        last = {p[6]: p for _, p in race.packets(1.0)}
+        for car in (0, 11, 21):
+            lap = dict(zip(dl.LAPDATA_FIELDS, dl.LAPDATA.unpack_from(last[2], dl.PKT_HDR_SIZE + car * dl.LAPDATA.size)))
+            v = dl.decode_lap_player(last[2], car)
+            self.assertEqual((v.lap_num, v.position, v.sector), (lap["lap_num"], lap["car_pos"], lap["sector"]))
+            self.assertEqual(v.delta_leader_ms, lap["d_lead_min"] * 60_000 + lap["d_lead_ms"])
+
+            tel = dict(zip(dl.CAR_TELEMETRY_FIELDS, dl.CAR_TELEMETRY.unpack_from(last[6], dl.PKT_HDR_SIZE + car * dl.CAR_TELEMETRY.size)))
+            v = dl.decode_telemetry_player(last[6], car)
+            self.assertEqual((v.speed_kph, v.gear, v.engine_rpm), (tel["speed_kph"], tel["gear"], tel["engine_rpm"]))
+
+            sts = dict(zip(dl.CAR_STATUS_FIELDS, dl.CAR_STATUS.unpack_from(last[7], dl.PKT_HDR_SIZE + car * dl.CAR_STATUS.size)))
+            v = dl.decode_status_player(last[7], car)
+            self.assertEqual((v.fuel_remaining_laps, v.tyre_age_laps), (sts["fuel_remaining_laps"], sts["tyre_age_laps"]))
+
+        d = dl.decode_damage_player(last[10], 0)
+        self.assertEqual(d.front_left_wing, 35)
+        self.assertEqual(dl.decode_session(last[1]).safety_car_status, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from ingenierof125.ingest.ingrec import make_writer
+from ingenierof125.offline.backtest import _plan, check_grid_keys, expand_grid, find_recordings, run_backtest
+from ingenierof125.rules.model import RulesConfig
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+SC_STATUS_OFFSET = PKT_HDR.size + 124  # SessionData.safetyCarStatus
+
+
+def flapping_sc(seconds: float = 10.0, hz: int = 20) -> list[tuple[int, bytes]]:
+    # SC medio segundo sí, medio segundo no: un sc_deployed por segundo si el cooldown deja
+    out = []
+    for frame in range(int(seconds * hz)):
+        st = frame / hz
+        payload = bytearray(753)
+        payload[: PKT_HDR.size] = PKT_HDR.pack(2025, 25, 1, 0, 1, 1, 7, st, frame, frame, 0, 255)
+        payload[SC_STATUS_OFFSET] = 1 if (st % 1.0) < 0.5 else 0
+        out.append((frame * 50_000_000, bytes(payload)))
+    return out
+
+
+class TestBacktest(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = self._td.name
+        for name in ("a.ingrec", "sub/b.ingrec"):
+            path = os.path.join(self.dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                w = make_writer(f, "v2")
+                w.write_batch(flapping_sc())
+                w.close()
+        self.files = find_recordings(self.dir)
+        self.rules = RulesConfig({"version": "v1", "comms_throttle_s": 0, "cooldowns": {"sc_vsc_deployed": 6}})
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def test_expand_grid(self):
+        grid = {"thresholds.fuel_rem_laps_low": [1.5, 2.0], "cooldowns.fuel_low": [20, 30, 40]}
+        cands = expand_grid(grid)
+        self.assertEqual(len(cands), 6)
+        self.assertEqual(cands[0], {"thresholds.fuel_rem_laps_low": 1.5, "cooldowns.fuel_low": 20})
+        self.assertEqual(expand_grid([{"a": 1}]), [{"a": 1}])
+        with self.assertRaises(ValueError):
+            expand_grid({"a": 1})
+
+    def test_dotted_override_keeps_siblings(self):
+        rc = self.rules.override(**{"cooldowns.fuel_low": 5})
+        self.assertEqual(rc["cooldowns"], {"sc_vsc_deployed": 6, "fuel_low": 5})
+        self.assertEqual(self.rules["cooldowns"], {"sc_vsc_deployed": 6})
+
+    def test_grid_keys_checked_against_base(self):
+        with self.assertRaises(ValueError):
+            run_backtest(self.files, self.rules, [{}, {"thresholds.fuel_rem_laps_low": 1.5}], jobs=1)
+        with self.assertRaises(ValueError):
+            check_grid_keys(self.rules, [{"comms_throttle_s.x": 1}])  # el padre existe pero no es mapa
+
+        with self.assertLogs("ingenierof125.offline", level="WARNING") as cm:
+            check_grid_keys(self.rules, [{"cooldowns.fuel_lo": 20}, {"cooldowns.fuel_lo": 30, "cooldowns.sc_vsc_deployed": 1}])
+        self.assertEqual(len(cm.output), 1)  # una vez por clave, no por candidato
+        self.assertIn("cooldowns.fuel_lo", cm.output[0])
+
+    def test_plan_splits_grid_when_files_are_few(self):
+        self.assertEqual(len(_plan(["x"], 8, 1)), 1)
+        plan = _plan(["x"], 8, 4)
+        self.assertEqual(len(plan), 4)
+        self.assertEqual([(a, b) for _, a, b in plan], [(0, 2), (2, 4), (4, 6), (6, 8)])
+
+    def test_counts_per_candidate(self):
+        cands = [{}, {"cooldowns.sc_vsc_deployed": 0}, {"cooldowns.sc_vsc_deployed": 100}]
+        rep = run_backtest(self.files, self.rules, cands, jobs=1)
+
+        self.assertEqual(rep.files, 2)
+        self.assertEqual(rep.packets, 400)
+        self.assertEqual(rep.errors, [])
+        base, free, strict = (c.get("sc_deployed", 0) for c in rep.counts)
+        self.assertEqual(free, 20)     # 10 por carrera
+        self.assertEqual(strict, 2)    # 1 por carrera
+        self.assertEqual(base, 4)      # cooldown 6s: t~0 y t~6
+        self.assertEqual(rep.keys()[0], "sc_deployed")
+
+    def test_process_pool_matches_inline(self):
+        cands = [{}, {"cooldowns.sc_vsc_deployed": 0}, {"cooldowns.sc_vsc_deployed": 100}]
+        inline = run_backtest(self.files, self.rules, cands, jobs=1)
+        pooled = run_backtest(self.files + [os.path.join(self.dir, "missing.ingrec")], self.rules, cands, jobs=4)
+        self.assertEqual(pooled.counts, inline.counts)
+        self.assertEqual(pooled.packets, inline.packets)
+        self.assertEqual(pooled.files, 2)
+        self.assertEqual(len(pooled.errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,102 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from ingenierof125.ingest.ingrec import make_writer
+from ingenierof125.offline.batch import BatchReplayer, run_batch
+from ingenierof125.rules.model import RuleConfig
+from ingenierof125.state.handlers import HANDLERS
+
+from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+SC_STATUS_OFFSET = PKT_HDR.size + 124  # SessionData.safetyCarStatus
+
+
+def make_session_packet(st: float, frame: int, sc: int, uid: int = 1) -> bytes:
+    payload = bytearray(753)
+    payload[: PKT_HDR.size] = PKT_HDR.pack(2025, 25, 1, 0, 1, 1, uid, st, frame, frame, 0, 255)
+    payload[SC_STATUS_OFFSET] = sc
+    return bytes(payload)
+
+
+def sc_race(uid: int = 1, seconds: float = 12.0, hz: int = 20) -> list[tuple[int, bytes]]:
+    # verde -> SC a los 5s -> ending a los 8s -> verde a los 10s
+    out = []
+    for frame in range(int(seconds * hz)):
+        st = frame / hz
+        sc = 1 if 5.0 <= st < 8.0 else (4 if 8.0 <= st < 10.0 else 0)
+        out.append((1_000_000_000 + frame * 50_000_000, make_session_packet(st, frame, sc, uid)))
+    return out
+
+
+class TestBatchReplay(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = self._td.name
+        self.cfg = RuleConfig(comms_throttle_s=0.0)
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def _write(self, name: str, records) -> str:
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            w = make_writer(f, "v2", block_bytes=16384)
+            w.write_batch(records)
+            w.close()
+        return path
+
+    def test_ticks_follow_session_time(self):
+        path = self._write("sc.ingrec", sc_race())
+        got = []
+        rp = BatchReplayer(self.cfg, tick_hz=4.0, on_event=lambda ts, t, ev: got.append((t, ev.key)))
+        s = rp.run(path)
+
+        self.assertEqual(s.packets, 240)
+        self.assertEqual(s.sessions, 1)
+        # 11.95s de sesión a 4 Hz virtuales (+ el tick final con lo pendiente)
+        self.assertIn(s.ticks, (47, 48))
+        self.assertAlmostEqual(s.session_s, 11.95, places=3)
+        self.assertEqual([k for _, k in got], ["sc_deployed", "sc_ending", "sc_cleared"])
+        # el evento sale en el primer tick de grilla después del cambio, no antes
+        for (t, _), change in zip(got, (5.0, 8.0, 10.0)):
+            self.assertGreater(t, change)
+            self.assertLessEqual(t, change + 0.25 + 1e-6)
+        self.assertGreater(s.pps, 0.0)
+
+    def test_new_session_resets_engine_and_writes_jsonl(self):
+        path = self._write("two.ingrec", sc_race(uid=1) + sc_race(uid=2))
+        out = os.path.join(self.dir, "events.jsonl")
+        s = run_batch(path, self.cfg, tick_hz=10.0, events_out=out)
+
+        self.assertEqual(s.sessions, 2)
+        with open(out, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        # la segunda sesión vuelve a t=0: sin reset el engine no tickearía (t <= last_t)
+        self.assertEqual([r["key"] for r in rows], ["sc_deployed", "sc_ending", "sc_cleared"] * 2)
+        self.assertEqual(rows[0]["priority"], "STRATEGY_OPPORTUNITY")
+        self.assertIn("SC desplegado", rows[0]["text"])
+
+    def test_rejects_bad_tick_rate(self):
+        with self.assertRaises(ValueError):
+            BatchReplayer(self.cfg, tick_hz=0.0)
+
+    def test_format_variant_handlers_run_in_batch(self):
+        # como en vivo (apply_header): el batch pasa packet_format/packet_version al registry
+        seen = []
+        reg = HANDLERS.copy()
+        reg.register(1, lambda sm: lambda p, t, i, rx: seen.append(t), name="session_v1", packet_format=2025, packet_version=1)
+        reg.register(1, lambda sm: lambda p, t, i, rx: seen.append(-1.0), name="session_v2", packet_format=2025, packet_version=2)
+        rp = BatchReplayer(self.cfg, tick_hz=4.0, registry=reg)
+        rp.run(self._write("sc.ingrec", sc_race(seconds=2.0)))
+
+        self.assertEqual(len(seen), 40)
+        self.assertNotIn(-1.0, seen)
+        self.assertEqual(rp.state_mgr.handler_stats["session_v1@2025/1"].calls, 40)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,67 @@
+import asyncio
+import struct
+import unittest
+
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.ingest.fanout import PacketFanout
+from ingenierof125.ingest.recorder import PacketRecorder
+from ingenierof125.state.manager import STATE_PACKET_IDS
+from ingenierof125.telemetry.packet_filter import PacketIdFilter
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET, PacketHeader
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def make_packet(packet_id: int) -> bytes:
+    return PKT_HDR.pack(2025, 25, 1, 0, 1, packet_id, 1, 1.0, 1, 1, 0, 255) + b"\x00" * 8
+
+
+class TestPacketIdFilter(unittest.TestCase):
+    def test_offset_matches_header_layout(self):
+        for pid in (0, 6, 13, 15):
+            data = make_packet(pid)
+            self.assertEqual(data[PACKET_ID_OFFSET], PacketHeader.try_parse(data).packet_id)
+
+    def test_parse_specs(self):
+        self.assertIsNone(PacketIdFilter.parse(""))
+        self.assertEqual(PacketIdFilter.parse("state").allow, STATE_PACKET_IDS)
+        self.assertEqual(PacketIdFilter.parse("state, 3").allow, STATE_PACKET_IDS | {3})
+        self.assertEqual(PacketIdFilter.parse("1,2").allow, frozenset({1, 2}))
+        with self.assertRaises(ValueError):
+            PacketIdFilter.parse("1,motion")
+
+    def test_counts_drops_per_id(self):
+        flt = PacketIdFilter({1, 2})
+        self.assertTrue(flt.allows(make_packet(1)))
+        self.assertFalse(flt.allows(make_packet(0)))
+        self.assertFalse(flt.allows(make_packet(0)))
+        self.assertFalse(flt.allows(make_packet(13)))
+        self.assertEqual(flt.dropped[0], 2)
+        self.assertEqual(flt.dropped[13], 1)
+        # payload sin header completo: pasa (lo descarta el dispatcher como bad header)
+        self.assertTrue(flt.allows(b"\x00\x01"))
+
+
+class TestFanoutFilter(unittest.IsolatedAsyncioTestCase):
+    async def test_recorder_still_gets_everything(self):
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=16)
+        rec = PacketRecorder(enabled=True, queue_maxsize=16)
+        flt = PacketIdFilter.parse("state", dropped=stats.drop_filter)
+        fan = PacketFanout(q, recorder=rec, packet_filter=flt)
+
+        for pid in (0, 1, 2, 13, 6, 15):
+            self.assertTrue(fan.publish(make_packet(pid)))
+        fan.publish_batch([(1, make_packet(0)), (2, make_packet(7))])
+        await fan.publish_wait(make_packet(13))
+
+        got = [q.get_nowait()[1][PACKET_ID_OFFSET] for _ in range(q.qsize())]
+        self.assertEqual(got, [1, 2, 6, 7])
+        self.assertEqual(rec.stats.enqueued, 9)
+        self.assertEqual(stats.drop_filter[0], 2)
+        self.assertEqual(stats.drop_filter[13], 2)
+        self.assertEqual(stats.drop_filter[15], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
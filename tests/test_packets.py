@@ -0,0 +1,123 @@
+import struct
+import unittest
+
+from ingenierof125.state.handlers import HANDLERS, load_plugins
+from ingenierof125.state.manager import StateManager
+from ingenierof125.telemetry.packets import (
+    EVENT,
+    EVENT_HISTORY,
+    MOTION,
+    PACKET_SPECS,
+    PARTICIPANTS,
+    SESSION_HISTORY,
+    TYRE_SETS,
+    packet_spec,
+    view_packet,
+)
+from ingenierof125.telemetry.narrow import Layout
+from ingenierof125.telemetry.protocol import PKT_HDR, PKT_HDR_SIZE, parse_header
+
+from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+
+# tamaños oficiales F1 25
+SIZES = {0: 1349, 3: 45, 4: 1284, 5: 1133, 8: 1042, 9: 954, 11: 1460, 12: 231, 13: 273, 14: 101, 15: 1131}
+
+
+def make_packet(packet_id: int, size: int, t: float = 1.0) -> bytearray:
+    buf = bytearray(size)
+    PKT_HDR.pack_into(buf, 0, 2025, 25, 1, 0, 1, packet_id, 7, t, 1, 1, 0, 255)
+    return buf
+
+
+class TestPacketViews(unittest.TestCase):
+    def test_specs_and_size_validation(self):
+        self.assertEqual({pid: s.size for pid, s in PACKET_SPECS.items()}, SIZES)
+        for pid, size in SIZES.items():
+            buf = make_packet(pid, size)
+            v = view_packet(bytes(buf))
+            self.assertIsNotNone(v, pid)
+            self.assertEqual(v.header.packet_id, pid)
+            self.assertIsNone(view_packet(bytes(buf[:-1])))
+            self.assertIsNone(view_packet(bytes(buf) + b"\x00"))
+        self.assertIsNone(view_packet(bytes(make_packet(6, 1352))))  # lo decodifica decoders_lite
+        self.assertIsNone(view_packet(b"\x00" * 10))
+
+    def test_participants_fields_on_access(self):
+        buf = make_packet(4, 1284)
+        buf[PKT_HDR_SIZE] = 20
+        off = PKT_HDR_SIZE + 1 + 3 * 57
+        struct.pack_into("<7B32s", buf, off, 0, 1, 2, 9, 0, 44, 5, "Pérez".encode())
+        v = PARTICIPANTS.view(memoryview(bytes(buf)))
+
+        self.assertEqual(v.num_active_cars, 20)
+        car = v.cars[3]
+        self.assertEqual((car.race_number, car.team_id, car.name), (44, 9, "Pérez"))
+        self.assertEqual(car.read("race_number", "team_id"), (44, 9))
+        self.assertEqual(v.cars[-19].race_number, 44)
+        self.assertEqual(v.cars.column("race_number")[:5], [0, 0, 0, 44, 0])
+        self.assertEqual(len(list(v.cars)), 22)
+        with self.assertRaises(IndexError):
+            v.cars[22]
+        with self.assertRaises(AttributeError):
+            car.speed
+
+    def test_motion_and_arrays_after_scalars(self):
+        buf = make_packet(0, 1349)
+        struct.pack_into("<3f", buf, PKT_HDR_SIZE + 21 * 60, 1.0, 2.0, 3.0)
+        v = MOTION.view(bytes(buf))
+        self.assertEqual((v.cars[21].world_position_x, v.cars[21].world_position_z), (1.0, 3.0))
+
+        buf = make_packet(12, 231)
+        buf[PKT_HDR_SIZE] = 5
+        buf[-1] = 3  # fitted_idx, después del array
+        struct.pack_into("<h", buf, PKT_HDR_SIZE + 1 + 19 * 10 + 7, -1500)
+        v = TYRE_SETS.view(bytes(buf))
+        self.assertEqual((v.car_idx, v.fitted_idx, v.sets[19].lap_delta_time), (5, 3, -1500))
+
+        buf = make_packet(11, 1460)
+        struct.pack_into("<IHB", buf, SESSION_HISTORY.arrays["laps"].offset + 14 * 99, 91234, 28123, 0)
+        v = SESSION_HISTORY.view(bytes(buf))
+        self.assertEqual((v.laps[99].lap_time_ms, v.laps[99].s1_ms), (91234, 28123))
+        self.assertEqual(len(v.stints), 8)
+
+    def test_event_details_by_code(self):
+        buf = make_packet(3, 45)
+        struct.pack_into("<4sBf", buf, PKT_HDR_SIZE, b"FTLP", 4, 83.5)
+        v = EVENT.view(bytes(buf))
+        self.assertEqual(v.code, "FTLP")
+        self.assertEqual(v.details.as_dict(), {"vehicle_idx": 4, "lap_time": 83.5})
+
+        struct.pack_into("<4s", buf, PKT_HDR_SIZE, b"SSTA")
+        self.assertIsNone(EVENT.view(bytes(buf)).details)
+
+    def test_spec_must_match_size(self):
+        with self.assertRaises(ValueError):
+            packet_spec(99, "x", 40, Layout(struct.Struct("<I"), ("a",)))
+
+
+class TestViewsPlugin(unittest.TestCase):
+    def test_state_extra(self):
+        reg = HANDLERS.copy()
+        load_plugins("ingenierof125.telemetry.packets", reg)
+        sm = StateManager(registry=reg)
+
+        buf = make_packet(4, 1284)
+        buf[PKT_HDR_SIZE] = 19
+        sm.apply_header(parse_header(buf), bytes(buf))
+        self.assertEqual(sm.state.extra["participants"].num_active_cars, 19)
+
+        for i in range(EVENT_HISTORY + 2):
+            ev = make_packet(3, 45, t=float(i))
+            struct.pack_into("<4s", ev, PKT_HDR_SIZE, b"LGOT")
+            sm.apply_packet(3, bytes(ev), float(i), 0)
+        events = sm.state.extra["events"]
+        self.assertEqual(len(events), EVENT_HISTORY)
+        self.assertEqual(events[-1].header.session_time, float(EVENT_HISTORY + 1))
+
+        sm.apply_packet(0, bytes(make_packet(0, 1000)), 1.0, 0)  # tamaño de otro año: se ignora
+        self.assertNotIn("motion", sm.state.extra)
+        self.assertEqual(sm.handler_stats["motion"].errors, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
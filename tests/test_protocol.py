@@ -0,0 +1,45 @@
+import unittest
+
+from ingenierof125.state.manager import StateManager
+from ingenierof125.telemetry.decoders_lite import decode_packet_header
+from ingenierof125.telemetry.protocol import PKT_HDR, PKT_HDR_SIZE, PacketHeader, parse_header
+
+
+def make_header(packet_id: int, session_time: float, player: int = 0) -> bytes:
+    return PKT_HDR.pack(2025, 25, 1, 0, 1, packet_id, 42, session_time, 7, 8, player, 255)
+
+
+class TestPacketHeader(unittest.TestCase):
+    def test_parse_fields_and_indices(self):
+        h = parse_header(make_header(6, 12.5, player=3) + b"\x00" * 4)
+        self.assertIsInstance(h, PacketHeader)
+        self.assertEqual((h.packet_id, h.session_uid, h.session_time, h.player_car_index), (6, 42, 12.5, 3))
+        # mismo orden que la tupla cruda (los loops calientes indexan)
+        self.assertEqual(tuple(h), PKT_HDR.unpack_from(make_header(6, 12.5, player=3)))
+        self.assertEqual((h[5], h[7], h[10]), (6, 12.5, 3))
+        self.assertIs(type(h.session_time), float)
+
+    def test_short_or_empty(self):
+        self.assertIsNone(parse_header(b"\x00" * (PKT_HDR_SIZE - 1)))
+        self.assertIsNone(PacketHeader.try_parse(b""))
+        self.assertIsNone(decode_packet_header(b""))
+
+    def test_memoryview_and_legacy_helpers(self):
+        data = make_header(1, 3.0)
+        self.assertEqual(parse_header(memoryview(data)), parse_header(data))
+        self.assertEqual(decode_packet_header(data), parse_header(data))
+
+    def test_apply_header_matches_apply_packet(self):
+        data = make_header(2, 4.0, player=5) + b"\x00" * 8
+        a, b = StateManager(), StateManager()
+        a.apply_header(parse_header(data), data, 99)
+        b.apply_packet(2, data, 4.0, 5, 99)
+        self.assertEqual((a.state.latest_session_time, a.state.player_index), (4.0, 5))
+        self.assertEqual(
+            (a.state.latest_session_time, a.state.player_index),
+            (b.state.latest_session_time, b.state.player_index),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import struct
+import unittest
+
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.telemetry.protocol import PACKET_ID_OFFSET
+from ingenierof125.telemetry.queues import ConflatingQueue, SheddingQueue, make_dispatch_queue
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def make_packet(packet_id: int, frame: int) -> bytes:
+    return PKT_HDR.pack(2025, 25, 1, 0, 1, packet_id, 1, frame / 60.0, frame, frame, 0, 255)
+
+
+def frame_of(data: bytes) -> int:
+    return PKT_HDR.unpack_from(data)[8]
+
+
+class TestConflatingQueue(unittest.TestCase):
+    def test_latest_wins_and_event_lossless(self):
+        stats = RuntimeStats()
+        q = ConflatingQueue(64, stats=stats)
+
+        q.put_nowait(make_packet(6, 1))
+        q.put_nowait(make_packet(3, 1))
+        q.put_nowait(make_packet(6, 2))
+        q.put_nowait(make_packet(3, 2))
+        q.put_nowait(make_packet(6, 3))
+
+        out = [q.get_nowait() for _ in range(q.qsize())]
+        # telemetry: sólo el más nuevo, en la posición del primero pendiente; events: los dos
+        self.assertEqual([(d[PACKET_ID_OFFSET], frame_of(d)) for d in out], [(6, 3), (3, 1), (3, 2)])
+        self.assertEqual(q.conflated, 2)
+        self.assertEqual(stats.conflated, 2)
+
+    def test_depth_bounded_under_overload(self):
+        q = ConflatingQueue(16)
+        for i in range(10_000):
+            for pid in (0, 2, 6, 7, 10):
+                q.put_nowait(make_packet(pid, i))
+        self.assertEqual(q.qsize(), 5)
+        frames = {d[PACKET_ID_OFFSET]: frame_of(d) for d in (q.get_nowait() for _ in range(5))}
+        self.assertEqual(set(frames.values()), {9999})
+
+    def test_lossless_types_respect_maxsize(self):
+        q = ConflatingQueue(2)
+        q.put_nowait(make_packet(3, 1))
+        q.put_nowait(make_packet(3, 2))
+        with self.assertRaises(asyncio.QueueFull):
+            q.put_nowait(make_packet(3, 3))
+
+    def test_slot_reopens_after_get(self):
+        q = ConflatingQueue(8)
+        q.put_nowait(make_packet(6, 1))
+        self.assertEqual(frame_of(q.get_nowait()), 1)
+        q.put_nowait(make_packet(6, 2))
+        self.assertEqual(q.qsize(), 1)
+        self.assertEqual(frame_of(q.get_nowait()), 2)
+        self.assertTrue(q.empty())
+
+    def test_factory(self):
+        self.assertIsInstance(make_dispatch_queue("conflate", 8), ConflatingQueue)
+        self.assertIsInstance(make_dispatch_queue("shed", 8), SheddingQueue)
+        self.assertIs(type(make_dispatch_queue("fifo", 8)), asyncio.Queue)
+        with self.assertRaises(ValueError):
+            make_dispatch_queue("nope", 8)
+
+
+class TestSheddingQueue(unittest.TestCase):
+    def test_fifo_when_not_full(self):
+        q = SheddingQueue(8)
+        pids = [0, 1, 6, 3, 13, 10]
+        for i, pid in enumerate(pids):
+            q.put_nowait(make_packet(pid, i))
+        out = [q.get_nowait() for _ in range(q.qsize())]
+        self.assertEqual([d[PACKET_ID_OFFSET] for d in out], pids)
+        self.assertEqual([frame_of(d) for d in out], list(range(len(pids))))
+
+    def test_high_value_evicts_low_first(self):
+        stats = RuntimeStats()
+        q = SheddingQueue(3, stats=stats)
+        q.put_nowait(make_packet(6, 1))   # mid
+        q.put_nowait(make_packet(0, 2))   # low
+        q.put_nowait(make_packet(13, 3))  # low
+
+        q.put_nowait(make_packet(1, 4))   # Session: desaloja el low más viejo (Motion)
+        q.put_nowait(make_packet(10, 5))  # CarDamage: desaloja MotionEx
+        q.put_nowait(make_packet(3, 6))   # Event: ya no hay low => desaloja telemetry (mid)
+
+        out = [q.get_nowait() for _ in range(q.qsize())]
+        self.assertEqual([d[PACKET_ID_OFFSET] for d in out], [1, 10, 3])
+        self.assertEqual(q.shed, [2, 1, 0])
+        self.assertEqual((stats.shed_low, stats.shed_mid, stats.shed_high), (2, 1, 0))
+
+    def test_low_value_dropped_when_nothing_below(self):
+        stats = RuntimeStats()
+        q = SheddingQueue(2, stats=stats)
+        q.put_nowait(make_packet(7, 1))
+        q.put_nowait(make_packet(0, 2))
+        with self.assertRaises(asyncio.QueueFull):
+            q.put_nowait(make_packet(13, 3))   # low vs low: se descarta el entrante
+        with self.assertRaises(asyncio.QueueFull):
+            q.put_nowait(make_packet(0, 4))
+        self.assertEqual(stats.shed_low, 2)
+        self.assertEqual(q.qsize(), 2)
+
+    def test_high_protected_when_full_of_high(self):
+        stats = RuntimeStats()
+        q = SheddingQueue(2, stats=stats)
+        q.put_nowait(make_packet(1, 1))
+        q.put_nowait(make_packet(2, 2))
+        with self.assertRaises(asyncio.QueueFull):
+            q.put_nowait(make_packet(10, 3))
+        self.assertEqual(stats.shed_high, 1)
+        self.assertEqual([frame_of(q.get_nowait()) for _ in range(2)], [1, 2])
+
+
+class TestConflatingQueueAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_get_wakes_on_put(self):
+        q = ConflatingQueue(8)
+        getter = asyncio.create_task(q.get())
+        await asyncio.sleep(0)
+        q.put_nowait(make_packet(6, 7))
+        data = await asyncio.wait_for(getter, timeout=1.0)
+        self.assertEqual(frame_of(data), 7)
+
+    async def test_shedding_join_after_eviction(self):
+        q = SheddingQueue(1)
+        q.put_nowait(make_packet(0, 1))
+        q.put_nowait(make_packet(1, 2))  # desaloja el Motion
+        await q.get()
+        q.task_done()
+        await asyncio.wait_for(q.join(), timeout=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
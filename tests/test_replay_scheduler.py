@@ -0,0 +1,72 @@
+import struct
+import time
+import unittest
+
+from ingenierof125.ingest.replay import PacketReplayer
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+
+
+def frames(seconds: float, hz: int = 60, per_frame: int = 4, t0: int = 10**18) -> list[tuple[int, bytes]]:
+    # per_frame paquetes por frame, separados 0.1 ms entre sí (como llegan del juego)
+    out = []
+    for frame in range(int(seconds * hz)):
+        ts = t0 + int(frame * 1e9 / hz)
+        for k in range(per_frame):
+            hdr = PKT_HDR.pack(2025, 25, 1, 0, 1, k, 1, frame / hz, frame, frame, 0, 255)
+            out.append((ts + k * 100_000, hdr))
+    return out
+
+
+class TestReplayScheduler(unittest.IsolatedAsyncioTestCase):
+    async def _play(self, records, **kw) -> tuple[PacketReplayer, list[int], float]:
+        rp = PacketReplayer("unused.ingrec", **kw)
+        stamps: list[int] = []
+
+        async def emit(_payload) -> None:
+            stamps.append(time.perf_counter_ns())
+
+        t0 = time.perf_counter()
+        await rp._loop(records, emit)
+        return rp, stamps, time.perf_counter() - t0
+
+    async def test_absolute_deadlines_keep_total_duration(self):
+        recs = frames(2.0)
+        rp, stamps, wall = await self._play(recs, speed=10.0)
+
+        self.assertEqual(rp.stats.sent, len(recs))
+        self.assertEqual(rp.stats.bursts, 120)
+        # 2 s de grabación a 10x: 0.2 s, sin acumular el atraso de cada sleep
+        self.assertGreaterEqual(wall, 0.195)
+        self.assertLess(wall, 0.26)
+        self.assertLess(abs(rp.stats.drift_ns), 20_000_000)
+        self.assertEqual(rp.stats.timing.n, 119)
+
+    async def test_frame_bursts_and_fewer_sleeps_at_high_speed(self):
+        recs = frames(3.0)
+        rp, stamps, wall = await self._play(recs, speed=50.0)
+
+        # frames cada 0.33 ms: se agrupan hasta que el deadline vale un sleep (>= 1 ms)
+        self.assertEqual(rp.stats.bursts, 180)
+        self.assertLess(rp.stats.sleeps, 90)
+        self.assertGreaterEqual(wall, 0.055)
+        self.assertLess(wall, 0.12)
+        # los 4 paquetes de un frame salen juntos aunque el ts difiera 0.3 ms (= 6 µs a 50x)
+        self.assertEqual(len(stamps), len(recs))
+
+    async def test_clock_going_backwards_reanchors(self):
+        recs = frames(0.5, t0=10**18) + frames(0.5, t0=10**18 - 3_600 * 10**9)
+        rp, _stamps, wall = await self._play(recs, speed=10.0)
+        self.assertEqual(rp.stats.sent, len(recs))
+        self.assertLess(wall, 0.2)
+
+    async def test_no_sleep_skips_scheduler(self):
+        recs = frames(5.0)
+        rp, _stamps, wall = await self._play(recs, no_sleep=True)
+        self.assertEqual(rp.stats.sent, len(recs))
+        self.assertEqual(rp.stats.bursts, 0)
+        self.assertLess(wall, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import struct
+import tempfile
+import unittest
+
+from ingenierof125.ingest.ingrec import IngrecReader, make_writer
+from ingenierof125.ingest.replay import PacketReplayer
+from ingenierof125.ingest.seek import (
+    WARM_PACKET_IDS,
+    RecordingIndex,
+    SeekPoint,
+    open_window,
+    sidecar_path,
+)
+
+from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+
+PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
+LAP_NUM_OFFSET = PKT_HDR.size + 33  # LapData[0].currentLapNum
+SIZES = {1: 753, 2: 1285, 6: 1352, 7: 1239, 10: 1041}
+
+
+def make_packet(pid: int, st: float, frame: int) -> bytes:
+    payload = bytearray(SIZES[pid])
+    payload[: PKT_HDR.size] = PKT_HDR.pack(2025, 25, 1, 0, 1, pid, 9, st, frame, frame, 0, 255)
+    if pid == 2:
+        payload[LAP_NUM_OFFSET] = 1 + int(st // 10)  # vuelta nueva cada 10 s
+    return bytes(payload)
+
+
+def race(seconds: int = 60, hz: int = 20) -> list[tuple[int, bytes]]:
+    out = []
+    for frame in range(seconds * hz):
+        st = frame / hz
+        for pid in (6, 2, 7, 10, 1):
+            if pid == 1 and frame % 10:
+                continue
+            if pid == 10 and frame % 4:
+                continue
+            out.append((frame * 50_000_000, make_packet(pid, st, frame)))
+    return out
+
+
+def st_of(payload) -> float:
+    return PKT_HDR.unpack_from(payload, 0)[7]
+
+
+def pid_of(payload) -> int:
+    return payload[6]
+
+
+class TestSeek(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = self._td.name
+        self.recs = race()
+        self.paths = {}
+        for fmt in ("v1", "v2"):
+            path = os.path.join(self.dir, f"{fmt}.ingrec")
+            with open(path, "wb") as f:
+                w = make_writer(f, fmt, block_bytes=64 * 1024)
+                w.write_batch(self.recs)
+                w.close()
+            self.paths[fmt] = path
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def test_parse_points(self):
+        self.assertIsNone(SeekPoint.parse(""))
+        self.assertEqual(SeekPoint.parse("lap:38"), SeekPoint("lap", 38.0))
+        self.assertEqual(SeekPoint.parse("125.5"), SeekPoint("t", 125.5))
+        self.assertEqual(str(SeekPoint.parse("LAP:3")), "lap:3")
+        for bad in ("lap:x", "soon", "nan", "lap:-1"):
+            with self.assertRaises(ValueError):
+                SeekPoint.parse(bad)
+
+    def test_window_by_time_warms_with_latest_state_packets(self):
+        for fmt, path in self.paths.items():
+            with self.subTest(fmt=fmt), IngrecReader(path) as r:
+                idx = RecordingIndex.for_reader(r)
+                win = open_window(r, idx, SeekPoint("t", 25.0), SeekPoint("t", 30.0))
+                got = [bytes(p) for _, p in win.records]
+
+                expected = [p for _, p in self.recs if 25.0 <= st_of(p) <= 30.0]
+                self.assertEqual(got, expected)
+                # sin recorrer más de un checkpoint (1 s) antes del inicio
+                self.assertLessEqual(win.skipped, 20 * 5)
+
+                # warm-up: el último de cada tipo antes del inicio, en orden de archivo
+                before = [p for _, p in self.recs if st_of(p) < 25.0]
+                latest = {pid_of(p): p for p in before if pid_of(p) in WARM_PACKET_IDS}
+                warm = [bytes(p) for p in win.warm]
+                self.assertEqual(sorted(warm), sorted(latest.values()))
+                self.assertEqual(warm, [p for p in before if p in warm])
+
+    def test_window_by_lap_is_exact(self):
+        for fmt, path in self.paths.items():
+            with self.subTest(fmt=fmt), IngrecReader(path) as r:
+                idx = RecordingIndex.for_reader(r)
+                win = open_window(r, idx, SeekPoint("lap", 3), SeekPoint("lap", 4))
+                got = [bytes(p) for _, p in win.records]
+                # vuelta 3 arranca con el LapData de st=20.0; la 5 con el de st=40.0
+                self.assertEqual(pid_of(got[0]), 2)
+                self.assertEqual(st_of(got[0]), 20.0)
+                self.assertEqual(pid_of(got[-1]), 6)
+                self.assertEqual(st_of(got[-1]), 40.0)
+                self.assertEqual(win.skipped, 0)
+
+                # más allá del final: ventana vacía
+                self.assertEqual(list(open_window(r, idx, SeekPoint("lap", 99)).records), [])
+
+    def test_sidecar_roundtrip_and_invalidation(self):
+        path = self.paths["v2"]
+        with IngrecReader(path) as r:
+            built = RecordingIndex.for_reader(r)
+        side = sidecar_path(path)
+        self.assertTrue(os.path.exists(side))
+
+        st = os.stat(path)
+        loaded = RecordingIndex.load(side, st.st_size, st.st_mtime_ns)
+        self.assertEqual(loaded, built)
+        self.assertTrue(loaded.st_sorted and loaded.lap_sorted)
+        # otra grabación con el mismo nombre: el sidecar ya no vale
+        self.assertIsNone(RecordingIndex.load(side, st.st_size + 1, st.st_mtime_ns))
+
+
+class TestReplayWindow(unittest.IsolatedAsyncioTestCase):
+    async def test_replayer_emits_warmup_then_window(self):
+        recs = race(seconds=20)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "a.ingrec")
+            with open(path, "wb") as f:
+                w = make_writer(f, "v2")
+                w.write_batch(recs)
+                w.close()
+
+            q: asyncio.Queue = asyncio.Queue()
+            rp = PacketReplayer(path, no_sleep=True, start="lap:2", end="15")
+            await rp.run(q)
+            got = [q.get_nowait() for _ in range(q.qsize())]
+
+        self.assertEqual(rp.stats.warm, 4)
+        self.assertEqual(sorted(pid_of(p) for p in got[:4]), sorted(WARM_PACKET_IDS))
+        window = got[4:]
+        self.assertEqual(rp.stats.sent, len(window))
+        self.assertEqual(st_of(window[0]), 10.0)
+        self.assertLessEqual(max(st_of(p) for p in window), 15.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
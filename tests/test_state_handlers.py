@@ -0,0 +1,116 @@
+import sys
+import types
+import unittest
+
+from ingenierof125.state.handlers import HANDLERS, TIMING_EVERY, load_plugins
+from ingenierof125.state.manager import STATE_PACKET_IDS, StateManager
+from ingenierof125.telemetry.protocol import PKT_HDR, parse_header
+
+from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+
+
+def make_packet(packet_id: int, session_time: float, fmt: int = 2025, size: int = 64) -> bytes:
+    hdr = PKT_HDR.pack(fmt, 25, 1, 0, 1, packet_id, 1, session_time, 1, 1, 0, 255)
+    return hdr + b"\x00" * (size - len(hdr))
+
+
+def participants_factory(sm):
+    extra = sm.state.extra
+
+    def handle(payload, t, idx, rx_ns):
+        extra["participants"] = (len(payload), t, idx)
+
+    return handle
+
+
+class TestHandlerRegistry(unittest.TestCase):
+    def test_builtins_cover_state_packets(self):
+        self.assertEqual(HANDLERS.packet_ids, STATE_PACKET_IDS)
+        sm = StateManager()
+        sm.apply_packet(1, make_packet(1, 1.0, size=20), 1.0, 0)  # corto: decoder da None
+        self.assertEqual(sm.handler_stats["session"].calls, 1)
+        self.assertEqual(sm.handler_stats["session"].errors, 0)
+
+    def test_plugin_handler_for_extra_packet(self):
+        reg = HANDLERS.copy()
+        reg.register(4, participants_factory, name="participants")
+        sm = StateManager(registry=reg)
+        sm.apply_packet(4, make_packet(4, 2.0), 2.0, 3)
+        self.assertEqual(sm.state.extra["participants"], (64, 2.0, 3))
+        self.assertEqual(sm.handler_stats["participants"].calls, 1)
+        # el registry global no cambia
+        self.assertNotIn(4, HANDLERS.packet_ids)
+
+    def test_format_variant_replaces_builtin_by_name(self):
+        seen = []
+        reg = HANDLERS.copy()
+        reg.register(10, lambda sm: lambda p, t, i, rx: seen.append(t), name="damage", packet_format=2024)
+        sm = StateManager(registry=reg)
+
+        old = make_packet(10, 1.0, fmt=2024)
+        sm.apply_header(parse_header(old), old)
+        new = make_packet(10, 2.0, fmt=2025)
+        sm.apply_header(parse_header(new), new)
+        sm.apply_packet(10, new, 3.0, 0)  # sin header: sólo genéricos
+
+        self.assertEqual(seen, [1.0])
+        self.assertEqual(sm.handler_stats["damage@2024/*"].calls, 1)
+        self.assertEqual(sm.handler_stats["damage"].calls, 2)
+
+    def test_errors_and_sampled_timing(self):
+        def boom(sm):
+            def handle(p, t, i, rx):
+                raise RuntimeError("x")
+
+            return handle
+
+        reg = HANDLERS.copy()
+        reg.register(2, boom, name="all_cars")
+        sm = StateManager(registry=reg)
+        for k in range(2 * TIMING_EVERY):
+            sm.apply_packet(2, make_packet(2, float(k)), float(k), 0)
+
+        hs = sm.handler_stats["all_cars"]
+        self.assertEqual((hs.calls, hs.errors, hs.timed), (2 * TIMING_EVERY, 2 * TIMING_EVERY, 2))
+        self.assertEqual(sm.state.decode_errors, 2 * TIMING_EVERY)
+        self.assertEqual(sm.handler_stats["lap"].errors, 0)  # el built-in corre igual
+        self.assertIn("all_cars=", sm.format_handlers())
+        self.assertIn("err", sm.format_handlers())
+
+    def test_duplicate_registration(self):
+        reg = HANDLERS.copy()
+        with self.assertRaises(ValueError):
+            reg.register(2, participants_factory, name="lap")
+        with self.assertRaises(ValueError):
+            reg.register(300, participants_factory, name="x")
+
+
+class TestLoadPlugins(unittest.TestCase):
+    def test_load_register_once(self):
+        mod = types.ModuleType("_test_state_plugin")
+        calls = []
+
+        def register(registry):
+            calls.append(registry)
+            registry.register(4, participants_factory, name="participants")
+
+        mod.register = register
+        sys.modules[mod.__name__] = mod
+        try:
+            reg = HANDLERS.copy()
+            self.assertEqual(load_plugins(" _test_state_plugin, ", reg), ["_test_state_plugin"])
+            self.assertEqual(load_plugins("_test_state_plugin", reg), [])
+            self.assertEqual(len(calls), 1)
+            self.assertIn(4, reg.packet_ids)
+        finally:
+            del sys.modules[mod.__name__]
+
+    def test_bad_plugins(self):
+        with self.assertRaises(ValueError):
+            load_plugins("no_such_module_xyz", HANDLERS.copy())
+        with self.assertRaises(ValueError):
+            load_plugins("json", HANDLERS.copy())  # sin register()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from ingenierof125.offline.batch import BatchReplayer
+from ingenierof125.rules.model import RuleConfig
+from ingenierof125.telemetry.decoders_lite import (
+    N_CARS,
+    decode_damage_player,
+    decode_lap_player,
+    decode_session,
+    decode_status_player,
+    decode_telemetry_player,
+)
+from ingenierof125.telemetry.synthetic import (
+    DAMAGE_SIZE,
+    LAPDATA_SIZE,
+    SESSION_SIZE,
+    STATUS_SIZE,
+    TELEMETRY_SIZE,
+    Scenario,
+    SyntheticRace,
+)
+
+SIZES = {1: SESSION_SIZE, 2: LAPDATA_SIZE, 6: TELEMETRY_SIZE, 7: STATUS_SIZE, 10: DAMAGE_SIZE}
+
+
+class TestSyntheticRace(unittest.TestCase):
+    def test_layout_matches_game_sizes(self):
+        self.assertEqual(SIZES, {1: 753, 2: 1285, 6: 1352, 7: 1239, 10: 1041})
+
+    def test_every_packet_decodes_for_all_cars(self):
+        pk = list(SyntheticRace(seed=5).packets(2.0))
+        by_pid = Counter(p[6] for _, p in pk)
+        # 60 Hz: LapData/Telemetry/Status por frame, Session 2 Hz, Damage 10 Hz
+        self.assertEqual(by_pid, {2: 120, 6: 120, 7: 120, 10: 20, 1: 4})
+        for _, p in pk:
+            self.assertEqual(len(p), SIZES[p[6]])
+
+        last = {p[6]: p for _, p in pk}
+        ses = decode_session(last[1])
+        self.assertEqual((ses.total_laps, ses.track_length_m, ses.safety_car_status), (50, 5000, 0))
+        positions = set()
+        for car in range(N_CARS):
+            lap = decode_lap_player(last[2], car)
+            positions.add(lap.position)
+            self.assertEqual(lap.lap_num, 1)
+            self.assertIsNotNone(decode_telemetry_player(last[6], car))
+            self.assertGreater(decode_status_player(last[7], car).fuel_remaining_laps, 2.0)
+            self.assertEqual(decode_damage_player(last[10], car).front_left_wing, 0)
+        self.assertEqual(positions, set(range(1, N_CARS + 1)))
+
+    def test_same_seed_same_bytes(self):
+        a = list(SyntheticRace(seed=7).packets(1.0))
+        b = list(SyntheticRace(seed=7).packets(1.0))
+        c = list(SyntheticRace(seed=8).packets(1.0))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_rates(self):
+        race = SyntheticRace(send_hz=20, rates={2: 0, 10: 5.0})
+        by_pid = Counter(p[6] for _, p in race.packets(2.0))
+        self.assertEqual(by_pid, {2: 40, 10: 10})
+        with self.assertRaises(ValueError):
+            SyntheticRace(rates={0: 0})
+
+    def test_parse_scenario(self):
+        self.assertEqual(Scenario.parse("safety_car@120:60"), Scenario("safety_car", 120.0, 60.0))
+        self.assertEqual(Scenario.parse("wing_damage@30"), Scenario("wing_damage", 30.0, 40.0))
+        for bad in ("rain@10", "safety_car", "vsc@x"):
+            with self.assertRaises(ValueError):
+                Scenario.parse(bad)
+
+    def test_scenarios_fire_engineer_events(self):
+        race = SyntheticRace(
+            seed=3,
+            send_hz=20,
+            scenarios=[Scenario.parse(s) for s in ("safety_car@10:10", "wing_damage@25:45", "fuel_low@30:10")],
+        )
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "syn.ingrec")
+            n = race.write(path, 45.0)
+            got = []
+            rp = BatchReplayer(RuleConfig(comms_throttle_s=0.0), on_event=lambda ts, t, ev: got.append((t, ev.key)))
+            s = rp.run(path)
+
+        self.assertEqual(s.packets, n)
+        first = {}
+        for t, key in got:
+            first.setdefault(key, t)
+        self.assertAlmostEqual(first["sc_deployed"], 10.0, delta=0.2)
+        self.assertAlmostEqual(first["sc_ending"], 20.0, delta=0.2)
+        self.assertAlmostEqual(first["sc_cleared"], 30.0, delta=0.2)
+        self.assertAlmostEqual(first["wing_damage"], 25.0, delta=0.2)
+        self.assertGreater(first["fuel_low"], 30.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,135 @@
+import asyncio
+import socket
+import threading
+import unittest
+from unittest import mock
+
+from ingenierof125.core.stats import RuntimeStats
+from ingenierof125.ingest.fanout import PacketFanout
+from ingenierof125.telemetry.udp_listener import UdpListener
+
+from _log_isolation import setUpModule, tearDownModule  # noqa: F401
+
+
+async def _start(listener: UdpListener) -> asyncio.Task:
+    task = asyncio.create_task(listener.run())
+    for _ in range(100):
+        if listener.local_addr is not None:
+            break
+        await asyncio.sleep(0.01)
+    return task
+
+
+async def _send(addr, payloads) -> None:
+    tx = socket.socket(socket.AF_INET6 if len(addr) == 4 else socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for p in payloads:
+            tx.sendto(p, addr)
+    finally:
+        tx.close()
+
+
+class TestUdpListenerModes(unittest.IsolatedAsyncioTestCase):
+    async def _roundtrip(self, mode: str, host: str = "127.0.0.1") -> None:
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1024)
+        lst = UdpListener(host, 0, q, stats, mode=mode, batch_max=16)
+        task = await _start(lst)
+        self.assertIsNotNone(lst.local_addr)
+
+        payloads = [bytes([i % 256]) * (29 + i) for i in range(50)]
+        await _send(lst.local_addr, payloads)
+
+        for _ in range(200):
+            if q.qsize() >= len(payloads):
+                break
+            await asyncio.sleep(0.01)
+
+        lst.stop()
+        await task
+
+        got = [q.get_nowait() for _ in range(q.qsize())]
+        self.assertEqual(got, payloads)
+        self.assertEqual(stats.udp_rx, len(payloads))
+        self.assertEqual(stats.udp_dropq, 0)
+        if mode == "batch":
+            self.assertGreaterEqual(stats.udp_batches, 1)
+            self.assertLessEqual(stats.udp_batches, len(payloads))
+
+    async def test_callback_mode(self):
+        await self._roundtrip("callback")
+
+    async def test_batch_mode(self):
+        await self._roundtrip("batch")
+
+    async def test_batch_mode_ipv6(self):
+        try:
+            with socket.socket(socket.AF_INET6, socket.SOCK_DGRAM) as s:
+                s.bind(("::1", 0))
+        except OSError:
+            self.skipTest("no IPv6 loopback")
+        await self._roundtrip("batch", host="::1")
+
+    async def test_batch_mode_counts_queue_drops(self):
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=4)
+        lst = UdpListener("127.0.0.1", 0, q, stats, mode="batch")
+        task = await _start(lst)
+
+        await _send(lst.local_addr, [b"x" * 40] * 10)
+        for _ in range(200):
+            if stats.udp_rx >= 10:
+                break
+            await asyncio.sleep(0.01)
+
+        lst.stop()
+        await task
+
+        self.assertEqual(q.qsize(), 4)
+        self.assertEqual(stats.udp_dropq, 6)
+
+    async def test_sink_receives_batches(self):
+        stats = RuntimeStats()
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=3)
+        lst = UdpListener("127.0.0.1", 0, None, stats, sink=PacketFanout(q), mode="batch")
+        task = await _start(lst)
+
+        await _send(lst.local_addr, [b"y" * 30] * 5)
+        for _ in range(200):
+            if stats.udp_rx >= 5:
+                break
+            await asyncio.sleep(0.01)
+
+        lst.stop()
+        await task
+
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(stats.udp_dropq, 2)
+
+    async def test_kernel_drops_polled_off_the_loop(self):
+        threads = []
+
+        def fake_kernel_drops(sock):
+            threads.append(threading.current_thread())
+            return 3
+
+        for mode in ("callback", "batch"):
+            stats = RuntimeStats()
+            with mock.patch("ingenierof125.telemetry.udp_listener.kernel_drops", fake_kernel_drops):
+                lst = UdpListener("127.0.0.1", 0, asyncio.Queue(), stats, mode=mode, kernel_poll_s=0.01)
+                task = await _start(lst)
+                await asyncio.sleep(0.05)
+                lst.stop()
+                await task
+            self.assertEqual(stats.udp_dropk, 3)
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            UdpListener("127.0.0.1", 0, asyncio.Queue(), RuntimeStats(), mode="nope")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
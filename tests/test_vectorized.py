@@ -0,0 +1,82 @@
+import unittest
+
+from ingenierof125.telemetry import decoders_lite as dl
+from ingenierof125.telemetry import vectorized as vz
+from ingenierof125.telemetry.synthetic import Scenario, SyntheticRace
+
+
+def race_packets() -> dict:
+    race = SyntheticRace(seed=9, scenarios=[Scenario("wing_damage", 0.0, 55.0), Scenario("fuel_low", 0.0, 1.0)])
+    return {p[6]: p for _, p in race.packets(3.0)}
+
+
+@unittest.skipUnless(vz.HAVE_NUMPY, "numpy not installed")
+class TestVectorizedDecoders(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.last = race_packets()
+
+    def test_dtypes_mirror_structs(self):
+        for dtype, layout in (
+            (vz.LAPDATA_DTYPE, dl.LAPDATA_LAYOUT),
+            (vz.CAR_TELEMETRY_DTYPE, dl.CAR_TELEMETRY_LAYOUT),
+            (vz.CAR_STATUS_DTYPE, dl.CAR_STATUS_LAYOUT),
+            (vz.CAR_DAMAGE_DTYPE, dl.CAR_DAMAGE_LAYOUT),
+        ):
+            self.assertEqual(dtype.itemsize, layout.st.size)
+            self.assertEqual(dtype.names, layout.names)
+
+    def test_every_field_matches_struct_for_all_cars(self):
+        for pid, fn, st in (
+            (2, vz.decode_lap_all, dl.LAPDATA),
+            (6, vz.decode_telemetry_all, dl.CAR_TELEMETRY),
+            (7, vz.decode_status_all, dl.CAR_STATUS),
+            (10, vz.decode_damage_all, dl.CAR_DAMAGE),
+        ):
+            arr = fn(self.last[pid])
+            self.assertEqual(arr.shape, (dl.N_CARS,))
+            for car in range(dl.N_CARS):
+                expected = st.unpack_from(self.last[pid], dl.PKT_HDR_SIZE + car * st.size)
+                self.assertEqual(tuple(arr[car].tolist()), expected)
+
+    def test_cross_check_player_decoders(self):
+        laps = vz.decode_lap_all(self.last[2])
+        tel = vz.decode_telemetry_all(self.last[6])
+        sts = vz.decode_status_all(self.last[7])
+        dmg = vz.decode_damage_all(self.last[10])
+        for car in range(dl.N_CARS):
+            lap = dl.decode_lap_player(self.last[2], car)
+            self.assertEqual(lap.position, int(laps["car_pos"][car]))
+            self.assertEqual(lap.lap_num, int(laps["lap_num"][car]))
+            self.assertEqual(lap.delta_leader_ms, int(laps["d_lead_min"][car]) * 60_000 + int(laps["d_lead_ms"][car]))
+
+            t = dl.decode_telemetry_player(self.last[6], car)
+            self.assertEqual((t.speed_kph, t.gear, t.engine_rpm), (int(tel["speed_kph"][car]), int(tel["gear"][car]), int(tel["engine_rpm"][car])))
+
+            s = dl.decode_status_player(self.last[7], car)
+            self.assertEqual(s.fuel_remaining_laps, float(sts["fuel_remaining_laps"][car]))
+            self.assertEqual(s.tyre_age_laps, int(sts["tyre_age_laps"][car]))
+
+            d = dl.decode_damage_player(self.last[10], car)
+            self.assertEqual(d.front_left_wing, int(dmg["front_left_wing"][car]))
+            self.assertEqual(d.wear[2], float(dmg["tyres_wear_fl"][car]))
+        # escenario: sólo el jugador con el alerón roto
+        self.assertEqual(int(dmg["front_left_wing"][0]), 55)
+        self.assertEqual(int(dmg["front_left_wing"][1:].max()), 0)
+
+    def test_short_packet_and_memoryview(self):
+        self.assertIsNone(vz.decode_lap_all(self.last[2][:-100]))
+        arr = vz.decode_status_all(memoryview(self.last[7]))
+        self.assertFalse(arr.flags.writeable)
+
+
+@unittest.skipIf(vz.HAVE_NUMPY, "numpy installed")
+class TestWithoutNumpy(unittest.TestCase):
+    def test_import_works_and_calls_explain(self):
+        self.assertIsNone(vz.LAPDATA_DTYPE)
+        with self.assertRaises(ImportError):
+            vz.decode_lap_all(race_packets()[2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -2,26 +2,17 @@
 
 import argparse
 import os
-import struct
+import sys
 from collections import Counter
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional
 
+# permite correrlo como script (python tools/xxx.py) sin instalar el paquete
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-# Nuestro formato .ingrec
-MAGIC = b"INGREC1\0"              # 8 bytes
-ING_HEADER = struct.Struct("<8sH")  # magic + u16 ver
-ING_REC = struct.Struct("<QI")      # u64 ts_ns + u32 length
-
-# F1 UDP header (29 bytes) - lo que ya estás usando en el dispatcher
-PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
-PKT_HDR_SIZE = PKT_HDR.size  # 29
-
-
-def parse_f1_header(payload: bytes) -> Optional[Tuple[int, int, int, int, int, int, int, float, int, int, int, int]]:
-    if len(payload) < PKT_HDR_SIZE:
-        return None
-    return PKT_HDR.unpack_from(payload, 0)
+from ingenierof125.ingest.ingrec import IngrecReader  # noqa: E402
+from ingenierof125.telemetry.protocol import parse_header  # noqa: E402
 
 
 def main() -> int:
@@ -53,26 +44,15 @@ def main() -> int:
     bad_headers = 0
     total = 0
 
-    with p.open("rb") as f:
-        h = f.read(ING_HEADER.size)
-        if len(h) != ING_HEADER.size:
-            print("ERROR: ingrec header too short")
-            return 2
-        magic, ver = ING_HEADER.unpack(h)
-        if magic != MAGIC or ver != 1:
-            print(f"ERROR: not an ingrec v1 (magic={magic!r} ver={ver})")
-            return 2
-
-        while True:
-            rec = f.read(ING_REC.size)
-            if not rec or len(rec) < ING_REC.size:
-                break
-
-            ts_ns, length = ING_REC.unpack(rec)
-            payload = f.read(length)
-            if len(payload) != length:
-                break
+    try:
+        reader = IngrecReader(str(p))
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 2
 
+    with reader:
+        for ts_ns, payload in reader:
+            length = len(payload)
             total += 1
             if first_ts is None:
                 first_ts = ts_ns
@@ -87,38 +67,23 @@ def main() -> int:
 
             lens[length] += 1
 
-            fh = parse_f1_header(payload)
-            if fh is None:
+            h = parse_header(payload)
+            if h is None:
                 bad_headers += 1
                 continue
 
-            (
-                packet_format,
-                game_year,
-                game_major,
-                game_minor,
-                packet_version,
-                packet_id,
-                session_uid,
-                session_time,
-                frame_identifier,
-                overall_frame_identifier,
-                player_car_index,
-                secondary_player_car_index,
-            ) = fh
-
-            counts[int(packet_id)] += 1
-            last_frame = int(frame_identifier)
-            last_packet_id = int(packet_id)
-            last_session_uid = int(session_uid)
-            last_session_time = float(session_time)
+            counts[h.packet_id] += 1
+            last_frame = h.frame_identifier
+            last_packet_id = h.packet_id
+            last_session_uid = h.session_uid
+            last_session_time = h.session_time
 
             if (t - last_print_t) >= float(args.every):
                 last_print_t = t
                 print(
-                    f"t={t:8.3f}s frame={frame_identifier} id={packet_id} ver={packet_version} "
-                    f"sess_uid={session_uid} sess_t={session_time:.3f} fmt={packet_format} year={game_year} "
-                    f"player={player_car_index} len={length}"
+                    f"t={t:8.3f}s frame={h.frame_identifier} id={h.packet_id} ver={h.packet_version} "
+                    f"sess_uid={h.session_uid} sess_t={h.session_time:.3f} fmt={h.packet_format} year={h.game_year} "
+                    f"player={h.player_car_index} len={length}"
                 )
 
     dur = 0.0
@@ -128,6 +93,9 @@ def main() -> int:
     print("\n=== SUMMARY ===")
     print(f"file: {p}")
     print(f"filesize: {size} bytes")
+    print(f"format: v{reader.version}")
+    if reader.version == 2:
+        print(f"codec: {reader.codec_name} blocks: {len(reader.blocks)} index: {'footer' if reader.index_from_footer else 'scan (no footer)'}")
     print(f"records: {total}")
     print(f"duration: {dur:.3f} s")
     print(f"bad_headers(<29B): {bad_headers}")
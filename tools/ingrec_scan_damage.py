@@ -2,26 +2,21 @@
 
 import argparse
 import struct
+import sys
 from pathlib import Path
-from typing import Optional, Tuple
 
-MAGIC = b"INGREC1\0"
-ING_HEADER = struct.Struct("<8sH")
-ING_REC = struct.Struct("<QI")
+# permite correrlo como script (python tools/xxx.py) sin instalar el paquete
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-PKT_HDR = struct.Struct("<HBBBBBQfIIBB")
-PKT_HDR_SIZE = PKT_HDR.size  # 29
+from ingenierof125.ingest.ingrec import IngrecReader  # noqa: E402
+from ingenierof125.telemetry.protocol import PKT_HDR_SIZE, parse_header  # noqa: E402
 
 # F1 25 CarDamageData car struct: 46 bytes
 CAR_DAMAGE_CAR = struct.Struct("<4f4B4B4B18B")
 CAR_SZ = CAR_DAMAGE_CAR.size
 NUM_CARS = 22
 
-def parse_hdr(payload: bytes) -> Optional[Tuple]:
-    if len(payload) < PKT_HDR_SIZE:
-        return None
-    return PKT_HDR.unpack_from(payload, 0)
-
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("path", type=str)
@@ -38,37 +33,19 @@ def main() -> int:
     seen = 0
     printed = 0
 
-    with p.open("rb") as f:
-        h = f.read(ING_HEADER.size)
-        if len(h) != ING_HEADER.size:
-            print("ERROR: header short")
-            return 2
-        magic, ver = ING_HEADER.unpack(h)
-        if magic != MAGIC or ver != 1:
-            print(f"ERROR: not ingrec v1 (magic={magic!r} ver={ver})")
-            return 2
-
-        while True:
-            rec = f.read(ING_REC.size)
-            if not rec or len(rec) < ING_REC.size:
-                break
-            ts_ns, length = ING_REC.unpack(rec)
-            payload = f.read(length)
-            if len(payload) != length:
-                break
+    try:
+        reader = IngrecReader(str(p))
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 2
 
-            hdr = parse_hdr(payload)
+    with reader:
+        for ts_ns, payload in reader:
+            hdr = parse_header(payload)
             if hdr is None:
                 continue
 
-            (
-                packet_format, game_year, game_major, game_minor,
-                packet_version, packet_id, session_uid, session_time,
-                frame_identifier, overall_frame_identifier,
-                player_car_index, secondary_player_car_index
-            ) = hdr
-
-            if int(packet_id) != 10:
+            if hdr.packet_id != 10:
                 continue
 
             base = PKT_HDR_SIZE
@@ -76,7 +53,7 @@ def main() -> int:
             if len(payload) < need:
                 continue
 
-            idx = int(player_car_index)
+            idx = hdr.player_car_index
             off = base + idx * CAR_SZ
             car = CAR_DAMAGE_CAR.unpack_from(payload, off)
 
@@ -89,7 +66,7 @@ def main() -> int:
 
             if (fl or fr) and printed < 15:
                 printed += 1
-                print(f"t={session_time:8.3f}s frame={frame_identifier} player={idx} FL={fl}% FR={fr}%")
+                print(f"t={hdr.session_time:8.3f}s frame={hdr.frame_identifier} player={idx} FL={fl}% FR={fr}%")
 
             if args.limit and seen >= args.limit:
                 break
@@ -0,0 +1,265 @@
+﻿"""
+Generador de carga UDP: re-emite un .ingrec por socket a N× velocidad, con varios
+"rigs" virtuales en paralelo (cada uno su hilo y su socket), para estresar el camino
+en vivo (kernel -> UdpListener -> fanout) con la forma real del tráfico.
+
+Uso (desde la raíz del repo, con la app escuchando y --stats-interval 1):
+  python tools/udp_loadgen.py recordings/carrera.ingrec --speed 10 --rigs 4
+  python tools/udp_loadgen.py carrera.ingrec --speed 0 --duration 20      (sin pacing: a tope)
+
+Cada rig recorre la grabación con deadlines absolutos por frame (como el replayer);
+los rigs > 0 reescriben el session_uid para parecer sesiones distintas (--same-uid
+para no tocar nada). Lo enviado acá contra udp_rx/udp_dropq/udp_dropk de la app da
+los pps sostenibles. Los errores de send (ENOBUFS, buffer lleno) se cuentan aparte.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# permite correrlo como script (python tools/xxx.py) sin instalar el paquete
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ingenierof125.ingest.ingrec import IngrecReader  # noqa: E402
+from ingenierof125.telemetry.protocol import PKT_HDR_SIZE  # noqa: E402
+_UID = struct.Struct("<Q")
+_UID_OFFSET = 7
+_FRAME = struct.Struct("<I")
+_FRAME_OFFSET = 19
+_MIN_SLEEP_NS = 1_000_000
+
+
+class Rig(threading.Thread):
+    def __init__(
+        self,
+        rig_id: int,
+        path: str,
+        target: tuple[str, int],
+        *,
+        speed: float,
+        loops: int,
+        deadline_ns: int,
+        start_ns: int,
+        rewrite_uid: bool,
+        sndbuf: int,
+        stop: threading.Event,
+    ) -> None:
+        super().__init__(name=f"loadgen-rig{rig_id}", daemon=True)
+        self.rig_id = rig_id
+        self._path = path
+        self._target = target
+        self._speed = speed
+        self._loops = loops
+        self._deadline_ns = deadline_ns
+        self._start_ns = start_ns
+        self._rewrite_uid = rewrite_uid
+        self._sndbuf = sndbuf
+        self._halt = stop
+
+        # contadores (los lee el hilo principal; ints => sin lock)
+        self.sent = 0
+        self.bytes = 0
+        self.errors = 0
+        self.lag_max_ns = 0   # cuánto llegó a ir atrasado contra el horario de la grabación
+
+    def _send_all(self, sock: socket.socket, reader: IngrecReader) -> bool:
+        clock = time.perf_counter_ns
+        pace = self._speed > 0
+        base_ts: Optional[int] = None
+        base_wall = 0
+        last_ts = 0
+        frame: Optional[int] = None
+        send = sock.sendto
+        target = self._target
+        buf = bytearray(2048) if self._rewrite_uid else None
+
+        for ts_ns, payload in reader:
+            if self._halt.is_set() or (self._deadline_ns and clock() >= self._deadline_ns):
+                return False
+
+            if pace and len(payload) >= PKT_HDR_SIZE:
+                f = _FRAME.unpack_from(payload, _FRAME_OFFSET)[0]
+                if base_ts is None or ts_ns < last_ts:
+                    base_ts, base_wall, frame = ts_ns, clock(), f
+                elif f != frame:
+                    frame = f
+                    due = base_wall + int((ts_ns - base_ts) / self._speed)
+                    delay = due - clock()
+                    if delay >= _MIN_SLEEP_NS:
+                        time.sleep(delay / 1e9)
+                    elif -delay > self.lag_max_ns:
+                        self.lag_max_ns = -delay
+                last_ts = ts_ns
+
+            data = payload
+            if buf is not None and PKT_HDR_SIZE <= len(payload) <= len(buf):
+                n = len(payload)
+                buf[:n] = payload
+                uid = _UID.unpack_from(buf, _UID_OFFSET)[0]
+                _UID.pack_into(buf, _UID_OFFSET, (uid + self.rig_id * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+                data = memoryview(buf)[:n]
+
+            try:
+                send(data, target)
+                self.sent += 1
+                self.bytes += len(data)
+            except OSError:
+                self.errors += 1
+        return True
+
+    def run(self) -> None:
+        delay = self._start_ns - time.perf_counter_ns()
+        if delay > 0:
+            time.sleep(delay / 1e9)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            if self._sndbuf > 0:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._sndbuf)
+            with IngrecReader(self._path) as reader:
+                loop = 0
+                while self._loops <= 0 or loop < self._loops:
+                    if not self._send_all(sock, reader):
+                        break
+                    loop += 1
+
+
+def _parse_target(s: str) -> tuple[str, int]:
+    host, _, port = s.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def run_loadgen(
+    path: str,
+    target: tuple[str, int],
+    *,
+    speed: float = 1.0,
+    rigs: int = 1,
+    loops: int = 1,
+    duration_s: float = 0.0,
+    stagger_ms: float = 0.0,
+    rewrite_uid: bool = True,
+    sndbuf: int = 0,
+    report_s: float = 0.0,
+    out=None,
+) -> dict:
+    """Corre los rigs hasta que terminen (o duration_s) y devuelve el resumen."""
+    stop = threading.Event()
+    t0 = time.perf_counter_ns()
+    deadline = t0 + int(duration_s * 1e9) if duration_s > 0 else 0
+    pool = [
+        Rig(
+            i,
+            path,
+            target,
+            speed=speed,
+            loops=loops,
+            deadline_ns=deadline,
+            start_ns=t0 + int(i * stagger_ms * 1e6),
+            rewrite_uid=rewrite_uid and i > 0,
+            sndbuf=sndbuf,
+            stop=stop,
+        )
+        for i in range(max(1, rigs))
+    ]
+    for r in pool:
+        r.start()
+
+    last_sent, last_t = 0, t0
+    step_ns = int(report_s * 1e9)
+    next_report = t0 + step_ns
+    try:
+        while any(r.is_alive() for r in pool):
+            time.sleep(0.05)
+            now = time.perf_counter_ns()
+            if step_ns <= 0 or out is None or now < next_report:
+                continue
+            next_report += step_ns
+            sent = sum(r.sent for r in pool)
+            errs = sum(r.errors for r in pool)
+            lag = max(r.lag_max_ns for r in pool)
+            rate = (sent - last_sent) / ((now - last_t) / 1e9)
+            print(f"t={(now - t0) / 1e9:7.2f}s sent={sent} rate={rate:9.0f} pps errors={errs} lag_max={lag / 1e6:.1f}ms", file=out)
+            last_sent, last_t = sent, now
+    except KeyboardInterrupt:
+        stop.set()
+    for r in pool:
+        r.join()
+
+    elapsed = (time.perf_counter_ns() - t0) / 1e9
+    sent = sum(r.sent for r in pool)
+    nbytes = sum(r.bytes for r in pool)
+    return {
+        "rigs": len(pool),
+        "speed": speed,
+        "sent": sent,
+        "errors": sum(r.errors for r in pool),
+        "elapsed_s": elapsed,
+        "pps": sent / elapsed if elapsed > 0 else 0.0,
+        "mb_s": nbytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+        "lag_max_ms": max(r.lag_max_ns for r in pool) / 1e6,
+        "per_rig": [r.sent for r in pool],
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Re-emit an .ingrec over UDP at N x speed from several virtual rigs")
+    ap.add_argument("path", type=str, help="Path to .ingrec")
+    ap.add_argument("--target", type=str, default="127.0.0.1:20777")
+    ap.add_argument("--speed", type=float, default=1.0, help="Playback speed (0 = no pacing, as fast as possible)")
+    ap.add_argument("--rigs", type=int, default=1, help="Concurrent virtual rigs (one thread + socket each)")
+    ap.add_argument("--loops", type=int, default=1, help="Times each rig plays the file (0 = until --duration)")
+    ap.add_argument("--duration", type=float, default=0.0, help="Stop after N seconds (0 = when done)")
+    ap.add_argument("--stagger-ms", type=float, default=0.0, help="Start offset between rigs")
+    ap.add_argument("--same-uid", action="store_true", help="Do not rewrite session_uid per rig")
+    ap.add_argument("--sndbuf", type=int, default=0, help="SO_SNDBUF bytes (0 = OS default)")
+    ap.add_argument("--report", type=float, default=1.0, help="Progress line every N seconds (0 = off)")
+    ap.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = ap.parse_args()
+
+    p = Path(args.path)
+    if not p.exists():
+        print(f"ERROR: file not found: {p}")
+        return 2
+    try:
+        target = _parse_target(args.target)
+        IngrecReader(str(p)).close()
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 2
+    if args.loops <= 0 and args.duration <= 0:
+        print("ERROR: --loops 0 needs --duration")
+        return 2
+
+    res = run_loadgen(
+        str(p),
+        target,
+        speed=args.speed,
+        rigs=args.rigs,
+        loops=args.loops,
+        duration_s=args.duration,
+        stagger_ms=args.stagger_ms,
+        rewrite_uid=not args.same_uid,
+        sndbuf=args.sndbuf,
+        report_s=0.0 if args.json else args.report,
+        out=sys.stdout,
+    )
+    if args.json:
+        print(json.dumps(res, indent=2))
+        return 0
+
+    print("\n=== SUMMARY ===")
+    print(f"rigs: {res['rigs']}  speed: {res['speed']}x  elapsed: {res['elapsed_s']:.2f}s")
+    print(f"sent: {res['sent']}  errors: {res['errors']}  per rig: {res['per_rig']}")
+    print(f"rate: {res['pps']:.0f} pps  {res['mb_s']:.1f} MB/s  lag_max: {res['lag_max_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())